@@ -8,3 +8,4 @@ echo "Starting celery worker"
 celery --workdir src --app archiefbeheercomponent.celery worker \
     -l $LOGLEVEL \
     -O fair \
+    -Q ${CELERY_WORKER_QUEUES:-celery} \
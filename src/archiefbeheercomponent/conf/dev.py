@@ -84,6 +84,7 @@ if not config("USE_REDIS_CACHE", default=False):
         "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
         "oas": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
         "oidc": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "zgw": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     }
 
 # THOU SHALT NOT USE NAIVE DATETIMES
@@ -103,6 +104,7 @@ ENVIRONMENT = "development"
 # Django Solo
 #
 SOLO_CACHE_TIMEOUT = 0
+SOLO_LOCAL_CACHE_TIMEOUT = 0
 
 # Override settings with local settings.
 try:
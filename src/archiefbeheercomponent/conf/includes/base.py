@@ -99,6 +99,16 @@ CACHES = {
             "IGNORE_EXCEPTIONS": True,
         },
     },
+    # Responses of the ZGW APIs, see ZGW_RESPONSE_CACHE_TIMEOUT. Use a Redis instance
+    # with a maxmemory policy (e.g. allkeys-lru) to limit its total size.
+    "zgw": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_ZGW', 'localhost:6379/2')}",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
 }
 
 # Application definition
@@ -443,12 +453,17 @@ if SENTRY_DSN:
 # ZGW-CONSUMERS
 #
 ZGW_CONSUMERS_OAS_CACHE = "oas"
+ZGW_CONSUMERS_CLIENT_CLASS = "archiefbeheercomponent.destruction.client.PooledZGWClient"
 
 #
 # SOLO
 #
 SOLO_CACHE = "default"
 SOLO_CACHE_TIMEOUT = 60 * 5  # 5 mins
+# Number of seconds that the configuration singletons are used from the memory of the
+# process before checking (in the default cache) if they were changed. Set to 0 to
+# disable.
+SOLO_LOCAL_CACHE_TIMEOUT = config("SOLO_LOCAL_CACHE_TIMEOUT", default=5)
 
 #
 # CELERY
@@ -462,9 +477,81 @@ CELERY_BEAT_SCHEDULE = {
 }
 # Add a 10 minutes timeout to all Celery tasks.
 CELERY_TASK_SOFT_TIME_LIMIT = 600
+# The PDF of a destruction report can be rendered by dedicated workers, consuming the
+# REPORT_PDF_QUEUE queue.
+CELERY_TASK_ROUTES = {
+    "archiefbeheercomponent.destruction.tasks.render_destruction_report": {
+        "queue": config("REPORT_PDF_QUEUE", default="celery")
+    },
+}
 
 ZAKEN_PER_TASK = 10
-ZAKEN_PER_QUERY = 1_000_000
+# Number of zaak URLs checked at once for their availability (using the partial index
+# on the reserved zaken of the destruction list items)
+ZAKEN_PER_QUERY = config("ZAKEN_PER_QUERY", default=10_000)
+
+# When set, the items of a destruction list are destroyed in batches of this size.
+# The zaken of a batch are destroyed concurrently by DESTRUCTION_MAX_WORKERS threads
+# and the state of the items is saved once per batch.
+DESTRUCTION_BATCH_SIZE = config("DESTRUCTION_BATCH_SIZE", default=0)
+DESTRUCTION_MAX_WORKERS = config("DESTRUCTION_MAX_WORKERS", default=8)
+
+# Maximum number of concurrent requests per host (per process) made while destroying
+# the besluiten and documenten related to a zaak.
+MAX_REQUESTS_PER_HOST = config("MAX_REQUESTS_PER_HOST", default=10)
+
+# The clients of the ZGW services are kept per process, together with a keep-alive
+# session holding at most MAX_REQUESTS_PER_HOST connections per host. They are rebuilt
+# after this number of seconds to pick up changes made to the services.
+ZGW_CLIENT_REGISTRY_TIMEOUT = config("ZGW_CLIENT_REGISTRY_TIMEOUT", default=60 * 5)
+# Maximum number of requests per second made to a single service by a process. Set to
+# 0 to disable the rate limit.
+ZGW_SERVICE_RATE_LIMIT = config("ZGW_SERVICE_RATE_LIMIT", default=0)
+# The zaken and the types are listed from all the configured Zaken and Catalogi APIs
+# concurrently. A service which doesn't respond to a request within ZGW_SERVICE_TIMEOUT
+# seconds is left out of the results. Listing all the pages of a service can take
+# longer: a service which didn't list all of them within ZGW_SERVICE_QUERY_TIMEOUT
+# seconds is left out as well. Set to 0 to wait indefinitely.
+ZGW_SERVICE_TIMEOUT = config("ZGW_SERVICE_TIMEOUT", default=30)
+ZGW_SERVICE_QUERY_TIMEOUT = config("ZGW_SERVICE_QUERY_TIMEOUT", default=0)
+# The resources retrieved from the ZGW APIs are kept with their ETag in the "zgw" cache
+# for this number of seconds, and revalidated with If-None-Match when they are retrieved
+# again. Responses larger than ZGW_RESPONSE_CACHE_MAX_SIZE bytes are not kept. Set to 0
+# to disable the cache.
+ZGW_RESPONSE_CACHE_TIMEOUT = config("ZGW_RESPONSE_CACHE_TIMEOUT", default=60 * 60 * 24)
+ZGW_RESPONSE_CACHE_MAX_SIZE = config("ZGW_RESPONSE_CACHE_MAX_SIZE", default=100_000)
+
+# Number of seconds that the types retrieved from the Catalogi API(s) (zaaktypen,
+# informatieobjecttypen and besluittypen) are cached. Set to 0 to disable the cache.
+ZTC_TYPES_CACHE_TIMEOUT = config("ZTC_TYPES_CACHE_TIMEOUT", default=60 * 60)
+
+# Number of seconds that the procestypen and resultaattypen looked up while enriching
+# zaken are also kept in the default cache, so that they are shared between requests
+# and tasks. By default (0) they are only remembered for the duration of a request or
+# task.
+REMOTE_LOOKUP_CACHE_TIMEOUT = config("REMOTE_LOOKUP_CACHE_TIMEOUT", default=0)
+
+# Filter and paginate the zaken using a local mirror of the Zaken API(s) instead of
+# listing them from the Zaken API(s). The mirror is loaded with the ``sync-zaken``
+# management command and kept up to date with the notifications of the Zaken API(s),
+# which are sent to the zaken notification callback with this Authorization header.
+ZAKEN_MIRROR_ENABLED = config("ZAKEN_MIRROR_ENABLED", default=False)
+ZAKEN_MIRROR_NOTIFICATIONS_AUTH = config("ZAKEN_MIRROR_NOTIFICATIONS_AUTH", default="")
+
+# Number of zaken rendered at once in the PDF of a destruction report. Larger lists are
+# rendered in sections of this size to limit the memory used.
+REPORT_PDF_CHUNK_SIZE = config("REPORT_PDF_CHUNK_SIZE", default=500)
+# The PDF of a destruction report is rendered in a separate process, which is stopped
+# after REPORT_PDF_TIME_LIMIT seconds. REPORT_PDF_MEMORY_LIMIT limits the address space
+# of that process (in MB), 0 means no limit.
+REPORT_PDF_TIME_LIMIT = config("REPORT_PDF_TIME_LIMIT", default=480)
+REPORT_PDF_MEMORY_LIMIT = config("REPORT_PDF_MEMORY_LIMIT", default=0)
+# Store the CSV content of destruction reports compressed with gzip.
+REPORT_CSV_GZIP = config("REPORT_CSV_GZIP", default=False)
+
+# Number of automatic emails (e.g. the review reminders) sent at once over the
+# connection to the mail server.
+AUTOMATIC_EMAIL_BATCH_SIZE = config("AUTOMATIC_EMAIL_BATCH_SIZE", default=100)
 
 # DJANGO-ADMIN-INDEX
 ADMIN_INDEX_SHOW_REMAINING_APPS_TO_SUPERUSERS = False
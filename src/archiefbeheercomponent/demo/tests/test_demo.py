@@ -2,9 +2,10 @@ from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class StartPageTests(TestCase):
+class StartPageTests(ClearCachesMixin, TestCase):
     """
     Test the start page of the demo
     """
@@ -44,7 +45,7 @@ class StartPageTests(TestCase):
 
 
 @override_settings(ABC_DEMO_MODE=True)
-class DemoViewTests(TestCase):
+class DemoViewTests(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
@@ -0,0 +1 @@
+default_app_config = "archiefbeheercomponent.destruction.apps.DestructionConfig"
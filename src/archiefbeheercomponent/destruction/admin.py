@@ -15,7 +15,9 @@ from .models import (
     DestructionListItemReview,
     DestructionListReview,
     DestructionListReviewComment,
+    MirroredZaak,
     StandardReviewAnswer,
+    ZakenExport,
 )
 
 
@@ -149,3 +151,28 @@ class ArchiveConfigAdmin(SingletonModelAdmin):
 @admin.register(StandardReviewAnswer)
 class StandardReviewAnswerAdmin(OrderedModelAdmin):
     list_display = ("reason", "move_up_down_links")
+
+
+@admin.register(ZakenExport)
+class ZakenExportAdmin(PrivateMediaMixin, admin.ModelAdmin):
+    list_display = ("user", "status", "created", "finished")
+    list_filter = ("status",)
+    raw_id_fields = ("user",)
+    readonly_fields = ("created", "finished")
+
+    private_media_fields = ("content",)
+
+
+@admin.register(MirroredZaak)
+class MirroredZaakAdmin(admin.ModelAdmin):
+    list_display = (
+        "identificatie",
+        "bronorganisatie",
+        "startdatum",
+        "archiefnominatie",
+        "archiefactiedatum",
+        "synced",
+    )
+    list_filter = ("archiefnominatie",)
+    search_fields = ("identificatie", "url")
+    readonly_fields = ("synced",)
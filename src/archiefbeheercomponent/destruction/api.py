@@ -1,11 +1,28 @@
+import json
+import logging
+from concurrent import futures
+from typing import Dict, Iterator, List
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseBadRequest, JsonResponse
+from django.core.paginator import InvalidPage, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
+from requests import RequestException
 from zds_client.client import ClientError
-from zgw_consumers.concurrent import parallel
 
 from archiefbeheercomponent.accounts.mixins import (
     AuthorOrAssigneeRequiredMixin,
@@ -14,32 +31,108 @@ from archiefbeheercomponent.accounts.mixins import (
 
 from ..constants import RoleTypeChoices
 from .constants import ListItemStatus
+from .mirror import delete_mirrored_zaak, get_mirrored_zaken
 from .models import ArchiveConfig, DestructionList
 from .service import (
-    fetch_zaak,
+    fetch_zaak_with_resultaat,
     get_besluiten,
+    get_besluittypen,
     get_documenten,
+    get_informatieobjecttypen,
     get_resultaat,
+    get_zaak_detail,
+    get_zaakinformatieobjecten,
     get_zaaktypen,
     get_zaken,
+    memoized_lookups,
+    parallel,
 )
+from .tasks import sync_mirrored_zaak
 from .utils import (
     get_additional_zaak_info,
     get_zaak_link_for_zaakafhandelcomponent,
     set_zaken_availability,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class FetchZakenView(LoginRequiredMixin, View):
+    """
+    Return the zaken matching the query parameters, with additional information.
+
+    The zaken can be paginated with the ``page`` and ``page_size`` query parameters.
+    Only the zaken on the requested page are then enriched. If the client accepts
+    ``application/x-ndjson``, each zaak is streamed as a separate line as soon as it
+    has been enriched.
+
+    The API roots of the Zaken and Catalogi APIs which were unavailable are returned in
+    ``unavailableServices`` (or the ``X-Unavailable-Services`` header).
+    """
+
+    page_query_param = "page"
+    page_size_query_param = "page_size"
+    default_page_size = 100
+    max_page_size = 1000
+    ndjson_content_type = "application/x-ndjson"
+
     def get(self, request):
-        zaken = get_zaken(request.GET)
+        query_params = request.GET.copy()
+        page_number = query_params.pop(self.page_query_param, [None])[-1]
+        page_size = query_params.pop(self.page_size_query_param, [None])[-1]
 
-        with parallel() as executor:
+        unavailable_services = []
+        zaken = get_zaken(query_params, unavailable_services=unavailable_services)
+
+        response_data = {"unavailableServices": unavailable_services}
+        if page_number or page_size:
+            try:
+                page = self.paginate_zaken(zaken, page_number, page_size)
+            except (InvalidPage, ValueError):
+                return HttpResponseBadRequest(_("Invalid page."))
+
+            zaken = page.object_list
+            response_data.update(
+                {
+                    "count": page.paginator.count,
+                    "next": page.next_page_number() if page.has_next() else None,
+                    "previous": (
+                        page.previous_page_number() if page.has_previous() else None
+                    ),
+                }
+            )
+        else:
+            # The zaken retrieved from the mirror are only retrieved when iterated over
+            zaken = list(zaken)
+
+        set_zaken_availability(zaken)
+
+        if self.ndjson_content_type in request.headers.get("Accept", ""):
+            response = StreamingHttpResponse(
+                self.stream_zaken(zaken), content_type=self.ndjson_content_type
+            )
+            if "count" in response_data:
+                response["X-Total-Count"] = response_data["count"]
+            if unavailable_services:
+                response["X-Unavailable-Services"] = ",".join(unavailable_services)
+            return response
+
+        with memoized_lookups(), parallel() as executor:
             zaken_with_extra_info = list(executor.map(get_additional_zaak_info, zaken))
 
-        set_zaken_availability(zaken_with_extra_info)
+        return JsonResponse({"zaken": zaken_with_extra_info, **response_data})
 
-        return JsonResponse({"zaken": zaken_with_extra_info})
+    def paginate_zaken(self, zaken: List[dict], page_number, page_size):
+        page_size = int(page_size or self.default_page_size)
+        page_size = max(1, min(page_size, self.max_page_size))
+        paginator = Paginator(zaken, page_size)
+        return paginator.page(page_number or 1)
+
+    @staticmethod
+    def stream_zaken(zaken: List[dict]) -> Iterator[str]:
+        with memoized_lookups(), parallel() as executor:
+            for zaak in executor.map(get_additional_zaak_info, zaken):
+                yield json.dumps(zaak, cls=DjangoJSONEncoder) + "\n"
 
 
 NO_DETAIL_ZAAK_ATTRS = [
@@ -54,6 +147,14 @@ NO_DETAIL_ZAAK_ATTRS = [
     "startdatum",
     "einddatum",
 ]
+# The attributes of the zaken of the list items which are retrieved, if the Zaken
+# API supports selecting the fields
+LIST_ITEM_ZAAK_FIELDS = NO_DETAIL_ZAAK_ATTRS + [
+    "uuid",
+    "bronorganisatie",
+    "zaaktype",
+    "omschrijving",
+]
 NO_DETAIL_ZAAKTYPE_ATTRS = [
     "url",
     "omschrijving",
@@ -66,40 +167,74 @@ class FetchListItemsView(AuthorOrAssigneeRequiredMixin, View):
     def get_destruction_list(self):
         return get_object_or_404(DestructionList, id=self.kwargs["list_id"])
 
+    def get_item_reviews(self, destruction_list: DestructionList) -> dict:
+        """Return the item reviews of the last review, keyed by list item ID"""
+        last_review = destruction_list.last_review()
+        if not last_review:
+            return {}
+
+        return {
+            item_review.destruction_list_item_id: item_review
+            for item_review in last_review.item_reviews.order_by("id")
+        }
+
+    def get_zaak_data(self, zaak: dict, zaaktype: dict, link_to_zac: str) -> dict:
+        # return only general information
+        zaak_data = {attr: zaak.get(attr) for attr in NO_DETAIL_ZAAK_ATTRS}
+        # Add link to zaak in ZAC
+        zaak_data["zac_link"] = get_zaak_link_for_zaakafhandelcomponent(
+            zaak, link_to_zac
+        )
+
+        zaaktype_data = {attr: zaaktype.get(attr) for attr in NO_DETAIL_ZAAKTYPE_ATTRS}
+        zaak_data["zaaktype"] = zaaktype_data
+        return get_additional_zaak_info(zaak_data)
+
+    @memoized_lookups()
     def get(self, request, list_id):
         config = ArchiveConfig.get_solo()
 
         destruction_list = DestructionList.objects.get(id=list_id)
-        last_review = destruction_list.last_review()
+        list_items = list(
+            destruction_list.items.exclude(status=ListItemStatus.removed).order_by("id")
+        )
+        item_reviews = self.get_item_reviews(destruction_list)
 
-        fetched_zaaktypen = {zaaktype["url"]: zaaktype for zaaktype in get_zaaktypen()}
+        fetched_zaaktypen = get_zaaktypen(dict_response=True)
 
-        zaak_urls = [item.zaak for item in destruction_list.items.all()]
         with parallel() as executor:
-            _zaken = executor.map(fetch_zaak, zaak_urls)
+            _zaken = executor.map(
+                lambda url: fetch_zaak_with_resultaat(
+                    url, fields=LIST_ITEM_ZAAK_FIELDS
+                ),
+                [item.zaak for item in list_items],
+            )
 
-        try:
-            zaken = list(_zaken)
-        except ClientError:
-            return JsonResponse(
-                {"error": _("One or more cases could not be retrieved.")}
+            try:
+                zaken = {zaak["url"]: zaak for zaak in _zaken}
+            except ClientError:
+                return JsonResponse(
+                    {"error": _("One or more cases could not be retrieved.")}
+                )
+
+            _zaken_data = executor.map(
+                lambda zaak: self.get_zaak_data(
+                    zaak, fetched_zaaktypen[zaak["zaaktype"]], config.link_to_zac
+                ),
+                [zaken[item.zaak] for item in list_items],
             )
+            zaken_data = list(_zaken_data)
 
-        zaken = {zaak["url"]: zaak for zaak in zaken}
+        hide_omschrijving = (
+            destruction_list.contains_sensitive_info
+            and self.request.user.role.type == RoleTypeChoices.archivist
+        )
 
         items = []
-        for item in (
-            destruction_list.items.exclude(status=ListItemStatus.removed)
-            .order_by("id")
-            .all()
-        ):
+        for item, zaak_data in zip(list_items, zaken_data):
             # list item data
             list_item_data = {"id": item.id, "status": item.status}
-            if (
-                last_review
-                and last_review.item_reviews.filter(destruction_list_item=item).exists()
-            ):
-                item_review = last_review.item_reviews.get(destruction_list_item=item)
+            if item_review := item_reviews.get(item.id):
                 list_item_data.update(
                     {
                         "review_text": item_review.text,
@@ -107,28 +242,8 @@ class FetchListItemsView(AuthorOrAssigneeRequiredMixin, View):
                     }
                 )
 
-            # full zaak data
-            zaak = zaken[item.zaak]
-            zaaktype = fetched_zaaktypen[zaak["zaaktype"]]
-
-            # return only general information
-            zaak_data = {attr: zaak.get(attr) for attr in NO_DETAIL_ZAAK_ATTRS}
-            # Add link to zaak in ZAC
-            zaak_data["zac_link"] = get_zaak_link_for_zaakafhandelcomponent(
-                zaak, config.link_to_zac
-            )
-
-            zaaktype_data = {
-                attr: zaaktype.get(attr) for attr in NO_DETAIL_ZAAKTYPE_ATTRS
-            }
-            zaak_data["zaaktype"] = zaaktype_data
-            zaak_data = get_additional_zaak_info(zaak_data)
-
-            if (
-                not destruction_list.contains_sensitive_info
-                or self.request.user.role.type != RoleTypeChoices.archivist
-            ):
-                zaak_data["omschrijving"] = zaak.get("omschrijving")
+            if not hide_omschrijving:
+                zaak_data["omschrijving"] = zaken[item.zaak].get("omschrijving")
 
             items.append({"listItem": list_item_data, "zaak": zaak_data})
 
@@ -136,22 +251,166 @@ class FetchListItemsView(AuthorOrAssigneeRequiredMixin, View):
 
 
 class FetchZaakDetail(RoleRequiredMixin, View):
+    """
+    Return the resultaat, the documenten and the besluiten of a zaak.
+
+    The documenten can be paginated with the ``documenten_page`` and
+    ``documenten_page_size`` query parameters, in which case only the documenten on
+    the requested page are retrieved.
+    """
+
     role_permission = "can_view_case_details"
+    page_query_param = "documenten_page"
+    page_size_query_param = "documenten_page_size"
+    default_page_size = 25
+    max_page_size = 100
+
+    def get_documenten_data(self, zaak_url: str, page_number, page_size) -> dict:
+        if not (page_number or page_size):
+            return {"documenten": get_documenten(zaak_url)}
+
+        zios = get_zaakinformatieobjecten(zaak_url)
+        page_size = int(page_size or self.default_page_size)
+        page_size = max(1, min(page_size, self.max_page_size))
+        page = Paginator(zios, page_size).page(page_number or 1)
+
+        return {
+            "documenten": get_documenten(zaak_url, zios=page.object_list),
+            "documentenCount": page.paginator.count,
+            "documentenNext": page.next_page_number() if page.has_next() else None,
+            "documentenPrevious": (
+                page.previous_page_number() if page.has_previous() else None
+            ),
+        }
 
     def get(self, request):
         zaak_url = request.GET.get("zaak_url")
         if not zaak_url:
             return HttpResponseBadRequest("zaak_url query parameter must be specified")
 
+        page_number = request.GET.get(self.page_query_param)
+        page_size = request.GET.get(self.page_size_query_param)
+
+        # Use the mirrored zaak instead of retrieving it again
+        zaak = None
+        if settings.ZAKEN_MIRROR_ENABLED:
+            zaak = get_mirrored_zaken([zaak_url]).get(zaak_url)
+
         with parallel() as executor:
-            resultaat = executor.submit(get_resultaat, zaak_url)
-            documenten = executor.submit(get_documenten, zaak_url)
+            resultaat = executor.submit(get_resultaat, zaak_url, zaak)
+            documenten = executor.submit(
+                self.get_documenten_data, zaak_url, page_number, page_size
+            )
             besluiten = executor.submit(get_besluiten, zaak_url)
 
+        try:
+            documenten_data = documenten.result()
+        except (InvalidPage, ValueError):
+            return HttpResponseBadRequest(_("Invalid page."))
+
         result = {
             "resultaat": resultaat.result(),
-            "documenten": documenten.result(),
+            **documenten_data,
             "besluiten": besluiten.result(),
         }
 
         return JsonResponse(result)
+
+
+class FetchZakenDetailView(RoleRequiredMixin, View):
+    """
+    Return the resultaat, the documenten and the besluiten of several zaken.
+
+    The zaken are passed as repeated ``zaak_url`` query parameters. The details of
+    each zaak are streamed as a separate line (``application/x-ndjson``) as soon as
+    they are retrieved, so not in the order of the query parameters. The types are
+    only retrieved once for all the zaken.
+    """
+
+    role_permission = "can_view_case_details"
+    max_zaken = 100
+    max_workers = 8
+
+    def get(self, request):
+        zaken_urls = list(dict.fromkeys(request.GET.getlist("zaak_url")))
+        if not zaken_urls:
+            return HttpResponseBadRequest("zaak_url query parameter must be specified")
+        if len(zaken_urls) > self.max_zaken:
+            return HttpResponseBadRequest(
+                _("At most %(max)s zaken can be requested at once.")
+                % {"max": self.max_zaken}
+            )
+
+        mirrored_zaken = {}
+        if settings.ZAKEN_MIRROR_ENABLED:
+            mirrored_zaken = get_mirrored_zaken(zaken_urls)
+
+        return StreamingHttpResponse(
+            self.stream_details(zaken_urls, mirrored_zaken),
+            content_type="application/x-ndjson",
+        )
+
+    def stream_details(
+        self, zaken_urls: List[str], mirrored_zaken: Dict[str, dict]
+    ) -> Iterator[str]:
+        with memoized_lookups(), parallel(max_workers=self.max_workers) as executor:
+            informatieobjecttypen = get_informatieobjecttypen(dict_response=True)
+            besluittypen = get_besluittypen(dict_response=True)
+
+            tasks = {
+                executor.submit(
+                    get_zaak_detail,
+                    zaak_url,
+                    mirrored_zaken.get(zaak_url),
+                    informatieobjecttypen,
+                    besluittypen,
+                ): zaak_url
+                for zaak_url in zaken_urls
+            }
+            for task in futures.as_completed(tasks):
+                zaak_url = tasks[task]
+                try:
+                    result = {"zaakUrl": zaak_url, **task.result()}
+                except (ClientError, RequestException) as exc:
+                    logger.warning(
+                        "Details of zaak %s not retrieved: %r", zaak_url, exc
+                    )
+                    result = {
+                        "zaakUrl": zaak_url,
+                        "error": _("The details of the zaak could not be retrieved."),
+                    }
+                yield json.dumps(result, cls=DjangoJSONEncoder) + "\n"
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ZakenNotificationView(View):
+    """
+    Callback for the notifications of the ``zaken`` channel of the Notificaties API.
+
+    The mirrored zaak is updated for every notification about the zaak or about one
+    of its sub-resources, so that the mirror follows the changes made to the zaken.
+    """
+
+    def post(self, request):
+        auth = settings.ZAKEN_MIRROR_NOTIFICATIONS_AUTH
+        if not auth or not constant_time_compare(
+            request.headers.get("Authorization", ""), auth
+        ):
+            return HttpResponseForbidden()
+
+        try:
+            notification = json.loads(request.body)
+            zaak_url = notification["hoofdObject"]
+        except (ValueError, TypeError, KeyError):
+            return HttpResponseBadRequest(_("Invalid notification."))
+
+        if notification.get("kanaal") == "zaken" and settings.ZAKEN_MIRROR_ENABLED:
+            if (
+                notification.get("resource") == "zaak"
+                and notification.get("actie") == "destroy"
+            ):
+                delete_mirrored_zaak(zaak_url)
+            else:
+                sync_mirrored_zaak.delay(zaak_url)
+
+        return HttpResponse(status=204)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class DestructionConfig(AppConfig):
+    name = "archiefbeheercomponent.destruction"
+
+    def ready(self):
+        # load the signal receivers
+        from . import signals  # noqa
@@ -0,0 +1,294 @@
+import copy
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import caches
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from zds_client.client import ClientError
+from zds_client.schema import get_headers
+from zgw_consumers.client import ZGWClient
+from zgw_consumers.models import Service
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Allow on average ``rate`` calls per second, with bursts of at most ``capacity``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """
+    Retrieved resources with their ETag, kept in the ``zgw`` cache.
+
+    A cached resource is revalidated with ``If-None-Match`` when it is retrieved
+    again, so that an unchanged resource (``304 Not Modified``) is not transferred
+    again. The entries expire after ``ZGW_RESPONSE_CACHE_TIMEOUT`` seconds
+    and responses larger than ``ZGW_RESPONSE_CACHE_MAX_SIZE`` bytes are not kept.
+    """
+
+    prefix = "zgw:response"
+    stat_names = ["not_modified", "modified", "misses", "not_cached"]
+
+    @property
+    def cache(self):
+        return caches["zgw"]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.ZGW_RESPONSE_CACHE_TIMEOUT)
+
+    def get(self, url: str) -> Optional[Tuple[str, bytes]]:
+        """Return the ETag and the content of the resource, if it is cached."""
+        return self.cache.get(f"{self.prefix}:{url}")
+
+    def set(self, url: str, etag: str, content: bytes) -> bool:
+        if len(content) > settings.ZGW_RESPONSE_CACHE_MAX_SIZE:
+            self.increment("not_cached")
+            return False
+
+        self.cache.set(
+            f"{self.prefix}:{url}",
+            (etag, content),
+            timeout=settings.ZGW_RESPONSE_CACHE_TIMEOUT,
+        )
+        return True
+
+    def increment(self, stat: str) -> None:
+        key = f"{self.prefix}:stats:{stat}"
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, timeout=None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the number of retrieved resources which were not modified, which were
+        modified, which were not cached yet and which were too large to be cached.
+        """
+        return {
+            stat: self.cache.get(f"{self.prefix}:stats:{stat}", 0)
+            for stat in self.stat_names
+        }
+
+
+response_cache = ResponseCache()
+
+
+class PooledZGWClient(ZGWClient):
+    """
+    ZGW client which can send its requests through a shared keep-alive session.
+
+    Without a session (the default) it behaves exactly like the ``ZGWClient``.
+    """
+
+    session: Optional[requests.Session] = None
+    rate_limiter: Optional[TokenBucket] = None
+    response_cache: Optional[ResponseCache] = None
+
+    def request(
+        self,
+        path: str,
+        operation: str,
+        method="GET",
+        expected_status=200,
+        request_kwargs: Optional[dict] = None,
+        **kwargs,
+    ):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+        if not self.session:
+            return super().request(
+                path, operation, method, expected_status, request_kwargs, **kwargs
+            )
+
+        # Prepared like ZGWClient.request and Client.request do, but sent with the
+        # session of the client
+        if self.server_certificate_path:
+            kwargs["verify"] = self.server_certificate_path
+        if self.client_certificate_path:
+            kwargs["cert"] = (
+                (self.client_certificate_path, self.client_private_key_path)
+                if self.client_private_key_path
+                else self.client_certificate_path
+            )
+
+        url = urljoin(self.base_url, path)
+        if request_kwargs:
+            kwargs.update(request_kwargs)
+
+        headers = CaseInsensitiveDict(kwargs.pop("headers", {}))
+        headers.setdefault("Accept", "application/json")
+        headers.setdefault("Content-Type", "application/json")
+        for header, value in get_headers(self.schema, operation).items():
+            headers.setdefault(header, value)
+        if self.auth:
+            headers.update(self.auth.credentials())
+        kwargs["headers"] = headers
+
+        pre_id = self.pre_request(method, url, **kwargs)
+
+        # Only the retrieved resources are cached, not the (filtered) lists. The
+        # resources retrieved with query parameters (e.g. expand) are not cached
+        # either, since the cache is keyed by URL
+        cacheable = bool(
+            self.response_cache
+            and self.response_cache.enabled
+            and method == "GET"
+            and operation.endswith(self.operation_suffix_mapping["retrieve"])
+            and not kwargs.get("params")
+        )
+        cached = self.response_cache.get(url) if cacheable else None
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        response = self.session.request(method, url, **kwargs)
+        not_modified = bool(cached) and response.status_code == 304
+
+        if not_modified:
+            self.response_cache.increment("not_modified")
+            response_json = json.loads(cached[1])
+        else:
+            if cacheable and response.status_code == 200:
+                self.response_cache.increment("modified" if cached else "misses")
+                if etag := response.headers.get("ETag"):
+                    self.response_cache.set(url, etag, response.content)
+
+            try:
+                response_json = response.json()
+            except Exception:
+                response_json = None
+
+        self.post_response(pre_id, response_json)
+        self._log.add(
+            self.service,
+            url,
+            method,
+            dict(headers),
+            copy.deepcopy(kwargs.get("data", kwargs.get("json", None))),
+            response.status_code,
+            dict(response.headers),
+            response_json,
+            params=kwargs.get("params"),
+        )
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as exc:
+            if response.status_code >= 500:
+                raise
+            raise ClientError(response_json) from exc
+
+        # The cached resource is returned if it was not modified
+        assert not_modified or response.status_code == expected_status, response_json
+        return response_json
+
+
+def build_session() -> requests.Session:
+    """
+    Build a keep-alive session with a bounded connection pool per host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_maxsize=settings.MAX_REQUESTS_PER_HOST,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of clients, with one client per configured service.
+
+    The clients of a service share a session and a rate limiter, so that the TCP/TLS
+    connections are reused between calls and threads. A client is rebuilt after
+    ``ZGW_CLIENT_REGISTRY_TIMEOUT`` seconds, to pick up changes made to the service
+    in other processes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Service, ZGWClient]] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+
+    def _is_fresh(self, built_at: float) -> bool:
+        return time.monotonic() - built_at < settings.ZGW_CLIENT_REGISTRY_TIMEOUT
+
+    def _build_entry(self, service: Service) -> Tuple[float, Service, ZGWClient]:
+        client = service.build_client()
+        if isinstance(client, PooledZGWClient):
+            client.session = build_session()
+            if settings.ZGW_SERVICE_RATE_LIMIT:
+                client.rate_limiter = TokenBucket(settings.ZGW_SERVICE_RATE_LIMIT)
+            client.response_cache = response_cache
+        return time.monotonic(), service, client
+
+    def get_client(self, service: Service) -> ZGWClient:
+        with self._lock:
+            entry = self._entries.get(service.api_root)
+            if entry and self._is_fresh(entry[0]):
+                return entry[2]
+
+        entry = self._build_entry(service)
+        with self._lock:
+            self._entries[service.api_root] = entry
+        return entry[2]
+
+    def get_client_for_url(self, url: Optional[str]) -> Optional[ZGWClient]:
+        if not url:
+            return None
+
+        with self._lock:
+            # the most specific API root wins, like in Service.get_service
+            for api_root in sorted(self._entries, key=len, reverse=True):
+                built_at, service, client = self._entries[api_root]
+                if url.startswith(api_root) and self._is_fresh(built_at):
+                    return client
+
+        service = Service.get_service(url)
+        if not service:
+            return None
+        return self.get_client(service)
+
+
+registry = ClientRegistry()
@@ -19,6 +19,13 @@ class ListItemStatus(DjangoChoices):
     failed = ChoiceItem("failed", _("destruction did not succeed"))
 
 
+class ExportStatus(DjangoChoices):
+    pending = ChoiceItem("pending", _("pending"))
+    processing = ChoiceItem("processing", _("processing"))
+    completed = ChoiceItem("completed", _("completed"))
+    failed = ChoiceItem("failed", _("failed"))
+
+
 class ReviewStatus(DjangoChoices):
     approved = ChoiceItem("approved", _("approved"))
     changes_requested = ChoiceItem("changes_requested", _("changes requested"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ...mirror import sync_zaken
+
+
+class Command(BaseCommand):
+    help = (
+        "Load all the zaken of the Zaken API(s) in the local mirror. The mirrored "
+        "zaken which no longer exist are removed."
+    )
+
+    def handle(self, *args, **options):
+        count = sync_zaken()
+        self.stdout.write(self.style.SUCCESS(f"{count} zaken mirrored"))
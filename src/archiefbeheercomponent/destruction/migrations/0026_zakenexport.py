@@ -0,0 +1,89 @@
+# Generated by Django 3.2.19 on 2026-10-18 08:42
+
+from django.conf import settings
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import privates.fields
+import privates.storages
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("destruction", "0025_archiveconfig_additional_review_document_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ZakenExport",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "zaken_urls",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.URLField(max_length=1000),
+                        help_text="URLs of the zaken to export",
+                        size=None,
+                        verbose_name="zaken URLs",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("processing", "processing"),
+                            ("completed", "completed"),
+                            ("failed", "failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "content",
+                    privates.fields.PrivateMediaFileField(
+                        blank=True,
+                        help_text="The spreadsheet with the exported zaken",
+                        storage=privates.storages.PrivateMediaFileSystemStorage(),
+                        upload_to="exports/%Y/%m/",
+                        verbose_name="content",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created"),
+                ),
+                (
+                    "finished",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="finished"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="User who requested the export",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "zaken export",
+                "verbose_name_plural": "zaken exports",
+            },
+        ),
+    ]
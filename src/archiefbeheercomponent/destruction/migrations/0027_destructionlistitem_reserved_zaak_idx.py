@@ -0,0 +1,21 @@
+# Generated by Django 3.2.19 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destruction", "0026_zakenexport"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="destructionlistitem",
+            index=models.Index(
+                condition=models.Q(("status__in", ("suggested", "processing"))),
+                fields=["zaak"],
+                name="reserved_zaak_idx",
+            ),
+        ),
+    ]
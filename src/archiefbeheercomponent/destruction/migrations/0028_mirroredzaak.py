@@ -0,0 +1,92 @@
+# Generated by Django 3.2.19 on 2026-10-18 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destruction", "0027_destructionlistitem_reserved_zaak_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MirroredZaak",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "url",
+                    models.URLField(max_length=1000, unique=True, verbose_name="URL"),
+                ),
+                (
+                    "zaaktype",
+                    models.URLField(
+                        db_index=True, max_length=1000, verbose_name="zaaktype"
+                    ),
+                ),
+                (
+                    "identificatie",
+                    models.CharField(
+                        blank=True, max_length=40, verbose_name="identificatie"
+                    ),
+                ),
+                (
+                    "bronorganisatie",
+                    models.CharField(
+                        blank=True, max_length=9, verbose_name="bronorganisatie"
+                    ),
+                ),
+                (
+                    "registratiedatum",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="registratiedatum"
+                    ),
+                ),
+                (
+                    "startdatum",
+                    models.DateField(db_index=True, verbose_name="startdatum"),
+                ),
+                (
+                    "einddatum",
+                    models.DateField(blank=True, null=True, verbose_name="einddatum"),
+                ),
+                (
+                    "archiefnominatie",
+                    models.CharField(
+                        blank=True,
+                        db_index=True,
+                        max_length=20,
+                        verbose_name="archiefnominatie",
+                    ),
+                ),
+                (
+                    "archiefactiedatum",
+                    models.DateField(
+                        blank=True,
+                        db_index=True,
+                        null=True,
+                        verbose_name="archiefactiedatum",
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        help_text="The zaak as returned by the API", verbose_name="data"
+                    ),
+                ),
+                ("synced", models.DateTimeField(auto_now=True, verbose_name="synced")),
+            ],
+            options={
+                "verbose_name": "mirrored zaak",
+                "verbose_name_plural": "mirrored zaken",
+            },
+        ),
+    ]
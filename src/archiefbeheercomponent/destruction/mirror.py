@@ -0,0 +1,228 @@
+"""
+Local mirror of the zaken of the Zaken API(s).
+
+Listing zaken from the Zaken API(s) means going through all the pages of results
+for every filter. With ``ZAKEN_MIRROR_ENABLED``, the zaken are filtered, ordered and
+paginated in the database instead. The mirror is loaded with the ``sync-zaken``
+management command. It is then kept up to date by the changes made through this
+application and by the notifications of the Zaken API(s).
+"""
+import logging
+from collections.abc import Sequence
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, CharField, QuerySet, Value, When
+from django.utils import timezone
+
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+from .client import registry
+from .models import MirroredZaak
+
+logger = logging.getLogger(__name__)
+
+MIRRORED_FIELDS = [
+    "zaaktype",
+    "identificatie",
+    "bronorganisatie",
+    "registratiedatum",
+    "startdatum",
+    "einddatum",
+    "archiefnominatie",
+    "archiefactiedatum",
+]
+ORDERING_FIELDS = [
+    "identificatie",
+    "registratiedatum",
+    "startdatum",
+    "einddatum",
+    "archiefactiedatum",
+]
+
+
+def _split(value: str) -> List[str]:
+    return [part for part in value.split(",") if part]
+
+
+def _is_null(value: str) -> bool:
+    return str(value).lower() in ["true", "1"]
+
+
+# The query parameters of the Zaken API which can be applied to the mirror, with the
+# function to convert their value
+MIRRORED_FILTERS = {
+    **{
+        name: str
+        for name in ["zaaktype", "identificatie", "bronorganisatie", "archiefnominatie"]
+    },
+    **{
+        f"{name}__in": _split
+        for name in ["zaaktype", "bronorganisatie", "archiefnominatie"]
+    },
+    **{
+        f"{name}{lookup}": date.fromisoformat
+        for name in ["startdatum", "einddatum", "archiefactiedatum"]
+        for lookup in ["", "__lt", "__lte", "__gt", "__gte"]
+    },
+    **{f"{name}__isnull": _is_null for name in ["einddatum", "archiefactiedatum"]},
+}
+
+
+def filter_mirrored_zaken(query_params) -> Optional[QuerySet]:
+    """
+    Return the mirrored zaken matching the query parameters of the Zaken API.
+
+    ``None`` is returned if one of the query parameters can't be applied to the
+    mirror, in which case the zaken need to be listed from the Zaken API(s).
+    """
+    filters = {}
+    ordering = []
+    for name, value in query_params.items():
+        if name == "ordering":
+            ordering = _split(value)
+            if any(field.lstrip("-") not in ORDERING_FIELDS for field in ordering):
+                return None
+        elif name in MIRRORED_FILTERS:
+            try:
+                filters[name] = MIRRORED_FILTERS[name](value)
+            except ValueError:
+                return None
+        else:
+            return None
+
+    # The zaken are stored in the order in which they were listed by the Zaken API(s)
+    return MirroredZaak.objects.filter(**filters).order_by(*ordering, "pk")
+
+
+class MirroredZaken(Sequence):
+    """
+    The zaken of a queryset of mirrored zaken, with their zaaktype resolved.
+
+    The zaken are only retrieved from the database when they are iterated over or
+    sliced, so that paginating them only retrieves the zaken of the requested page.
+    The zaaktypen are expected to resolve an unknown URL to a placeholder (see
+    ``ZaaktypenByUrl``), so that the zaken of an unavailable Catalogi API are listed.
+    """
+
+    def __init__(self, queryset: QuerySet, zaaktypen: Dict[str, dict]):
+        self.queryset = queryset
+        self.zaaktypen = zaaktypen
+        self._count = None
+
+    def sort_by_zaaktype(self) -> "MirroredZaken":
+        omschrijving = Case(
+            *[
+                When(zaaktype=url, then=Value(zaaktype["omschrijving"]))
+                for url, zaaktype in self.zaaktypen.items()
+            ],
+            output_field=CharField(),
+        )
+        queryset = self.queryset.order_by(omschrijving, *self.queryset.query.order_by)
+        return MirroredZaken(queryset, self.zaaktypen)
+
+    def _to_zaak(self, mirrored_zaak: MirroredZaak) -> dict:
+        zaak = dict(mirrored_zaak.data)
+        zaak["zaaktype"] = self.zaaktypen[zaak["zaaktype"]]
+        return zaak
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._to_zaak(zaak) for zaak in self.queryset[index]]
+        return self._to_zaak(self.queryset[index])
+
+    def __iter__(self) -> Iterator[dict]:
+        for zaak in self.queryset.iterator():
+            yield self._to_zaak(zaak)
+
+
+def get_mirrored_zaken(zaken_urls: List[str]) -> Dict[str, dict]:
+    """
+    Return the data of the mirrored zaken with the URLs, by URL.
+    """
+    mirrored_zaken = {}
+    for pos in range(0, len(zaken_urls), settings.ZAKEN_PER_QUERY):
+        chunk = zaken_urls[pos : pos + settings.ZAKEN_PER_QUERY]
+        mirrored_zaken.update(
+            MirroredZaak.objects.filter(url__in=chunk).values_list("url", "data")
+        )
+    return mirrored_zaken
+
+
+def _get_mirrored_values(zaak: dict) -> dict:
+    values = {field: zaak.get(field) for field in MIRRORED_FIELDS}
+    for field in ["identificatie", "bronorganisatie", "archiefnominatie"]:
+        values[field] = values[field] or ""
+    return {**values, "data": zaak, "synced": timezone.now()}
+
+
+@transaction.atomic
+def save_mirrored_zaken(zaken: Iterable[dict]) -> None:
+    """
+    Create or update the mirrored zaken with the zaken returned by the Zaken API.
+    """
+    zaken = {zaak["url"]: zaak for zaak in zaken}
+    existing = {
+        mirrored_zaak.url: mirrored_zaak
+        for mirrored_zaak in MirroredZaak.objects.filter(url__in=zaken.keys())
+    }
+
+    new_zaken = []
+    for url, zaak in zaken.items():
+        values = _get_mirrored_values(zaak)
+        if url in existing:
+            for field, value in values.items():
+                setattr(existing[url], field, value)
+        else:
+            new_zaken.append(MirroredZaak(url=url, **values))
+
+    MirroredZaak.objects.bulk_create(new_zaken)
+    MirroredZaak.objects.bulk_update(
+        existing.values(), fields=[*MIRRORED_FIELDS, "data", "synced"]
+    )
+
+
+def delete_mirrored_zaak(url: str) -> None:
+    MirroredZaak.objects.filter(url=url).delete()
+
+
+def _iter_zaken_pages(client) -> Iterator[List[dict]]:
+    request_kwargs = {"headers": {"Accept-Crs": "EPSG:4326"}, "params": {}}
+    while True:
+        response = client.list("zaak", request_kwargs=request_kwargs)
+        yield response["results"]
+
+        if not response.get("next"):
+            break
+        query = parse_qs(urlparse(response["next"]).query)
+        request_kwargs["params"]["page"] = [int(query["page"][0])]
+
+
+def sync_zaken() -> int:
+    """
+    Load all the zaken of the Zaken API(s) in the mirror, one page at a time.
+
+    The mirrored zaken which are no longer returned by the Zaken API(s) are removed.
+    Returns the number of mirrored zaken.
+    """
+    start = timezone.now()
+    count = 0
+    for zrc in Service.objects.filter(api_type=APITypes.zrc):
+        client = registry.get_client(zrc)
+        for zaken in _iter_zaken_pages(client):
+            save_mirrored_zaken(zaken)
+            count += len(zaken)
+            logger.debug("Mirrored %d zaken of %s", count, zrc)
+
+    deleted, _ = MirroredZaak.objects.filter(synced__lt=start).delete()
+    logger.info("Mirrored %d zaken, removed %d zaken", count, deleted)
+    return count
@@ -10,15 +10,17 @@ from django.utils.translation import ugettext_lazy as _
 from django_fsm import FSMField, transition
 from ordered_model.models import OrderedModel
 from privates.fields import PrivateMediaFileField
-from solo.models import SingletonModel
 from timeline_logger.models import TimelineLog
 
 from archiefbeheercomponent.accounts.models import User
 from archiefbeheercomponent.notifications.models import Notification
+from archiefbeheercomponent.report.models import DestructionReport
+from archiefbeheercomponent.utils.models import CachedSingletonModel
 
 from ..emails.constants import EmailTypeChoices
 from ..emails.models import AutomaticEmail
 from .constants import (
+    ExportStatus,
     ListItemStatus,
     ListStateDisplay,
     ListStatus,
@@ -27,6 +29,56 @@ from .constants import (
 )
 
 
+class DestructionListQuerySet(models.QuerySet):
+    def annotate_overview(self) -> "DestructionListQuerySet":
+        """
+        Annotate the values shown for each list in the overviews.
+
+        They are used by ``list_state``, ``total_reviewers``, ``completed_reviewers``,
+        ``is_review_overdue`` and the ``download_report_link`` tag instead of a
+        few queries per list.
+        """
+        number_days = ArchiveConfig.get_solo().days_until_reminder
+
+        assignees = DestructionListAssignee.objects.filter(
+            destruction_list=models.OuterRef("pk")
+        )
+        current_assignee = assignees.filter(assignee=models.OuterRef("assignee"))
+        reviews = DestructionListReview.objects.filter(
+            destruction_list=models.OuterRef("pk")
+        )
+        reports = DestructionReport.objects.filter(
+            destruction_list=models.OuterRef("pk")
+        ).order_by("pk")
+
+        return self.select_related("assignee").annotate(
+            last_review_status=models.Subquery(
+                reviews.order_by("-id").values("status")[:1]
+            ),
+            number_of_assignees=models.Subquery(
+                assignees.order_by()
+                .values("destruction_list")
+                .annotate(count=models.Count("pk"))
+                .values("count")[:1],
+                output_field=models.IntegerField(),
+            ),
+            assignee_order=models.Subquery(current_assignee.values("order")[:1]),
+            review_overdue=models.Exists(
+                current_assignee.filter(
+                    assignee__role__can_review_destruction=True,
+                    assigned_on__lt=timezone.now() - timedelta(days=number_days),
+                )
+            ),
+            report_pk=models.Subquery(reports.values("pk")[:1]),
+            report_process_owner_id=models.Subquery(
+                reports.values("process_owner")[:1]
+            ),
+            has_additional_documents=models.Exists(
+                reviews.exclude(additional_document="")
+            ),
+        )
+
+
 class DestructionList(models.Model):
     name = models.CharField(_("name"), max_length=200, unique=True)
     author = models.ForeignKey(
@@ -72,6 +124,8 @@ class DestructionList(models.Model):
         blank=True,
     )
 
+    objects = DestructionListQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("destruction list")
         verbose_name_plural = _("destruction lists")
@@ -150,35 +204,51 @@ class DestructionList(models.Model):
         if self.status == ListStatus.completed:
             return ListStateDisplay.get_choice(ListStateDisplay.finished)
 
-        if not self.assignee:
+        if not self.assignee_id:
             return ListStateDisplay.get_choice(ListStateDisplay.approved)
 
-        if self.assignee == self.author:
-            last_review = self.last_review()
-            if last_review.status == ReviewStatus.changes_requested:
+        if self.assignee_id == self.author_id:
+            if hasattr(self, "last_review_status"):
+                last_review_status = self.last_review_status
+            else:
+                last_review_status = self.last_review().status
+
+            if last_review_status == ReviewStatus.changes_requested:
                 return ListStateDisplay.get_choice(ListStateDisplay.changes_requested)
-            elif last_review.status == ReviewStatus.rejected:
+            elif last_review_status == ReviewStatus.rejected:
                 return ListStateDisplay.get_choice(ListStateDisplay.rejected)
 
         else:
             return ListStateDisplay.get_choice(ListStateDisplay.in_progress)
 
     def total_reviewers(self):
+        if hasattr(self, "number_of_assignees"):
+            return self.number_of_assignees or 0
         return self.assignees.count()
 
     def completed_reviewers(self):
-        if not self.assignee:
-            return self.assignees.order_by("order").all().count()
+        if not self.assignee_id:
+            return self.total_reviewers()
 
-        if self.assignee == self.author:
+        if self.assignee_id == self.author_id:
             return 0
 
-        return (
-            DestructionListAssignee.objects.get(
-                assignee=self.assignee, destruction_list=self
-            ).order
-            - 1
-        )
+        if hasattr(self, "assignee_order"):
+            order = self.assignee_order
+        else:
+            order = (
+                DestructionListAssignee.objects.filter(
+                    assignee=self.assignee_id, destruction_list=self
+                )
+                .values_list("order", flat=True)
+                .first()
+            )
+
+        # The current assignee is not one of the (ordered) reviewers of the list
+        if order is None:
+            return 0
+
+        return order - 1
 
     def response_to_reviewer(
         self, current_reviewer
@@ -191,9 +261,12 @@ class DestructionList(models.Model):
 
     @property
     def is_review_overdue(self):
-        if not self.assignee:
+        if not self.assignee_id:
             return False
 
+        if hasattr(self, "review_overdue"):
+            return self.review_overdue
+
         archive_config = ArchiveConfig.get_solo()
         number_days = archive_config.days_until_reminder
 
@@ -204,6 +277,18 @@ class DestructionList(models.Model):
         ).exists()
 
 
+# The zaak of an item with one of these statuses can't be added to another list
+RESERVED_ITEM_STATUSES = (ListItemStatus.suggested, ListItemStatus.processing)
+
+
+class DestructionListItemQuerySet(models.QuerySet):
+    def reserved(self) -> "DestructionListItemQuerySet":
+        """
+        Items of which the zaak is reserved, using the partial index on the zaak.
+        """
+        return self.filter(status__in=RESERVED_ITEM_STATUSES)
+
+
 class DestructionListItem(models.Model):
     destruction_list = models.ForeignKey(
         DestructionList,
@@ -232,10 +317,19 @@ class DestructionListItem(models.Model):
         blank=True,
     )
 
+    objects = DestructionListItemQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("destruction list item")
         verbose_name_plural = _("destruction list items")
         unique_together = ("destruction_list", "zaak")
+        indexes = [
+            models.Index(
+                fields=["zaak"],
+                name="reserved_zaak_idx",
+                condition=models.Q(status__in=RESERVED_ITEM_STATUSES),
+            )
+        ]
 
     def __str__(self):
         return f"{self.destruction_list}: {self.zaak}"
@@ -405,7 +499,7 @@ ZAC_TEMPLATE_ELEMENTS = (
 )
 
 
-class ArchiveConfig(SingletonModel):
+class ArchiveConfig(CachedSingletonModel):
     archive_date = models.DateField(
         _("archive date"),
         null=True,
@@ -513,3 +607,74 @@ class StandardReviewAnswer(OrderedModel):
     class Meta(OrderedModel.Meta):
         verbose_name = _("standard review answers")
         verbose_name_plural = _("standard review answers")
+
+
+class ZakenExport(models.Model):
+    """
+    Spreadsheet with zaken (without archive date), created in the background.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name=_("user"),
+        help_text=_("User who requested the export"),
+    )
+    zaken_urls = ArrayField(
+        models.URLField(max_length=1000),
+        verbose_name=_("zaken URLs"),
+        help_text=_("URLs of the zaken to export"),
+    )
+    status = models.CharField(
+        _("status"),
+        max_length=20,
+        choices=ExportStatus.choices,
+        default=ExportStatus.pending,
+    )
+    content = PrivateMediaFileField(
+        verbose_name=_("content"),
+        upload_to="exports/%Y/%m/",
+        blank=True,
+        help_text=_("The spreadsheet with the exported zaken"),
+    )
+    created = models.DateTimeField(_("created"), auto_now_add=True)
+    finished = models.DateTimeField(_("finished"), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _("zaken export")
+        verbose_name_plural = _("zaken exports")
+
+    def __str__(self):
+        return f"{self.user} ({self.created})"
+
+
+class MirroredZaak(models.Model):
+    """
+    Local copy of a zaak of the Zaken API(s), used to filter and paginate zaken.
+
+    Only the fields used to filter and order the zaken are stored in separate
+    (indexed) columns. The zaak as returned by the API is stored in ``data``.
+    """
+
+    url = models.URLField(_("URL"), max_length=1000, unique=True)
+    zaaktype = models.URLField(_("zaaktype"), max_length=1000, db_index=True)
+    identificatie = models.CharField(_("identificatie"), max_length=40, blank=True)
+    bronorganisatie = models.CharField(_("bronorganisatie"), max_length=9, blank=True)
+    registratiedatum = models.DateField(_("registratiedatum"), blank=True, null=True)
+    startdatum = models.DateField(_("startdatum"), db_index=True)
+    einddatum = models.DateField(_("einddatum"), blank=True, null=True)
+    archiefnominatie = models.CharField(
+        _("archiefnominatie"), max_length=20, blank=True, db_index=True
+    )
+    archiefactiedatum = models.DateField(
+        _("archiefactiedatum"), blank=True, null=True, db_index=True
+    )
+    data = models.JSONField(_("data"), help_text=_("The zaak as returned by the API"))
+    synced = models.DateTimeField(_("synced"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("mirrored zaak")
+        verbose_name_plural = _("mirrored zaken")
+
+    def __str__(self):
+        return self.identificatie or self.url
@@ -1,41 +1,323 @@
-from typing import List, Optional, Union
+import functools
+import heapq
+import logging
+import threading
+import time
+from concurrent import futures
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Union
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
 
 from zds_client.client import ClientError
-from zgw_consumers.concurrent import parallel
+from zgw_consumers import concurrent
+from zgw_consumers.client import ZGWClient
+from zgw_consumers.concurrent import wrap_fn
 from zgw_consumers.constants import APITypes
 from zgw_consumers.models import Service
 from zgw_consumers.service import get_paginated_results
 
+from .client import registry, response_cache
+from .mirror import (
+    MirroredZaken,
+    delete_mirrored_zaak,
+    filter_mirrored_zaken,
+    get_mirrored_zaken,
+    save_mirrored_zaken,
+)
+
+logger = logging.getLogger(__name__)
+
 
 def _client_from_url(url: str):
-    service = Service.get_service(url)
-    if not service:
+    client = registry.get_client_for_url(url)
+    if not client:
         raise ClientError("There is no Service configured for %r" % url)
-    return service.build_client()
+    return client
 
 
 def _uuid_from_url(url: str):
     return url.rstrip("/").split("/")[-1]
 
 
+def _get_request_timeout() -> Optional[int]:
+    return settings.ZGW_SERVICE_TIMEOUT or None
+
+
+def query_services(
+    api_type: str,
+    fetch: Callable[[ZGWClient], list],
+    unavailable_services: Optional[List[str]] = None,
+) -> List[list]:
+    """
+    Call ``fetch`` with the client of each service of the API type concurrently.
+
+    The results are returned in the order of the services. A service which fails
+    (e.g. a request timed out after ``ZGW_SERVICE_TIMEOUT`` seconds) or which didn't
+    return within ``ZGW_SERVICE_QUERY_TIMEOUT`` seconds (if set) is left out of the
+    results, and its API root is added to ``unavailable_services`` if a list is
+    passed. If none of the services returned results, the error of the first service
+    is raised.
+    """
+    services = list(Service.objects.filter(api_type=api_type))
+    if not services:
+        return []
+
+    executor = futures.ThreadPoolExecutor(max_workers=len(services))
+    tasks = [
+        executor.submit(wrap_fn(_with_lookup_memo(fetch)), registry.get_client(service))
+        for service in services
+    ]
+    # Don't wait for the services which don't return in time
+    executor.shutdown(wait=False)
+    futures.wait(tasks, timeout=settings.ZGW_SERVICE_QUERY_TIMEOUT or None)
+
+    results = []
+    errors = []
+    for service, task in zip(services, tasks):
+        if not task.done():
+            error = futures.TimeoutError(f"{service.api_root} did not return in time")
+        else:
+            error = task.exception()
+
+        if error is None:
+            results.append(task.result())
+            continue
+
+        logger.warning("Service %s is unavailable: %r", service.api_root, error)
+        errors.append(error)
+        if unavailable_services is not None:
+            unavailable_services.append(service.api_root)
+
+    if not results:
+        raise errors[0]
+    return results
+
+
+class LookupMemo:
+    """
+    Memoize the retrieval of remote resources which repeat across many zaken.
+
+    The lookups are shared between the threads started within the scope, so that
+    the enrichment of zaken done in parallel also benefits from it.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, url: str, fetch: Callable[[str], dict]) -> dict:
+        with self._lock:
+            if url in self.results:
+                self.hits += 1
+                return self.results[url]
+
+        timeout = settings.REMOTE_LOOKUP_CACHE_TIMEOUT
+        cache_key = f"destruction:lookup:{url}"
+        result = cache.get(cache_key) if timeout else None
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if result is None:
+            result = fetch(url)
+            if timeout:
+                cache.set(cache_key, result, timeout=timeout)
+
+        with self._lock:
+            return self.results.setdefault(url, result)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"remote_calls": self.misses, "saved_calls": self.hits}
+
+
+_lookup_memo: ContextVar[Optional[LookupMemo]] = ContextVar("lookup_memo", default=None)
+
+
+@contextmanager
+def memoized_lookups() -> Iterator[LookupMemo]:
+    """
+    Fetch each distinct zaaktype, procestype and resultaattype only once within the
+    scope.
+
+    Use it around a request or a task. Nested scopes share the memo of the outermost
+    scope, which is discarded when it is exited. Use :class:`parallel` to use the
+    memo in worker threads.
+    """
+    memo = _lookup_memo.get()
+    if memo is not None:
+        yield memo
+        return
+
+    memo = LookupMemo()
+    token = _lookup_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _lookup_memo.reset(token)
+
+
+def _with_lookup_memo(fn: Callable) -> Callable:
+    """
+    Run the function with the lookup memo of the caller, from another thread.
+    """
+    memo = _lookup_memo.get()
+
+    @functools.wraps(fn)
+    def wrapped(*args, **kwargs):
+        token = _lookup_memo.set(memo)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _lookup_memo.reset(token)
+
+    return wrapped
+
+
+class parallel(concurrent.parallel):
+    """
+    Run functions in worker threads with the lookup memo of the calling thread.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        return super().submit(_with_lookup_memo(fn), *args, **kwargs)
+
+    def map(self, fn, *iterables, **kwargs):
+        return super().map(_with_lookup_memo(fn), *iterables, **kwargs)
+
+
+def _memoized(url: str, fetch: Callable[[str], dict]) -> dict:
+    memo = _lookup_memo.get()
+    if memo is None:
+        return fetch(url)
+    return memo.get_or_fetch(url, fetch)
+
+
 # ZTC
-def get_types_generic(type_name, dict_response=False) -> Union[list, dict]:
-    typen = []
+TYPES_CACHE_PREFIX = "destruction:ztc-types"
+TYPES_CACHE_VERSION_KEY = f"{TYPES_CACHE_PREFIX}:version"
+
+
+def _get_types_cache_key(type_name: str) -> str:
+    version = cache.get_or_set(TYPES_CACHE_VERSION_KEY, 1, timeout=None)
+    return f"{TYPES_CACHE_PREFIX}:{version}:{type_name}"
 
-    for ztc in Service.objects.filter(api_type=APITypes.ztc):
-        client = ztc.build_client()
-        typen += get_paginated_results(
-            client, type_name, request_kwargs={"headers": {"Accept-Crs": "EPSG:4326"}}
+
+def _increment_types_cache_stat(stat: str) -> None:
+    key = f"{TYPES_CACHE_PREFIX}:{stat}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_types_cache_stats() -> Dict[str, int]:
+    """
+    Return the number of hits and misses of the cache of the Catalogi API types.
+    """
+    return {
+        stat: cache.get(f"{TYPES_CACHE_PREFIX}:{stat}", 0)
+        for stat in ["hits", "misses"]
+    }
+
+
+def get_response_cache_stats() -> Dict[str, int]:
+    """
+    Return the statistics of the cache of the resources retrieved from the ZGW APIs.
+    """
+    return response_cache.get_stats()
+
+
+def clear_types_cache() -> None:
+    """
+    Invalidate the cached types of all the Catalogi APIs.
+
+    The version is bumped instead of deleting the keys, so that the types cached
+    under any type name become stale at once.
+    """
+    try:
+        cache.incr(TYPES_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(TYPES_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+def _fetch_types(type_name: str, unavailable_services: List[str]) -> list:
+    def fetch(client: ZGWClient) -> list:
+        return get_paginated_results(
+            client,
+            type_name,
+            request_kwargs={
+                "headers": {"Accept-Crs": "EPSG:4326"},
+                "timeout": _get_request_timeout(),
+            },
         )
 
+    results = query_services(APITypes.ztc, fetch, unavailable_services)
+    return [typen for service_typen in results for typen in service_typen]
+
+
+def get_types_generic(
+    type_name, dict_response=False, unavailable_services: Optional[List[str]] = None
+) -> Union[list, dict]:
+    """
+    Return the types of all the Catalogi APIs.
+
+    The types of a Catalogi API which is unavailable are left out, and its API root
+    is added to ``unavailable_services`` (if a list is passed).
+    """
+    timeout = settings.ZTC_TYPES_CACHE_TIMEOUT
+    _unavailable_services = []
+    try:
+        if not timeout:
+            typen = _fetch_types(type_name, _unavailable_services)
+        else:
+            cache_key = _get_types_cache_key(type_name)
+            typen = cache.get(cache_key)
+            if typen is None:
+                _increment_types_cache_stat("misses")
+                typen = _fetch_types(type_name, _unavailable_services)
+                # Incomplete types are not cached, so they are retrieved again
+                if not _unavailable_services:
+                    cache.set(cache_key, typen, timeout=timeout)
+            else:
+                _increment_types_cache_stat("hits")
+    finally:
+        if unavailable_services is not None:
+            unavailable_services.extend(_unavailable_services)
+
     if not dict_response:
         return typen
 
     return {t["url"]: t for t in typen}
 
 
-def get_zaaktypen(dict_response=False) -> list:
-    return get_types_generic("zaaktype", dict_response)
+class ZaaktypenByUrl(dict):
+    """
+    The zaaktypen by their URL.
+
+    A zaaktype which is not known (e.g. because its Catalogi API is unavailable)
+    resolves to a placeholder with only its URL, so that its zaken can still be
+    listed.
+    """
+
+    def __missing__(self, url: str) -> dict:
+        return {"url": url, "omschrijving": "", "versiedatum": ""}
+
+
+def get_zaaktypen(
+    dict_response=False, unavailable_services: Optional[List[str]] = None
+) -> Union[list, ZaaktypenByUrl]:
+    zaaktypen = get_types_generic("zaaktype", dict_response, unavailable_services)
+    return ZaaktypenByUrl(zaaktypen) if dict_response else zaaktypen
 
 
 def get_informatieobjecttypen(dict_response=False) -> list:
@@ -46,39 +328,85 @@ def get_besluittypen(dict_response=False) -> list:
     return get_types_generic("besluittype", dict_response)
 
 
-def fetch_zaaktype(url: str) -> dict:
+def _fetch_zaaktype(url: str) -> dict:
     client = _client_from_url(url)
     response = client.retrieve("zaaktype", url=url)
     return response
 
 
+def fetch_zaaktype(url: str) -> dict:
+    return _memoized(url, _fetch_zaaktype)
+
+
 # ZRC
-def get_zaken(query_params=None) -> list:
+def _get_zaaktypen_of_zaken(
+    unavailable_services: Optional[List[str]],
+) -> ZaaktypenByUrl:
+    # The zaken are still listed if none of the Catalogi APIs is available
+    try:
+        return get_zaaktypen(
+            dict_response=True, unavailable_services=unavailable_services
+        )
+    except Exception:
+        return ZaaktypenByUrl()
+
+
+def get_zaken(
+    query_params=None, unavailable_services: Optional[List[str]] = None
+) -> Sequence[dict]:
+    """
+    Return the zaken matching the query parameters of the Zaken API.
+
+    If the local mirror is enabled and the query parameters can be applied to it, the
+    zaken are retrieved lazily from the mirror. Otherwise all the Zaken APIs are
+    queried concurrently. The API roots of the Zaken and Catalogi APIs which are
+    unavailable are added to ``unavailable_services`` (if a list is passed).
+    """
     query_params = query_params or {}
     if sort_by_zaaktype := query_params.get("sort_by_zaaktype"):
         query_params = query_params.copy()
         del query_params["sort_by_zaaktype"]
 
-    zaken = []
-    for zrc in Service.objects.filter(api_type=APITypes.zrc):
-        client = zrc.build_client()
-        zaken += get_paginated_results(
+    if settings.ZAKEN_MIRROR_ENABLED:
+        queryset = filter_mirrored_zaken(query_params)
+        if queryset is not None:
+            zaaktypen = _get_zaaktypen_of_zaken(unavailable_services)
+            zaken = MirroredZaken(queryset, zaaktypen)
+            return zaken.sort_by_zaaktype() if sort_by_zaaktype else zaken
+
+    def fetch(client: ZGWClient) -> list:
+        return get_paginated_results(
             client,
             "zaak",
             minimum=25,
             query_params=query_params,
-            request_kwargs={"headers": {"Accept-Crs": "EPSG:4326"}},
+            request_kwargs={
+                "headers": {"Accept-Crs": "EPSG:4326"},
+                "timeout": _get_request_timeout(),
+            },
         )
 
-    # Resolve zaaktype url
-    fetched_zaaktypen = get_zaaktypen(dict_response=True)
-    for zaak in zaken:
-        zaak["zaaktype"] = fetched_zaaktypen[zaak["zaaktype"]]
+    zaken_per_service = query_services(APITypes.zrc, fetch, unavailable_services)
 
-    if sort_by_zaaktype:
-        zaken = sorted(zaken, key=lambda zaak: (zaak["zaaktype"]["omschrijving"]))
-
-    return zaken
+    # Resolve zaaktype url
+    fetched_zaaktypen = _get_zaaktypen_of_zaken(unavailable_services)
+    for zaken in zaken_per_service:
+        for zaak in zaken:
+            zaak["zaaktype"] = fetched_zaaktypen[zaak["zaaktype"]]
+
+    if not sort_by_zaaktype:
+        return [zaak for zaken in zaken_per_service for zaak in zaken]
+
+    # The zaken of each service are sorted separately and then merged
+    def get_omschrijving(zaak: dict) -> str:
+        return zaak["zaaktype"]["omschrijving"]
+
+    return list(
+        heapq.merge(
+            *[sorted(zaken, key=get_omschrijving) for zaken in zaken_per_service],
+            key=get_omschrijving,
+        )
+    )
 
 
 def fetch_zaak(url: str) -> dict:
@@ -89,10 +417,83 @@ def fetch_zaak(url: str) -> dict:
     return response
 
 
+def get_query_parameters(schema: dict, operation_id: str) -> Set[str]:
+    """
+    Return the names of the query parameters of the operation in the OAS schema.
+    """
+    for path in schema.get("paths", {}).values():
+        operations = [
+            operation
+            for method, operation in path.items()
+            if method != "parameters" and operation.get("operationId") == operation_id
+        ]
+        if not operations:
+            continue
+
+        names = set()
+        for parameter in path.get("parameters", []) + operations[0].get(
+            "parameters", []
+        ):
+            if ref := parameter.get("$ref"):
+                # e.g. #/components/parameters/expand
+                parameter = schema
+                for bit in ref.lstrip("#/").split("/"):
+                    parameter = parameter.get(bit, {})
+            if parameter.get("in") == "query":
+                names.add(parameter["name"])
+        return names
+
+    return set()
+
+
+def fetch_zaak_with_resultaat(url: str, fields: Optional[List[str]] = None) -> dict:
+    """
+    Return the zaak with its resultaat (and the resultaattype of the resultaat).
+
+    If the Zaken API supports the ``expand`` query parameter (according to its OAS
+    schema), the resultaat and the resultaattype are retrieved in the same request
+    as the zaak. Only the ``fields`` of the zaak are then requested, if the Zaken API
+    supports it. Otherwise the resultaat is retrieved separately.
+    """
+    client = _client_from_url(url)
+    query_parameters = get_query_parameters(client.schema, "zaak_read")
+    if "expand" not in query_parameters:
+        zaak = fetch_zaak(url)
+        if zaak.get("resultaat"):
+            zaak["resultaat"] = fetch_resultaat(zaak["resultaat"])
+        return zaak
+
+    params = {"expand": "resultaat,resultaat.resultaattype"}
+    if fields and "fields" in query_parameters:
+        params["fields"] = ",".join(dict.fromkeys([*fields, "resultaat"]))
+    zaak = client.retrieve(
+        "zaak",
+        url=url,
+        request_kwargs={"headers": {"Accept-Crs": "EPSG:4326"}, "params": params},
+    )
+
+    expanded = zaak.pop("_expand", {})
+    if resultaat := expanded.get("resultaat"):
+        resultaattype = resultaat.pop("_expand", {}).get("resultaattype")
+        resultaat["resultaattype"] = resultaattype or _memoized(
+            resultaat["resultaattype"], _fetch_resultaattype
+        )
+        zaak["resultaat"] = resultaat
+    elif zaak.get("resultaat"):
+        zaak["resultaat"] = fetch_resultaat(zaak["resultaat"])
+
+    return zaak
+
+
 def fetch_zaken(zaken_urls: List[str]) -> List[dict]:
+    mirrored_zaken = {}
+    if settings.ZAKEN_MIRROR_ENABLED:
+        mirrored_zaken = get_mirrored_zaken(zaken_urls)
+
+    missing_urls = [url for url in zaken_urls if url not in mirrored_zaken]
     with parallel() as executor:
-        _zaken = executor.map(fetch_zaak, zaken_urls)
-    zaken = list(_zaken)
+        fetched_zaken = dict(zip(missing_urls, executor.map(fetch_zaak, missing_urls)))
+    zaken = [mirrored_zaken.get(url) or fetched_zaken[url] for url in zaken_urls]
 
     fetched_zaaktypen = get_zaaktypen(dict_response=True)
     for zaak in zaken:
@@ -106,50 +507,105 @@ def update_zaak(url: str, data: dict, audit_comment: Optional[str]) -> dict:
     response = client.partial_update(
         "zaak", url=url, data=data, request_kwargs={"headers": headers}
     )
+    if settings.ZAKEN_MIRROR_ENABLED:
+        save_mirrored_zaken([response])
     return response
 
 
-def remove_zaak(url: str) -> int:
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+@contextmanager
+def _host_slot(url: str) -> Iterator[None]:
+    """
+    Limit the number of concurrent requests to the host of the URL in this process.
+    """
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(
+                settings.MAX_REQUESTS_PER_HOST
+            )
+        semaphore = _host_semaphores[host]
+
+    with semaphore:
+        yield
+
+
+def _remove_besluit(besluit_url: str) -> None:
+    brc_client = _client_from_url(besluit_url)
+    with _host_slot(besluit_url):
+        brc_client.delete("besluit", url=besluit_url)
+
+
+def _remove_document(io_url: str) -> int:
+    """
+    Destroy the document if it has no other relations and return its size.
+    """
+    drc_client = _client_from_url(io_url)
+
+    with _host_slot(io_url):
+        # check if documents have pending relations
+        oios = drc_client.list(
+            "objectinformatieobject", query_params={"informatieobject": io_url}
+        )
+        if oios:
+            return 0
+
+        document = drc_client.retrieve("enkelvoudiginformatieobject", url=io_url)
+        drc_client.delete("enkelvoudiginformatieobject", url=io_url)
+
+    return document.get("bestandsomvang") or 0
+
+
+def remove_zaak(url: str, timings: Optional[Dict[str, float]] = None) -> int:
     """
     Destroy the Zaak and related objects identified by the zaak URL.
+
+    The related besluiten and documenten are destroyed concurrently, with at most
+    ``MAX_REQUESTS_PER_HOST`` concurrent requests per host. If a ``timings`` dict
+    is passed, it is filled with the duration (in seconds) of each phase.
     """
+    timings = timings if timings is not None else {}
     zrc_client = _client_from_url(url)
 
     # find and destroy related besluiten
+    start = time.monotonic()
     zaak_uuid = _uuid_from_url(url)
     zaakbesluiten = zrc_client.list("zaakbesluit", zaak_uuid=zaak_uuid)
+    besluit_urls = [zaakbesluit["besluit"] for zaakbesluit in zaakbesluiten]
 
-    for zaakbesluit in zaakbesluiten:
-        besluit_url = zaakbesluit["besluit"]
-        brc_client = _client_from_url(besluit_url)
-        brc_client.delete("besluit", url=besluit_url)
+    with parallel(max_workers=settings.MAX_REQUESTS_PER_HOST) as executor:
+        list(executor.map(_remove_besluit, besluit_urls))
+    timings["besluiten"] = time.monotonic() - start
 
     # destroy zaak
+    start = time.monotonic()
     zios = zrc_client.list("zaakinformatieobject", query_params={"zaak": url})
     zrc_client.delete("zaak", url=url)
+    if settings.ZAKEN_MIRROR_ENABLED:
+        delete_mirrored_zaak(url)
+    timings["zaak"] = time.monotonic() - start
 
     # find and destroy related documenten
-    bytes_deleted_documents = 0
-    for zio in zios:
-        io_url = zio["informatieobject"]
-
-        drc_client = _client_from_url(io_url)
-        # check if documents have pending relations
-        oios = drc_client.list(
-            "objectinformatieobject", query_params={"informatieobject": io_url}
-        )
-        if not oios:
-            document = drc_client.retrieve("enkelvoudiginformatieobject", url=io_url)
-            document_size = document.get("bestandsomvang")
-            drc_client.delete("enkelvoudiginformatieobject", url=io_url)
-            if document_size:
-                bytes_deleted_documents += document_size
+    start = time.monotonic()
+    io_urls = [zio["informatieobject"] for zio in zios]
+    with parallel(max_workers=settings.MAX_REQUESTS_PER_HOST) as executor:
+        bytes_deleted_documents = sum(executor.map(_remove_document, io_urls))
+    timings["documenten"] = time.monotonic() - start
 
     return bytes_deleted_documents
 
 
-def get_resultaat(zaak_url: str) -> Optional[dict]:
-    zaak = fetch_zaak(zaak_url)
+def get_resultaat(zaak_url: str, zaak: Optional[dict] = None) -> Optional[dict]:
+    """
+    Return the resultaat of the zaak, with the zaak and the resultaattype.
+
+    The zaak is only retrieved if it isn't passed.
+    """
+    if zaak is None:
+        zaak = fetch_zaak(zaak_url)
     resultaat_url = zaak["resultaat"]
 
     if not resultaat_url:
@@ -165,32 +621,54 @@ def fetch_resultaat(resultaat_url: str) -> dict:
     zrc_client = _client_from_url(resultaat_url)
     resultaat = zrc_client.retrieve("resultaat", url=resultaat_url)
 
-    resultaattype_url = resultaat["resultaattype"]
-    ztc_client = _client_from_url(resultaattype_url)
-    resultaattype = ztc_client.retrieve("resultaattype", url=resultaattype_url)
-
-    resultaat["resultaattype"] = resultaattype
+    resultaat["resultaattype"] = _memoized(
+        resultaat["resultaattype"], _fetch_resultaattype
+    )
 
     return resultaat
 
 
+def _fetch_resultaattype(url: str) -> dict:
+    client = _client_from_url(url)
+    return client.retrieve("resultaattype", url=url)
+
+
 # DRC
-def get_documenten(zaak_url: str) -> list:
+def get_zaakinformatieobjecten(zaak_url: str) -> list:
     zrc_client = _client_from_url(zaak_url)
-    zios = zrc_client.list("zaakinformatieobject", query_params={"zaak": zaak_url})
+    return zrc_client.list("zaakinformatieobject", query_params={"zaak": zaak_url})
 
-    documenten = []
-    #  TODO async
-    for zio in zios:
-        io_url = zio["informatieobject"]
-        drc_client = _client_from_url(io_url)
-        document = drc_client.retrieve("enkelvoudiginformatieobject", url=io_url)
-        documenten.append(document)
 
-    fetched_iotypen = get_informatieobjecttypen(dict_response=True)
+def _fetch_document(io_url: str) -> dict:
+    drc_client = _client_from_url(io_url)
+    with _host_slot(io_url):
+        return drc_client.retrieve("enkelvoudiginformatieobject", url=io_url)
+
+
+def get_documenten(
+    zaak_url: str,
+    zios: Optional[list] = None,
+    informatieobjecttypen: Optional[Dict[str, dict]] = None,
+) -> list:
+    """
+    Return the documenten of the zaak, or of the zaakinformatieobjecten if passed.
+
+    The documenten are retrieved concurrently, with at most ``MAX_REQUESTS_PER_HOST``
+    concurrent requests per host. The informatieobjecttypen are only retrieved if
+    they aren't passed (by URL).
+    """
+    if zios is None:
+        zios = get_zaakinformatieobjecten(zaak_url)
+
+    io_urls = [zio["informatieobject"] for zio in zios]
+    with parallel(max_workers=settings.MAX_REQUESTS_PER_HOST) as executor:
+        documenten = list(executor.map(_fetch_document, io_urls))
+
+    if informatieobjecttypen is None:
+        informatieobjecttypen = get_informatieobjecttypen(dict_response=True)
 
     for document in documenten:
-        document["informatieobjecttype"] = fetched_iotypen[
+        document["informatieobjecttype"] = informatieobjecttypen[
             document["informatieobjecttype"]
         ]
 
@@ -198,29 +676,71 @@ def get_documenten(zaak_url: str) -> list:
 
 
 # BRC
-def get_besluiten(zaak_url: str) -> list:
+def _fetch_besluit(besluit_url: str) -> dict:
+    brc_client = _client_from_url(besluit_url)
+    with _host_slot(besluit_url):
+        return brc_client.retrieve("besluit", url=besluit_url)
+
+
+def get_besluiten(
+    zaak_url: str, besluittypen: Optional[Dict[str, dict]] = None
+) -> list:
+    """
+    Return the besluiten of the zaak.
+
+    The besluiten are retrieved concurrently, with at most ``MAX_REQUESTS_PER_HOST``
+    concurrent requests per host. The besluittypen are only retrieved if they aren't
+    passed (by URL).
+    """
     zrc_client = _client_from_url(zaak_url)
     zaak_uuid = _uuid_from_url(zaak_url)
     zaakbesluiten = zrc_client.list("zaakbesluit", zaak_uuid=zaak_uuid)
 
-    # TODO async
-    besluiten = []
-    for zaakbesluit in zaakbesluiten:
-        besluit_url = zaakbesluit["besluit"]
-        brc_client = _client_from_url(besluit_url)
-        besluit = brc_client.retrieve("besluit", url=besluit_url)
-        besluiten.append(besluit)
+    besluit_urls = [zaakbesluit["besluit"] for zaakbesluit in zaakbesluiten]
+    with parallel(max_workers=settings.MAX_REQUESTS_PER_HOST) as executor:
+        besluiten = list(executor.map(_fetch_besluit, besluit_urls))
 
-    fetched_besluittypen = get_besluittypen(dict_response=True)
+    if besluittypen is None:
+        besluittypen = get_besluittypen(dict_response=True)
 
     for besluit in besluiten:
-        besluit["besluittype"] = fetched_besluittypen[besluit["besluittype"]]
+        besluit["besluittype"] = besluittypen[besluit["besluittype"]]
 
     return besluiten
 
 
+def get_zaak_detail(
+    zaak_url: str,
+    zaak: Optional[dict] = None,
+    informatieobjecttypen: Optional[Dict[str, dict]] = None,
+    besluittypen: Optional[Dict[str, dict]] = None,
+) -> dict:
+    """
+    Return the resultaat, the documenten and the besluiten of the zaak.
+
+    They are retrieved concurrently. The zaak and the types are only retrieved if
+    they aren't passed.
+    """
+    with parallel() as executor:
+        resultaat = executor.submit(get_resultaat, zaak_url, zaak)
+        documenten = executor.submit(
+            get_documenten, zaak_url, None, informatieobjecttypen
+        )
+        besluiten = executor.submit(get_besluiten, zaak_url, besluittypen)
+
+    return {
+        "resultaat": resultaat.result(),
+        "documenten": documenten.result(),
+        "besluiten": besluiten.result(),
+    }
+
+
 # SELECTIELIJST
 def fetch_process_type(url: str) -> dict:
+    return _memoized(url, _fetch_process_type)
+
+
+def _fetch_process_type(url: str) -> dict:
     client = _client_from_url(url)
     response = client.retrieve("procestype", url=url)
     return response
@@ -0,0 +1,24 @@
+from django.db.models.base import ModelBase
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+from .client import registry
+from .service import clear_types_cache
+
+
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_types_cache(sender: ModelBase, instance: Service, **kwargs) -> None:
+    """Make sure that the types of a changed Catalogi API are fetched again"""
+
+    if instance.api_type == APITypes.ztc:
+        clear_types_cache()
+
+
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_client_registry(sender: ModelBase, instance: Service, **kwargs) -> None:
+    """Make sure that the clients are rebuilt with the changed configuration"""
+
+    registry.clear()
@@ -1,15 +1,21 @@
 import logging
+import os
+import tempfile
+import time
 import traceback
 from base64 import b64encode
 from datetime import timedelta
+from typing import List
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.files import File
 from django.db.models import F
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from celery import chain
+from celery import chain, group
 from furl import furl
 from timeline_logger.models import TimelineLog
 from zds_client.client import ClientError
@@ -24,23 +30,37 @@ from archiefbeheercomponent.report.models import DestructionReport
 from archiefbeheercomponent.report.utils import (
     create_destruction_report,
     get_absolute_url,
+    get_zaaktype_report_data,
+    render_destruction_report_pdf,
 )
 
 from ..celery import app
 from ..constants import RoleTypeChoices
-from .constants import ListItemStatus, ListStatus, ReviewStatus
+from .constants import ExportStatus, ListItemStatus, ListStatus, ReviewStatus
+from .mirror import delete_mirrored_zaak, save_mirrored_zaken
 from .models import (
     ArchiveConfig,
     DestructionList,
     DestructionListAssignee,
     DestructionListItem,
     DestructionListReview,
+    ZakenExport,
+)
+from .service import (
+    fetch_resultaat,
+    fetch_zaak,
+    fetch_zaken,
+    memoized_lookups,
+    parallel,
+    remove_zaak,
+    update_zaak,
 )
-from .service import fetch_resultaat, fetch_zaak, remove_zaak, update_zaak
 from .utils import (
     ServiceNotConfiguredError,
     add_additional_review_documents,
+    get_additional_zaak_info,
     notify_users_about_zaak,
+    write_zaken_export,
 )
 
 logger = logging.getLogger(__name__)
@@ -67,9 +87,19 @@ def process_destruction_list(list_id):
         .order_by("id")
         .all()
     ]
-    chunk_tasks = process_list_item.chunks(list_item_ids, settings.ZAKEN_PER_TASK)
+    if settings.DESTRUCTION_BATCH_SIZE:
+        item_ids = [item_id for (item_id,) in list_item_ids]
+        batch_size = settings.DESTRUCTION_BATCH_SIZE
+        item_tasks = group(
+            process_list_items.si(item_ids[pos : pos + batch_size])
+            for pos in range(0, len(item_ids), batch_size)
+        )
+    else:
+        chunk_tasks = process_list_item.chunks(list_item_ids, settings.ZAKEN_PER_TASK)
+        item_tasks = chunk_tasks.group()
     notify_task = complete_and_notify.si(list_id)
-    task_chain = chain(chunk_tasks.group(), notify_task)
+    render_task = render_destruction_report.si(list_id)
+    task_chain = chain(item_tasks, notify_task, render_task)
 
     config = ArchiveConfig.get_solo()
     if config.create_zaak:
@@ -94,119 +124,211 @@ def check_if_reviewers_need_reminder():
         assigned_on__lt=timezone.now() - timedelta(days=number_days),
         assignee__role__can_review_destruction=True,
         reminder_sent=False,
-    ).select_related("assignee")
+    ).select_related("assignee", "destruction_list")
+
+    batches = email.send_bulk(
+        (assignee.assignee, assignee.destruction_list, None) for assignee in assignees
+    )
 
     for assignee in assignees:
-        email.send(
-            recipient=assignee.assignee, destruction_list=assignee.destruction_list
-        )
         assignee.reminder_sent = True
 
     DestructionListAssignee.objects.bulk_update(assignees, ["reminder_sent"])
 
+    return batches
 
-@app.task
-def process_list_item(list_item_id):
-    list_item = DestructionListItem.objects.get(id=list_item_id)
-    list_item.process()
-    list_item.save()
 
-    try:
-        zaak = fetch_zaak(list_item.zaak)
-    except ClientError as exc:
-        logger.warning(
-            "Destruction list item %r has failed during execution with error: %r",
-            list_item.id,
-            exc,
-            exc_info=True,
-        )
+def _destroy_zaak(list_item_id: int, zaak_url: str, cached_only: bool = False) -> dict:
+    """
+    Retrieve and destroy the zaak of a destruction list item.
 
-        list_item.fail()
-        list_item.save()
-        TimelineLog.objects.create(
-            content_object=list_item,
-            template="destruction/logs/item_destruction_failed.html",
-            extra_data={
-                "zaak": None,
-                "error": traceback.format_exc(),
-            },
-        )
-        return
+    The list item itself is not touched, so that this can run in a thread of a pool.
+    With ``cached_only``, the report data is only resolved with the lookups which are
+    shared between tasks (see :func:`get_zaaktype_report_data`).
+    """
+    outcome = {
+        "zaak": None,
+        "resultaat": None,
+        "bytes_removed_documents": 0,
+        "report_data": {},
+        "timings": {},
+        "error": None,
+    }
 
+    # Any error is recorded as the failure of the list item, so that the outcomes of
+    # the other list items of a batch are still persisted
     try:
-        resultaat = fetch_resultaat(zaak["resultaat"])
-    except ClientError:
-        resultaat = None
+        zaak = fetch_zaak(zaak_url)
+        outcome["zaak"] = zaak
+
+        try:
+            outcome["resultaat"] = fetch_resultaat(zaak["resultaat"])
+        except ClientError:
+            pass
+
+        # Resolve the columns of the destruction report while the zaak is at hand.
+        # They are resolved again when the report is created if this fails, so it
+        # does not hold back the destruction of the zaak.
+        try:
+            outcome["report_data"] = get_zaaktype_report_data(
+                zaak["zaaktype"], cached_only=cached_only
+            )
+        except Exception:
+            logger.warning(
+                "The report data of destruction list item %r could not be resolved",
+                list_item_id,
+                exc_info=True,
+            )
 
-    try:
         if settings.ABC_DEMO_MODE:
-            bytes_removed_documents = 0
             logger.warning(
                 "[DEMO MODE] Zaak %r and related resources will not be deleted.",
                 zaak.get("identificatie"),
             )
         else:
-            bytes_removed_documents = remove_zaak(list_item.zaak)
-    except ClientError as exc:
+            outcome["bytes_removed_documents"] = remove_zaak(
+                zaak_url, timings=outcome["timings"]
+            )
+    except Exception as exc:
         logger.warning(
             "Destruction list item %r has failed during execution with error: %r",
-            list_item.id,
+            list_item_id,
             exc,
             exc_info=True,
         )
+        outcome["error"] = traceback.format_exc()
+
+    return outcome
+
+
+def _apply_outcome(list_item: DestructionListItem, outcome: dict) -> TimelineLog:
+    """
+    Update the list item with the outcome of its destruction.
 
+    Both the list item and the returned log are not saved yet.
+    """
+    zaak = outcome["zaak"]
+
+    if outcome["error"]:
         list_item.fail()
-        TimelineLog.objects.create(
+        return TimelineLog(
             content_object=list_item,
             template="destruction/logs/item_destruction_failed.html",
             extra_data={
-                "zaak": zaak["identificatie"],
-                "error": traceback.format_exc(),
+                "zaak": zaak["identificatie"] if zaak else None,
+                "error": outcome["error"],
             },
         )
-    else:
-        list_item.complete()
-        TimelineLog.objects.create(
-            content_object=list_item,
-            template="destruction/logs/item_destruction_succeeded.html",
-            extra_data={"zaak": zaak["identificatie"]},
-        )
 
-        list_item.extra_zaak_data = {
-            "identificatie": zaak["identificatie"],
-            "omschrijving": zaak.get("omschrijving") or "",
-            "toelichting": zaak.get("toelichting") or "",
-            "startdatum": zaak["startdatum"],
-            "einddatum": zaak.get("einddatum") or "",
-            "zaaktype": zaak["zaaktype"],
-            "verantwoordelijke_organisatie": zaak["verantwoordelijkeOrganisatie"],
-            "resultaat": resultaat,
-            "relevante_andere_zaken": zaak.get("relevanteAndereZaken", []),
-            "bytes_removed_documents": bytes_removed_documents,
-        }
-        list_item.save()
+    list_item.complete()
+    list_item.extra_zaak_data = {
+        "identificatie": zaak["identificatie"],
+        "omschrijving": zaak.get("omschrijving") or "",
+        "toelichting": zaak.get("toelichting") or "",
+        "startdatum": zaak["startdatum"],
+        "einddatum": zaak.get("einddatum") or "",
+        "zaaktype": zaak["zaaktype"],
+        "verantwoordelijke_organisatie": zaak["verantwoordelijkeOrganisatie"],
+        "resultaat": outcome["resultaat"],
+        "relevante_andere_zaken": zaak.get("relevanteAndereZaken", []),
+        "bytes_removed_documents": outcome["bytes_removed_documents"],
+        **outcome["report_data"],
+    }
+    return TimelineLog(
+        content_object=list_item,
+        template="destruction/logs/item_destruction_succeeded.html",
+        extra_data={"zaak": zaak["identificatie"]},
+    )
+
+
+@app.task
+def process_list_item(list_item_id):
+    list_item = DestructionListItem.objects.get(id=list_item_id)
+    list_item.process()
+    list_item.save()
+
+    # A single item is destroyed per task, so the report data is only resolved with
+    # the lookups which are shared between tasks
+    with memoized_lookups():
+        outcome = _destroy_zaak(list_item.id, list_item.zaak, cached_only=True)
 
+    log = _apply_outcome(list_item, outcome)
     list_item.save()
+    log.save()
+
     return list_item.status
 
 
 @app.task
-def complete_and_notify(list_id):
-    destruction_list = DestructionList.objects.get(id=list_id)
+def process_list_items(list_item_ids: List[int]) -> dict:
+    """
+    Destroy the zaken of a batch of destruction list items concurrently.
+
+    The state of the list items and the logs are persisted once per batch. The
+    returned statistics are stored as the result of the task.
+    """
+    start = time.monotonic()
+
+    list_items = list(
+        DestructionListItem.objects.filter(
+            id__in=list_item_ids, status=ListItemStatus.suggested
+        ).order_by("id")
+    )
+    for list_item in list_items:
+        list_item.process()
+    DestructionListItem.objects.bulk_update(list_items, ["status"])
+
+    with memoized_lookups(), parallel(
+        max_workers=settings.DESTRUCTION_MAX_WORKERS
+    ) as executor:
+        outcomes = list(
+            executor.map(
+                _destroy_zaak,
+                [list_item.id for list_item in list_items],
+                [list_item.zaak for list_item in list_items],
+            )
+        )
 
-    destruction_list.complete()
-    destruction_list.save()
+    logs = [
+        _apply_outcome(list_item, outcome)
+        for list_item, outcome in zip(list_items, outcomes)
+    ]
+    DestructionListItem.objects.bulk_update(list_items, ["status", "extra_zaak_data"])
+    TimelineLog.objects.bulk_create(logs)
 
-    logger.info("Destruction list %r is processed", destruction_list.id)
+    duration = time.monotonic() - start
+    phase_durations = {}
+    for outcome in outcomes:
+        for phase, phase_duration in outcome["timings"].items():
+            phase_durations[phase] = phase_durations.get(phase, 0) + phase_duration
 
-    notification = Notification.objects.create(
-        destruction_list=destruction_list,
-        user=destruction_list.author,
-        message=_("Processing of the destruction list is complete."),
+    destroyed = len(
+        [item for item in list_items if item.status == ListItemStatus.destroyed]
     )
+    stats = {
+        "processed": len(list_items),
+        "destroyed": destroyed,
+        "failed": len(list_items) - destroyed,
+        "duration": round(duration, 3),
+        "zaken_per_second": round(len(list_items) / duration, 2) if duration else None,
+        "phase_durations": {
+            phase: round(phase_duration, 3)
+            for phase, phase_duration in phase_durations.items()
+        },
+    }
+    logger.info("Processed a batch of destruction list items: %r", stats)
+    return stats
+
+
+def _notify_report_available(report: DestructionReport) -> None:
+    """
+    Notify the process owner and the archivist that the report of the list is
+    available.
 
-    # Create the destruction report
-    report = create_destruction_report(destruction_list)
+    This is done once the rendering of the PDF content is finished. If the rendering
+    fails, the notifications are still sent, since the CSV content is available.
+    """
+    destruction_list = report.destruction_list
 
     if report.process_owner:
         base_report_url = get_absolute_url(
@@ -255,9 +377,54 @@ def complete_and_notify(list_id):
                     report=report,
                 )
 
+
+@app.task
+def complete_and_notify(list_id):
+    destruction_list = DestructionList.objects.get(id=list_id)
+
+    destruction_list.complete()
+    destruction_list.save()
+
+    logger.info("Destruction list %r is processed", destruction_list.id)
+
+    notification = Notification.objects.create(
+        destruction_list=destruction_list,
+        user=destruction_list.author,
+        message=_("Processing of the destruction list is complete."),
+    )
+
+    # Create the destruction report, the PDF is rendered by the next task of the chain
+    with memoized_lookups() as lookups:
+        create_destruction_report(destruction_list)
+    logger.info(
+        "Destruction report of list %r created with %r remote lookups (%r saved)",
+        destruction_list.id,
+        lookups.stats["remote_calls"],
+        lookups.stats["saved_calls"],
+    )
+
     return notification.id
 
 
+@app.task
+def render_destruction_report(list_id):
+    report = DestructionReport.objects.select_related("destruction_list").get(
+        destruction_list__id=list_id
+    )
+
+    try:
+        with memoized_lookups():
+            render_destruction_report_pdf(report)
+    finally:
+        _notify_report_available(report)
+    logger.info(
+        "PDF of destruction report %r rendered in %s with a peak memory of %r kB",
+        report.id,
+        report.render_duration,
+        report.render_peak_memory,
+    )
+
+
 @app.task
 def update_zaken(update_data: list):
     if not update_data:
@@ -405,3 +572,50 @@ def create_destruction_zaak(list_id):
 
     destruction_list.zaak_url = destruction_zaak["url"]
     destruction_list.save()
+
+
+@app.task
+def export_zaken(export_id):
+    export = ZakenExport.objects.select_related("user").get(id=export_id)
+    export.status = ExportStatus.processing
+    export.save(update_fields=["status"])
+
+    try:
+        zaken = fetch_zaken(export.zaken_urls)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "export.xlsx")
+            with memoized_lookups(), parallel() as executor:
+                write_zaken_export(
+                    path, executor.map(get_additional_zaak_info, zaken), export.user
+                )
+
+            with open(path, "rb") as content:
+                export.content.save(
+                    f"zaken-lijst-{uuid4()}.xlsx", File(content), save=False
+                )
+    except Exception:
+        export.status = ExportStatus.failed
+        export.finished = timezone.now()
+        export.save(update_fields=["status", "finished"])
+        raise
+
+    export.status = ExportStatus.completed
+    export.finished = timezone.now()
+    export.save(update_fields=["content", "status", "finished"])
+    logger.info("Export %r of %r zaken is created", export.id, len(zaken))
+
+
+@app.task
+def sync_mirrored_zaak(zaak_url):
+    try:
+        zaak = fetch_zaak(zaak_url)
+    except ClientError as exc:
+        response = exc.args[0] if exc.args else None
+        if not isinstance(response, dict) or response.get("status") != 404:
+            raise
+        delete_mirrored_zaak(zaak_url)
+        logger.info("Mirrored zaak %s no longer exists", zaak_url)
+        return
+
+    save_mirrored_zaken([zaak])
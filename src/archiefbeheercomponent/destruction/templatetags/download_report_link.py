@@ -14,21 +14,28 @@ register = template.Library()
 def download_report_link(context: dict, destruction_list: DestructionList) -> dict:
     request = context["view"].request
 
-    report = destruction_list.destructionreport_set.first()
+    # Use the values annotated by DestructionListQuerySet.annotate_overview if present
+    if hasattr(destruction_list, "report_pk"):
+        report_pk = destruction_list.report_pk
+        process_owner_id = destruction_list.report_process_owner_id
+    else:
+        report = destruction_list.destructionreport_set.first()
+        report_pk = report.pk if report else None
+        process_owner_id = report.process_owner_id if report else None
 
     tag_context = {"can_download": False}
 
-    if not report:
+    if not report_pk:
         return tag_context
 
     if (
-        report.process_owner != request.user
+        process_owner_id != request.user.pk
         and request.user.role.type != RoleTypeChoices.functional_admin
     ):
         return tag_context
 
     url = get_absolute_url(
-        reverse("report:download-report", args=[report.pk]),
+        reverse("report:download-report", args=[report_pk]),
         request=context["view"].request,
     )
     tag_context.update(
@@ -39,8 +46,14 @@ def download_report_link(context: dict, destruction_list: DestructionList) -> di
         }
     )
 
-    reviews = destruction_list.reviews.filter(~Q(additional_document__exact=""))
-    if reviews.count():
+    if hasattr(destruction_list, "has_additional_documents"):
+        has_additional_documents = destruction_list.has_additional_documents
+    else:
+        has_additional_documents = destruction_list.reviews.filter(
+            ~Q(additional_document__exact="")
+        ).exists()
+
+    if has_additional_documents:
         reviewers_documents_url = get_absolute_url(
             reverse(
                 "destruction:download-reviewer-documents", args=[destruction_list.pk]
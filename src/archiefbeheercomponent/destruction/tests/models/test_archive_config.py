@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from archiefbeheercomponent.destruction.models import ArchiveConfig
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
+
+
+@override_settings(SOLO_LOCAL_CACHE_TIMEOUT=60)
+class CachedArchiveConfigTests(ClearCachesMixin, TestCase):
+    def test_config_is_kept_in_memory(self):
+        ArchiveConfig.get_solo()
+
+        with self.assertNumQueries(0), patch.object(cache, "get") as mock_cache_get:
+            for _ in range(10):
+                config = ArchiveConfig.get_solo()
+
+        mock_cache_get.assert_not_called()
+        self.assertEqual(7, config.days_until_reminder)
+
+    def test_config_changes_are_not_shared(self):
+        config = ArchiveConfig.get_solo()
+        config.days_until_reminder = 2
+
+        self.assertEqual(7, ArchiveConfig.get_solo().days_until_reminder)
+
+    def test_mutable_fields_are_not_shared(self):
+        config = ArchiveConfig.get_solo()
+        config.short_review_zaaktypes.append("https://oz.nl/zaaktypen/uuid-1")
+
+        self.assertEqual([], ArchiveConfig.get_solo().short_review_zaaktypes)
+
+    def test_saved_config_is_retrieved_again(self):
+        config = ArchiveConfig.get_solo()
+        config.days_until_reminder = 2
+        config.save()
+
+        self.assertEqual(2, ArchiveConfig.get_solo().days_until_reminder)
+
+    def test_config_saved_in_other_process(self):
+        ArchiveConfig.get_solo()
+        ArchiveConfig.objects.update(days_until_reminder=3)
+        ArchiveConfig.clear_cache()
+        # Another process saved the config
+        cache.set(ArchiveConfig.get_version_cache_key(), 1)
+
+        self.assertEqual(7, ArchiveConfig.get_solo().days_until_reminder)
+
+        with patch("archiefbeheercomponent.utils.models.time") as mock_time:
+            mock_time.monotonic.return_value = float("inf")
+
+            self.assertEqual(3, ArchiveConfig.get_solo().days_until_reminder)
@@ -11,10 +11,11 @@ from archiefbeheercomponent.destruction.tests.factories import (
     DestructionListAssigneeFactory,
     DestructionListFactory,
 )
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
 @freeze_time("2021-11-16 12:00")
-class IsReviewOverdueTests(TestCase):
+class IsReviewOverdueTests(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
@@ -1,5 +1,7 @@
 from django.test import TestCase
 
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
+
 from ...constants import ReviewStatus
 from ..factories import (
     DestructionListAssigneeFactory,
@@ -8,7 +10,7 @@ from ..factories import (
 )
 
 
-class NextAssigneeTests(TestCase):
+class NextAssigneeTests(ClearCachesMixin, TestCase):
     def create_list_with_assignees(self):
         destruction_list = DestructionListFactory.create()
         assignees = DestructionListAssigneeFactory.create_batch(
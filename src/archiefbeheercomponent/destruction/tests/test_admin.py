@@ -3,11 +3,12 @@ from django.urls import reverse
 from django_webtest import WebTest
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ..models import ArchiveConfig
 
 
-class ArchiefConfiguratieTest(WebTest):
+class ArchiefConfiguratieTest(ClearCachesMixin, WebTest):
     def test_create_zaak_set_but_misconfigured(self):
         user = UserFactory.create(is_staff=True, is_superuser=True)
         response = self.app.get(
@@ -1,4 +1,8 @@
+import re
+
+from django.db import connection
 from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 import requests_mock
@@ -12,8 +16,14 @@ from archiefbeheercomponent.destruction.tests.factories import (
     DestructionListAssigneeFactory,
     DestructionListFactory,
     DestructionListItemFactory,
+    DestructionListItemReviewFactory,
+    DestructionListReviewFactory,
+)
+from archiefbeheercomponent.tests.utils import (
+    ClearCachesMixin,
+    mock_service_oas_get,
+    paginated_response,
 )
-from archiefbeheercomponent.tests.utils import mock_service_oas_get, paginated_response
 
 ZAKEN_ROOT = "https://oz.nl/zaken/api/v1/"
 CATALOGI_ROOT = "https://oz.nl/catalogi/api/v1/"
@@ -70,7 +80,7 @@ SELECTIELIJST = {
 
 @requests_mock.Mocker()
 @override_settings(LANGUAGE_CODE="en")
-class FetchListItemsTests(TransactionTestCase):
+class FetchListItemsTests(ClearCachesMixin, TransactionTestCase):
     def _set_up_services(self):
         Service.objects.create(
             label="Catalogi API",
@@ -440,6 +450,94 @@ class FetchListItemsTests(TransactionTestCase):
             "http://example.nl/987654321/ZAAK-002/uuid-2", zaak_2_data["zac_link"]
         )
 
+    def test_returns_item_reviews_of_last_review(self, m):
+        self._set_up_services()
+        self._set_up_mocks(m)
+
+        user = UserFactory.create(
+            role__can_start_destruction=True,
+            role__can_review_destruction=True,
+        )
+        destruction_list = DestructionListFactory.create(author=user, assignee=user)
+        item_1 = DestructionListItemFactory.create(
+            destruction_list=destruction_list, zaak=ZAAK_1["url"]
+        )
+        DestructionListItemFactory.create(
+            destruction_list=destruction_list, zaak=ZAAK_2["url"]
+        )
+        old_review = DestructionListReviewFactory.create(
+            destruction_list=destruction_list
+        )
+        DestructionListItemReviewFactory.create(
+            destruction_list_review=old_review,
+            destruction_list_item=item_1,
+            text="Old",
+        )
+        review = DestructionListReviewFactory.create(destruction_list=destruction_list)
+        DestructionListItemReviewFactory.create(
+            destruction_list_review=review,
+            destruction_list_item=item_1,
+            text="Keep it",
+            suggestion="remove",
+        )
+
+        url = reverse("destruction:fetch-list-items", args=[destruction_list.id])
+
+        self.client.force_login(user)
+        response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+
+        items = response.json()["items"]
+
+        self.assertEqual("Keep it", items[0]["listItem"]["review_text"])
+        self.assertEqual("remove", items[0]["listItem"]["review_suggestion"])
+        self.assertNotIn("review_text", items[1]["listItem"])
+
+    def test_number_of_queries_does_not_depend_on_number_of_items(self, m):
+        self._set_up_services()
+        self._set_up_mocks(m)
+        m.get(
+            re.compile(f"{ZAKEN_ROOT}zaken/item-"),
+            json=lambda request, context: {**ZAAK_2, "url": request.url},
+        )
+
+        user = UserFactory.create(
+            role__can_start_destruction=True,
+            role__can_review_destruction=True,
+        )
+        self.client.force_login(user)
+
+        def fetch_items(number_of_items: int) -> CaptureQueriesContext:
+            destruction_list = DestructionListFactory.create(author=user, assignee=user)
+            review = DestructionListReviewFactory.create(
+                destruction_list=destruction_list
+            )
+            for i in range(number_of_items):
+                item = DestructionListItemFactory.create(
+                    destruction_list=destruction_list,
+                    zaak=f"{ZAKEN_ROOT}zaken/item-{i}",
+                )
+                DestructionListItemReviewFactory.create(
+                    destruction_list_review=review, destruction_list_item=item
+                )
+
+            url = reverse("destruction:fetch-list-items", args=[destruction_list.id])
+
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(number_of_items, len(response.json()["items"]))
+            return context
+
+        # The configuration singletons are created by the first request
+        fetch_items(1)
+        small_list = fetch_items(2)
+        large_list = fetch_items(20)
+
+        self.assertEqual(len(small_list), len(large_list))
+
     def test_retrieve_missing_zaak(self, m):
         self._set_up_services()
         self._set_up_mocks(m)
@@ -3,6 +3,7 @@ from django.test import TestCase
 from django.urls import reverse, reverse_lazy
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from .factories import DestructionListAssigneeFactory, DestructionListFactory
 
@@ -32,7 +33,7 @@ class AuthCheckMixin:
         self.client.logout()
 
 
-class LandingTests(AuthCheckMixin, TestCase):
+class LandingTests(ClearCachesMixin, AuthCheckMixin, TestCase):
     def test_record_manager_landing_page(self):
         url = reverse("destruction:record-manager-list")
         record_manager = UserFactory.create(role__can_start_destruction=True)
@@ -52,7 +53,7 @@ class LandingTests(AuthCheckMixin, TestCase):
         self.assertHasNoPermission(url, other_user)
 
 
-class FetchListItemsTests(AuthCheckMixin, TestCase):
+class FetchListItemsTests(ClearCachesMixin, AuthCheckMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
@@ -86,7 +87,7 @@ class FetchListItemsTests(AuthCheckMixin, TestCase):
         self.assertHasNoPermission(self.url, user)
 
 
-class DestructionListDetailTests(AuthCheckMixin, TestCase):
+class DestructionListDetailTests(ClearCachesMixin, AuthCheckMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
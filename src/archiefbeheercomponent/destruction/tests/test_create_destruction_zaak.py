@@ -11,7 +11,7 @@ from zgw_consumers.models import Service
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.notifications.models import Notification
 from archiefbeheercomponent.report.tests.factories import DestructionReportFactory
-from archiefbeheercomponent.tests.utils import mock_service_oas_get
+from archiefbeheercomponent.tests.utils import ClearCachesMixin, mock_service_oas_get
 
 from ..models import DestructionList
 from ..tasks import create_destruction_zaak
@@ -24,7 +24,7 @@ from .factories import (
 
 @temp_private_root()
 @requests_mock.Mocker()
-class CreateZaakTaskTests(TestCase):
+class CreateZaakTaskTests(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         Service.objects.create(
@@ -6,12 +6,13 @@ from timeline_logger.models import TimelineLog
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.notifications.models import Notification
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ..constants import ListItemStatus, ListStatus
 from ..models import ArchiveConfig, DestructionList
 
 
-class CreateDestructionListTests(TestCase):
+class CreateDestructionListTests(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         cls.user = UserFactory.create(role__can_start_destruction=True)
@@ -10,6 +10,7 @@ from timeline_logger.models import TimelineLog
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.notifications.models import Notification
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ...constants import RoleTypeChoices
 from ..constants import ListItemStatus, ListStatus, ReviewStatus, Suggestion
@@ -30,7 +31,7 @@ MANAGEMENT_FORM_DATA = {
 
 
 @patch("archiefbeheercomponent.destruction.views.record_manager.update_zaken.delay")
-class DestructionListUpdateTests(TestCase):
+class DestructionListUpdateTests(ClearCachesMixin, TestCase):
     def setUp(self) -> None:
         super().setUp()
 
@@ -470,7 +471,7 @@ class DestructionListUpdateTests(TestCase):
         self.assertNotIn(b"<textarea", response.content)
 
 
-class DestructionListDetailTests(WebTest):
+class DestructionListDetailTests(ClearCachesMixin, WebTest):
     """
     check that the user can update DL if they are the author and the current assignee of DL
     """
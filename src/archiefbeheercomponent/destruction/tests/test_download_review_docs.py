@@ -11,6 +11,7 @@ from privates.test import temp_private_root
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.constants import RoleTypeChoices
 from archiefbeheercomponent.report.tests.factories import DestructionReportFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from .factories import (
     DestructionListAssigneeFactory,
@@ -20,7 +21,7 @@ from .factories import (
 
 
 @temp_private_root()
-class DownloadReviewersDocumentsTests(WebTest):
+class DownloadReviewersDocumentsTests(ClearCachesMixin, WebTest):
     @classmethod
     def setUpTestData(cls):
         process_owner = UserFactory.create(
@@ -178,7 +179,7 @@ class DownloadReviewersDocumentsTests(WebTest):
 
         self.assertEqual(200, response.status_code)
 
-        content = list(response.streaming_content)[0]
+        content = b"".join(response.streaming_content)
 
         with zipfile.ZipFile(io.BytesIO(content), "r") as file:
             names_list = file.namelist()
@@ -187,6 +188,42 @@ class DownloadReviewersDocumentsTests(WebTest):
         self.assertIn("test_archivist.pdf", names_list)
         self.assertIn("test_process_owner.pdf", names_list)
 
+    def test_documents_streamed_in_chunks(self):
+        DestructionListReviewFactory.create(
+            destruction_list=self.destruction_list,
+            additional_document=ContentFile(
+                content="Some text\n" * 100_000, name="notes.txt"
+            ),
+        )
+
+        self.client.force_login(self.process_owner)
+        response = self.client.get(
+            reverse(
+                "destruction:download-reviewer-documents",
+                args=[self.destruction_list.pk],
+            )
+        )
+
+        self.assertEqual(200, response.status_code)
+
+        chunks = [chunk for chunk in response.streaming_content if chunk]
+        self.assertGreater(len(chunks), 3)
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks)), "r") as file:
+            compress_types = {
+                info.filename: info.compress_type for info in file.infolist()
+            }
+            self.assertEqual(b"Some text\n" * 100_000, file.read("notes.txt"))
+
+        self.assertEqual(
+            {
+                "test_archivist.pdf": zipfile.ZIP_STORED,
+                "test_process_owner.pdf": zipfile.ZIP_STORED,
+                "notes.txt": zipfile.ZIP_DEFLATED,
+            },
+            compress_types,
+        )
+
     def test_404_if_no_additional_documents(self):
         process_owner = UserFactory.create(
             role__type=RoleTypeChoices.process_owner,
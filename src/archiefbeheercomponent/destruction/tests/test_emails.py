@@ -8,9 +8,10 @@ from archiefbeheercomponent.destruction.tests.factories import (
 )
 from archiefbeheercomponent.emails.constants import EmailTypeChoices
 from archiefbeheercomponent.emails.tests.factories import AutomaticEmailFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class AutomaticEmailTest(TestCase):
+class AutomaticEmailTest(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         AutomaticEmailFactory.create(
@@ -1,75 +1,163 @@
+import zipfile
 from unittest.mock import patch
 
 from django.test import TestCase
 from django.urls import reverse
 
-from furl import furl
+from privates.test import temp_private_root
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
+from ..constants import ExportStatus
+from ..models import ZakenExport
+from ..tasks import export_zaken
 
-class ExportZakenWithoutArchiveDateTests(TestCase):
+ZAKEN = [
+    {
+        "identificatie": "ZAAK-01",
+        "omschrijving": "Test zaak 1",
+        "zaaktype": {"omschrijving": "Zaaktype-1"},
+        "startdatum": "2020-01-01",
+        "einddatum": "2021-01-01",
+        "verantwoordelijkeOrganisatie": "Test organisatie",
+    },
+    {
+        "identificatie": "ZAAK-02",
+        "omschrijving": "Test zaak 2",
+        "zaaktype": {"omschrijving": "Zaaktype-2"},
+        "startdatum": "2020-01-01",
+        "einddatum": "2021-01-01",
+        "verantwoordelijkeOrganisatie": "Test organisatie",
+    },
+]
+
+
+class ExportZakenWithoutArchiveDateTests(ClearCachesMixin, TestCase):
     def test_cant_access_without_can_start_destruction(self):
         user = UserFactory(role__can_start_destruction=False)
         self.client.force_login(user)
         url = reverse("destruction:export-zaken-without-archive-date")
 
-        response = self.client.get(url)
+        response = self.client.post(url)
 
         self.assertEqual(403, response.status_code)
 
-    @patch(
-        "archiefbeheercomponent.destruction.views.export.fetch_zaken",
-        return_value=[
-            {
-                "identificatie": "ZAAK-01",
-                "omschrijving": "Test zaak 1",
-                "zaaktype": {"omschrijving": "Zaaktype-1"},
-                "startdatum": "2020-01-01",
-                "einddatum": "2021-01-01",
-                "verantwoordelijkeOrganisatie": "Test organisatie",
-            },
+    @patch("archiefbeheercomponent.destruction.views.export.export_zaken.delay")
+    def test_record_manager_can_start_export(self, m_export_zaken):
+        user = UserFactory(role__can_start_destruction=True)
+        self.client.force_login(user)
+        url = reverse("destruction:export-zaken-without-archive-date")
+
+        response = self.client.post(
+            url, {"zaken_urls": "http://oz.nl/zaak/1,http://oz.nl/zaak/2"}
+        )
+
+        self.assertEqual(202, response.status_code)
+
+        export = ZakenExport.objects.get()
+        self.assertEqual(user, export.user)
+        self.assertEqual(
+            ["http://oz.nl/zaak/1", "http://oz.nl/zaak/2"], export.zaken_urls
+        )
+        self.assertEqual(
             {
-                "identificatie": "ZAAK-02",
-                "omschrijving": "Test zaak 2",
-                "zaaktype": {"omschrijving": "Zaaktype-2"},
-                "startdatum": "2020-01-01",
-                "einddatum": "2021-01-01",
-                "verantwoordelijkeOrganisatie": "Test organisatie",
+                "status": ExportStatus.pending,
+                "statusUrl": reverse(
+                    "destruction:zaken-export-status", args=[export.pk]
+                ),
+                "downloadUrl": None,
             },
-        ],
-    )
+            response.json(),
+        )
+        m_export_zaken.assert_called_once_with(export.id)
+
+    def test_no_zaak_urls_raises_error(self):
+        user = UserFactory(role__can_start_destruction=True)
+        self.client.force_login(user)
+        url = reverse("destruction:export-zaken-without-archive-date")
+
+        response = self.client.post(url)
+
+        self.assertEqual(400, response.status_code)
+
+
+@temp_private_root()
+class ZakenExportTests(ClearCachesMixin, TestCase):
     @patch(
-        "archiefbeheercomponent.destruction.views.export.uuid4",
-        return_value="d0702e2c-1af4-4cb4-87d4-16632e21052e",
+        "archiefbeheercomponent.destruction.tasks.get_additional_zaak_info",
+        side_effect=lambda zaak: zaak,
     )
-    def test_record_manager_can_download(self, m_uuid, m_fetch_zaken):
+    @patch("archiefbeheercomponent.destruction.tasks.fetch_zaken", return_value=ZAKEN)
+    def test_export_zaken(self, m_fetch_zaken, m_additional_info):
         user = UserFactory(role__can_start_destruction=True)
+        export = ZakenExport.objects.create(
+            user=user, zaken_urls=["http://oz.nl/zaak/1", "http://oz.nl/zaak/2"]
+        )
+
+        export_zaken(export.id)
+
+        export.refresh_from_db()
+        self.assertEqual(ExportStatus.completed, export.status)
+        self.assertIsNotNone(export.finished)
+        m_fetch_zaken.assert_called_once_with(
+            ["http://oz.nl/zaak/1", "http://oz.nl/zaak/2"]
+        )
+
+        with export.content.open("rb") as content, zipfile.ZipFile(content) as xlsx:
+            sheet = xlsx.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertIn('<row r="3"', sheet)
+        # Strings are written inline in constant memory mode
+        self.assertIn("ZAAK-02", sheet)
+
         self.client.force_login(user)
-        url = furl(reverse("destruction:export-zaken-without-archive-date"))
-        url.args["zaken_urls"] = "http://oz.nl/zaak/1,http://oz.nl/zaak/2"
+        status_response = self.client.get(
+            reverse("destruction:zaken-export-status", args=[export.pk])
+        )
+
+        self.assertEqual(200, status_response.status_code)
+        download_url = reverse("destruction:zaken-export-download", args=[export.pk])
+        self.assertEqual(download_url, status_response.json()["downloadUrl"])
 
-        response = self.client.get(url.url)
+        response = self.client.get(download_url)
 
         self.assertEqual(200, response.status_code)
         self.assertEqual(
-            response.headers.get("content-disposition"),
-            'attachment; filename="zaken-lijst-d0702e2c-1af4-4cb4-87d4-16632e21052e.xlsx"',
-        )
-        self.assertEqual(
-            response.headers.get("content-type"),
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            response["Content-Type"],
         )
-        self.assertNotEqual(0, len(response.content))
-        m_fetch_zaken.assert_called_once_with(
-            ["http://oz.nl/zaak/1", "http://oz.nl/zaak/2"]
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    @patch(
+        "archiefbeheercomponent.destruction.tasks.fetch_zaken",
+        side_effect=Exception("Something went wrong"),
+    )
+    def test_export_zaken_failed(self, m_fetch_zaken):
+        export = ZakenExport.objects.create(
+            user=UserFactory(), zaken_urls=["http://oz.nl/zaak/1"]
         )
 
-    def test_no_zaak_urls_query_param_raises_error(self):
-        user = UserFactory(role__can_start_destruction=True)
-        self.client.force_login(user)
-        url = furl(reverse("destruction:export-zaken-without-archive-date"))
+        with self.assertRaises(Exception):
+            export_zaken(export.id)
 
-        response = self.client.get(url.url)
+        export.refresh_from_db()
+        self.assertEqual(ExportStatus.failed, export.status)
+        self.assertFalse(export.content)
 
-        self.assertEqual(400, response.status_code)
+    def test_export_of_other_user_not_accessible(self):
+        export = ZakenExport.objects.create(
+            user=UserFactory(),
+            zaken_urls=["http://oz.nl/zaak/1"],
+            status=ExportStatus.completed,
+        )
+        self.client.force_login(UserFactory())
+
+        status_response = self.client.get(
+            reverse("destruction:zaken-export-status", args=[export.pk])
+        )
+        download_response = self.client.get(
+            reverse("destruction:zaken-export-download", args=[export.pk])
+        )
+
+        self.assertEqual(404, status_response.status_code)
+        self.assertEqual(404, download_response.status_code)
@@ -0,0 +1,174 @@
+import json
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+import requests_mock
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import (
+    ClearCachesMixin,
+    mock_service_oas_get,
+    paginated_response,
+)
+
+from ..mirror import save_mirrored_zaken
+
+ZAKEN_ROOT = "https://oz.nl/zaken/api/v1/"
+CATALOGI_ROOT = "https://oz.nl/catalogi/api/v1/"
+DOCUMENTEN_ROOT = "https://oz.nl/documenten/api/v1/"
+
+ZAAK_URL = f"{ZAKEN_ROOT}zaken/uuid-1"
+RESULTAAT_URL = f"{ZAKEN_ROOT}resultaten/uuid-1"
+RESULTAATTYPE_URL = f"{CATALOGI_ROOT}resultaattypen/uuid-1"
+IOTYPE = {"url": f"{CATALOGI_ROOT}informatieobjecttypen/uuid-1", "omschrijving": "PDF"}
+DOCUMENT_URLS = [
+    f"{DOCUMENTEN_ROOT}enkelvoudiginformatieobjecten/uuid-{i}" for i in range(1, 4)
+]
+
+
+@requests_mock.Mocker()
+class FetchZaakDetailTests(ClearCachesMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+        Service.objects.create(api_type=APITypes.ztc, api_root=CATALOGI_ROOT)
+        Service.objects.create(api_type=APITypes.drc, api_root=DOCUMENTEN_ROOT)
+
+        user = UserFactory.create(role__can_view_case_details=True)
+        self.client.force_login(user)
+
+    def _set_up_mocks(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        mock_service_oas_get(m, CATALOGI_ROOT, "ztc")
+        mock_service_oas_get(m, DOCUMENTEN_ROOT, "drc")
+
+        m.get(ZAAK_URL, json={"url": ZAAK_URL, "resultaat": RESULTAAT_URL})
+        m.get(
+            RESULTAAT_URL,
+            json={"url": RESULTAAT_URL, "resultaattype": RESULTAATTYPE_URL},
+        )
+        m.get(RESULTAATTYPE_URL, json={"url": RESULTAATTYPE_URL})
+        m.get(f"{ZAAK_URL}/besluiten", json=[])
+        m.get(f"{CATALOGI_ROOT}besluittypen", json=paginated_response([]))
+        m.get(
+            f"{ZAKEN_ROOT}zaakinformatieobjecten?zaak={ZAAK_URL}",
+            json=[{"informatieobject": url} for url in DOCUMENT_URLS],
+        )
+        m.get(
+            f"{CATALOGI_ROOT}informatieobjecttypen", json=paginated_response([IOTYPE])
+        )
+        for url in DOCUMENT_URLS:
+            m.get(url, json={"url": url, "informatieobjecttype": IOTYPE["url"]})
+
+    def _requested_urls(self, m):
+        return [request.url for request in m.request_history]
+
+    def test_fetch_zaak_detail(self, m):
+        self._set_up_mocks(m)
+
+        response = self.client.get(
+            reverse("destruction:fetch-zaak-detail"), {"zaak_url": ZAAK_URL}
+        )
+
+        self.assertEqual(200, response.status_code)
+        data = response.json()
+        self.assertEqual(RESULTAAT_URL, data["resultaat"]["url"])
+        self.assertEqual(DOCUMENT_URLS, [doc["url"] for doc in data["documenten"]])
+        self.assertEqual(IOTYPE, data["documenten"][0]["informatieobjecttype"])
+        self.assertEqual([], data["besluiten"])
+
+    def test_fetch_zaak_detail_documenten_paginated(self, m):
+        self._set_up_mocks(m)
+
+        response = self.client.get(
+            reverse("destruction:fetch-zaak-detail"),
+            {"zaak_url": ZAAK_URL, "documenten_page": 2, "documenten_page_size": 2},
+        )
+
+        self.assertEqual(200, response.status_code)
+        data = response.json()
+        self.assertEqual([DOCUMENT_URLS[2]], [doc["url"] for doc in data["documenten"]])
+        self.assertEqual(3, data["documentenCount"])
+        self.assertEqual(1, data["documentenPrevious"])
+        self.assertIsNone(data["documentenNext"])
+        # Only the documenten on the page are retrieved
+        requested_urls = self._requested_urls(m)
+        self.assertNotIn(DOCUMENT_URLS[0], requested_urls)
+        self.assertNotIn(DOCUMENT_URLS[1], requested_urls)
+
+    def test_fetch_zaak_detail_invalid_documenten_page(self, m):
+        self._set_up_mocks(m)
+
+        response = self.client.get(
+            reverse("destruction:fetch-zaak-detail"),
+            {"zaak_url": ZAAK_URL, "documenten_page": 3, "documenten_page_size": 2},
+        )
+
+        self.assertEqual(400, response.status_code)
+
+    @override_settings(ZAKEN_MIRROR_ENABLED=True)
+    def test_mirrored_zaak_not_retrieved(self, m):
+        self._set_up_mocks(m)
+        save_mirrored_zaken(
+            [
+                {
+                    "url": ZAAK_URL,
+                    "zaaktype": f"{CATALOGI_ROOT}zaaktypen/uuid-1",
+                    "startdatum": "2020-01-01",
+                    "resultaat": RESULTAAT_URL,
+                }
+            ]
+        )
+
+        response = self.client.get(
+            reverse("destruction:fetch-zaak-detail"), {"zaak_url": ZAAK_URL}
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(RESULTAAT_URL, response.json()["resultaat"]["url"])
+        self.assertNotIn(ZAAK_URL, self._requested_urls(m))
+
+    def test_fetch_zaken_detail(self, m):
+        self._set_up_mocks(m)
+        other_zaak_url = f"{ZAKEN_ROOT}zaken/uuid-2"
+        m.get(other_zaak_url, status_code=404, json={"status": 404})
+        m.get(f"{other_zaak_url}/besluiten", json=[])
+        m.get(
+            f"{ZAKEN_ROOT}zaakinformatieobjecten?zaak={other_zaak_url}",
+            json=[{"informatieobject": DOCUMENT_URLS[0]}],
+        )
+
+        response = self.client.get(
+            reverse("destruction:fetch-zaken-detail"),
+            {"zaak_url": [ZAAK_URL, other_zaak_url]},
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("application/x-ndjson", response["Content-Type"])
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        details = {detail["zaakUrl"]: detail for detail in map(json.loads, lines)}
+
+        self.assertEqual({ZAAK_URL, other_zaak_url}, set(details))
+        self.assertEqual(
+            DOCUMENT_URLS, [doc["url"] for doc in details[ZAAK_URL]["documenten"]]
+        )
+        self.assertIn("error", details[other_zaak_url])
+        # The types are shared between the zaken
+        iotypen_requests = [
+            url
+            for url in self._requested_urls(m)
+            if url.startswith(f"{CATALOGI_ROOT}informatieobjecttypen")
+        ]
+        self.assertEqual(1, len(iotypen_requests))
+
+    def test_fetch_zaken_detail_too_many_zaken(self, m):
+        response = self.client.get(
+            reverse("destruction:fetch-zaken-detail"),
+            {"zaak_url": [f"{ZAKEN_ROOT}zaken/{i}" for i in range(101)]},
+        )
+
+        self.assertEqual(400, response.status_code)
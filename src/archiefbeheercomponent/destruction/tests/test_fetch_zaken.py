@@ -1,4 +1,5 @@
 import copy
+import json
 from unittest.mock import patch
 
 from django.http.request import QueryDict
@@ -11,6 +12,7 @@ from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.destruction.tests.factories import (
     DestructionListItemFactory,
 )
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 ZAKEN_ROOT = "https://oz.nl/zaken/api/v1/"
 CATALOGI_ROOT = "https://oz.nl/catalogi/api/v1/"
@@ -72,7 +74,7 @@ def mock_get_additional_zaak_info(arg):
     return arg
 
 
-class FetchZakenViewTests(TestCase):
+class FetchZakenViewTests(ClearCachesMixin, TestCase):
     def test_view_requires_login(self):
         view_url = reverse("destruction:fetch-zaken")
         expected_redirect_url = furl(reverse("admin:login"), args={"next": view_url})
@@ -89,7 +91,7 @@ class FetchZakenViewTests(TestCase):
         response = self.client.get(reverse("destruction:fetch-zaken"))
 
         self.assertEqual(200, response.status_code)
-        m.assert_called_once_with({})
+        m.assert_called_once_with({}, unavailable_services=[])
 
     @patch("archiefbeheercomponent.destruction.api.get_zaken")
     def test_query_params_are_forwarded(self, m):
@@ -105,7 +107,7 @@ class FetchZakenViewTests(TestCase):
         expected_arguments = QueryDict(
             "einddatum__isnull=False&archiefactiedatum__isnull=True", mutable=True
         )
-        m.assert_called_once_with(expected_arguments)
+        m.assert_called_once_with(expected_arguments, unavailable_services=[])
 
     @patch(
         "archiefbeheercomponent.destruction.api.get_zaken",
@@ -131,3 +133,80 @@ class FetchZakenViewTests(TestCase):
         self.assertTrue(zaak2["available"])
         self.assertTrue(zaak3["available"])
         self.assertTrue(zaak4["available"])
+
+    @patch(
+        "archiefbeheercomponent.destruction.api.get_zaken",
+        return_value=copy.deepcopy(ZAKEN),
+    )
+    @patch(
+        "archiefbeheercomponent.destruction.api.get_additional_zaak_info",
+        side_effect=mock_get_additional_zaak_info,
+    )
+    def test_fetch_zaken_paginated(self, m_get_zaak_additional_info, m_get_zaken):
+        user = UserFactory.create(role__can_start_destruction=True)
+        self.client.force_login(user)
+
+        response = self.client.get(
+            reverse("destruction:fetch-zaken"),
+            {"page": 2, "page_size": 3, "archiefactiedatum__isnull": True},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        m_get_zaken.assert_called_once_with(
+            QueryDict("archiefactiedatum__isnull=True", mutable=True),
+            unavailable_services=[],
+        )
+
+        data = response.json()
+
+        self.assertEqual(data["count"], 4)
+        self.assertIsNone(data["next"])
+        self.assertEqual(data["previous"], 1)
+        self.assertEqual(len(data["zaken"]), 1)
+        self.assertEqual(data["zaken"][0]["url"], ZAKEN[3]["url"])
+        # Only the zaken on the requested page are enriched
+        m_get_zaak_additional_info.assert_called_once()
+
+    @patch(
+        "archiefbeheercomponent.destruction.api.get_zaken",
+        return_value=copy.deepcopy(ZAKEN),
+    )
+    def test_fetch_zaken_invalid_page(self, m_get_zaken):
+        user = UserFactory.create(role__can_start_destruction=True)
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("destruction:fetch-zaken"), {"page": 3})
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch(
+        "archiefbeheercomponent.destruction.api.get_zaken",
+        return_value=copy.deepcopy(ZAKEN),
+    )
+    @patch(
+        "archiefbeheercomponent.destruction.api.get_additional_zaak_info",
+        side_effect=mock_get_additional_zaak_info,
+    )
+    def test_fetch_zaken_ndjson(self, m_get_zaak_additional_info, m_get_zaken):
+        user = UserFactory.create(role__can_start_destruction=True)
+        self.client.force_login(user)
+        DestructionListItemFactory.create(zaak="https://some.zaken.nl/api/v1/zaken/1")
+
+        response = self.client.get(
+            reverse("destruction:fetch-zaken"),
+            {"page_size": 2},
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["X-Total-Count"], "4")
+
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        zaken = [json.loads(line) for line in lines]
+
+        self.assertEqual(
+            [zaak["url"] for zaak in zaken], [ZAKEN[0]["url"], ZAKEN[1]["url"]]
+        )
+        self.assertFalse(zaken[0]["available"])
+        self.assertTrue(zaken[1]["available"])
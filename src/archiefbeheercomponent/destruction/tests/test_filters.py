@@ -9,9 +9,10 @@ from archiefbeheercomponent.destruction.tests.factories import (
     DestructionListAssigneeFactory,
     DestructionListFactory,
 )
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class RecordManagerFilterTest(TestCase):
+class RecordManagerFilterTest(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         cls.record_manager = UserFactory(
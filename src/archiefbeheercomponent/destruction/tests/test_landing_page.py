@@ -3,20 +3,30 @@ Test the various role landing pages.
 """
 from unittest.mock import patch
 
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, reverse_lazy
 
 from django_webtest import WebTest
+from privates.test import temp_private_root
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.notifications.tests.factories import NotificationFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ...constants import RoleTypeChoices
 from ...report.tests.factories import DestructionReportFactory
 from ..constants import ListItemStatus, ReviewerDisplay
-from .factories import DestructionListFactory, DestructionListReviewFactory
+from ..models import ArchiveConfig, DestructionList
+from .factories import (
+    DestructionListAssigneeFactory,
+    DestructionListFactory,
+    DestructionListReviewFactory,
+)
 
 
-class RecordManagerTests(WebTest):
+class RecordManagerTests(ClearCachesMixin, WebTest):
     """
     Test the role that can start destruction list processes.
     """
@@ -106,7 +116,7 @@ class RecordManagerTests(WebTest):
         self.assertEqual(expected_values, values)
 
 
-class ReviewerTests(WebTest):
+class ReviewerTests(ClearCachesMixin, WebTest):
     """
     Test the role that can review destruction list processes.
     """
@@ -191,7 +201,7 @@ class ReviewerTests(WebTest):
         self.assertEqual(response_default.body, response_to_review.body)
 
 
-class ReviewerDownloadReportTests(WebTest):
+class ReviewerDownloadReportTests(ClearCachesMixin, WebTest):
     """
     Test which reviewers can download a report
     """
@@ -269,3 +279,91 @@ class ReviewerDownloadReportTests(WebTest):
         self.assertEqual(len(destruction_lists), 1)
 
         self.assertNotIn("Download verklaring van vernietiging", response.html.text)
+
+
+class ListOverviewQueriesTests(ClearCachesMixin, WebTest):
+    """
+    Test that the number of queries does not depend on the number of lists shown
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.record_manager = UserFactory.create(role__can_start_destruction=True)
+        cls.process_owner = UserFactory.create(
+            role__can_review_destruction=True, role__type=RoleTypeChoices.process_owner
+        )
+
+    def create_lists(self, number_of_lists: int) -> None:
+        for _ in range(number_of_lists):
+            # The names of the lists are unique
+            destruction_list = DestructionListFactory.create(
+                name=f"List {DestructionList.objects.count()}",
+                author=self.record_manager,
+                assignee=self.process_owner,
+            )
+            DestructionListAssigneeFactory.create(
+                destruction_list=destruction_list, assignee=self.process_owner, order=1
+            )
+            DestructionListReviewFactory.create(
+                destruction_list=destruction_list,
+                author=self.process_owner,
+                additional_document=SimpleUploadedFile("document.txt", b"content"),
+            )
+            DestructionReportFactory.create(
+                destruction_list=destruction_list, process_owner=self.process_owner
+            )
+
+    def count_queries(self, url: str, user, **params) -> int:
+        # The first request also logs the user in
+        self.app.get(url, params, user=user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.app.get(url, params, user=user)
+
+        self.assertEqual(200, response.status_code)
+        # Leave out the (cached) configuration of the authentication backends
+        return len(
+            [
+                query
+                for query in context.captured_queries
+                if "destruction" in query["sql"]
+            ]
+        )
+
+    @temp_private_root()
+    def test_record_manager_list(self):
+        url = reverse("destruction:record-manager-list")
+
+        self.create_lists(1)
+        queries_one_list = self.count_queries(url, self.record_manager)
+        self.create_lists(5)
+        queries_six_lists = self.count_queries(url, self.record_manager)
+
+        self.assertEqual(queries_one_list, queries_six_lists)
+
+    @temp_private_root()
+    @patch(
+        "archiefbeheercomponent.destruction.views.reviewer.ArchiveConfig.get_solo",
+        return_value=ArchiveConfig(destruction_report_downloadable=True),
+    )
+    def test_reviewer_list(self, m_get_solo):
+        url = reverse("destruction:reviewer-list")
+
+        self.create_lists(1)
+        queries_one_list = self.count_queries(
+            url, self.process_owner, reviewed=ReviewerDisplay.all
+        )
+        self.create_lists(5)
+        response = self.app.get(
+            url, {"reviewed": ReviewerDisplay.all}, user=self.process_owner
+        )
+        queries_six_lists = self.count_queries(
+            url, self.process_owner, reviewed=ReviewerDisplay.all
+        )
+
+        self.assertEqual(queries_one_list, queries_six_lists)
+        # A PDF and CSV link per list
+        self.assertEqual(
+            12,
+            len(response.html.find_all(title="Download verklaring van vernietiging")),
+        )
@@ -3,14 +3,16 @@ from django.test import TestCase
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.constants import RoleTypeChoices
 from archiefbeheercomponent.destruction.constants import ReviewStatus
+from archiefbeheercomponent.destruction.models import DestructionList
 from archiefbeheercomponent.destruction.tests.factories import (
     DestructionListAssigneeFactory,
     DestructionListFactory,
     DestructionListReviewFactory,
 )
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class ListStateTest(TestCase):
+class ListStateTest(ClearCachesMixin, TestCase):
     def test_state_after_creation(self):
         record_manager = UserFactory(
             role__can_start_destruction=True, role__type=RoleTypeChoices.record_manager
@@ -160,3 +162,82 @@ class ListStateTest(TestCase):
         list_state = destruction_list.list_state()
 
         self.assertEqual("finished", list_state.value)
+
+    def test_annotated_state(self):
+        record_manager = UserFactory(
+            role__can_start_destruction=True, role__type=RoleTypeChoices.record_manager
+        )
+        process_owner = UserFactory(
+            role__can_review_destruction=True, role__type=RoleTypeChoices.process_owner
+        )
+        archivist = UserFactory(
+            role__can_review_destruction=True, role__type=RoleTypeChoices.archivist
+        )
+
+        in_review = DestructionListFactory.create(author=record_manager)
+        DestructionListAssigneeFactory.create(
+            assignee=process_owner, destruction_list=in_review, order=1
+        )
+        DestructionListAssigneeFactory.create(
+            assignee=archivist, destruction_list=in_review, order=2
+        )
+        in_review.assignee = archivist
+        in_review.save()
+
+        rejected = DestructionListFactory.create(author=record_manager)
+        DestructionListAssigneeFactory.create(
+            assignee=archivist, destruction_list=rejected, order=1
+        )
+        DestructionListReviewFactory.create(
+            author=archivist,
+            status=ReviewStatus.rejected,
+            destruction_list=rejected,
+        )
+        rejected.assignee = record_manager
+        rejected.save()
+
+        approved = DestructionListFactory.create(author=record_manager)
+        DestructionListAssigneeFactory.create(
+            assignee=archivist, destruction_list=approved, order=1
+        )
+        approved.assignee = None
+        approved.save()
+
+        annotated_lists = DestructionList.objects.annotate_overview().order_by("id")
+
+        with self.assertNumQueries(1):
+            values = [
+                (
+                    destruction_list.list_state().value,
+                    destruction_list.total_reviewers(),
+                    destruction_list.completed_reviewers(),
+                    destruction_list.is_review_overdue,
+                )
+                for destruction_list in annotated_lists
+            ]
+
+        self.assertEqual(
+            [
+                ("in_progress", 2, 1, False),
+                ("rejected", 1, 0, False),
+                ("approved", 1, 1, False),
+            ],
+            values,
+        )
+
+    def test_completed_reviewers_without_assignee_order(self):
+        record_manager = UserFactory(
+            role__can_start_destruction=True, role__type=RoleTypeChoices.record_manager
+        )
+        process_owner = UserFactory(
+            role__can_review_destruction=True, role__type=RoleTypeChoices.process_owner
+        )
+        destruction_list = DestructionListFactory.create(
+            author=record_manager, assignee=process_owner
+        )
+
+        annotated_list = DestructionList.objects.annotate_overview().get()
+
+        self.assertIsNone(annotated_list.assignee_order)
+        self.assertEqual(0, annotated_list.completed_reviewers())
+        self.assertEqual(0, destruction_list.completed_reviewers())
@@ -0,0 +1,223 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+import requests_mock
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin, mock_service_oas_get
+
+from ..mirror import save_mirrored_zaken
+from ..models import MirroredZaak
+from ..service import fetch_zaken, get_zaken
+
+ZAKEN_ROOT = "https://oz.nl/zaken/api/v1/"
+CATALOGI_ROOT = "https://oz.nl/catalogi/api/v1/"
+
+ZAAKTYPE_1 = {"url": f"{CATALOGI_ROOT}zaaktypen/uuid-1", "omschrijving": "Zaaktype B"}
+ZAAKTYPE_2 = {"url": f"{CATALOGI_ROOT}zaaktypen/uuid-2", "omschrijving": "Zaaktype A"}
+ZAAKTYPEN = {zaaktype["url"]: zaaktype for zaaktype in [ZAAKTYPE_1, ZAAKTYPE_2]}
+
+ZAKEN = [
+    {
+        "url": f"{ZAKEN_ROOT}zaken/1",
+        "identificatie": "ZAAK-01",
+        "zaaktype": ZAAKTYPE_1["url"],
+        "bronorganisatie": "095847261",
+        "registratiedatum": "2020-01-02",
+        "startdatum": "2020-01-01",
+        "einddatum": "2020-06-01",
+        "archiefnominatie": "vernietigen",
+        "archiefactiedatum": "2021-01-01",
+    },
+    {
+        "url": f"{ZAKEN_ROOT}zaken/2",
+        "identificatie": "ZAAK-02",
+        "zaaktype": ZAAKTYPE_2["url"],
+        "bronorganisatie": "517439943",
+        "registratiedatum": "2020-02-02",
+        "startdatum": "2020-02-01",
+        "einddatum": None,
+        "archiefnominatie": "vernietigen",
+        "archiefactiedatum": None,
+    },
+    {
+        "url": f"{ZAKEN_ROOT}zaken/3",
+        "identificatie": "ZAAK-03",
+        "zaaktype": ZAAKTYPE_1["url"],
+        "bronorganisatie": "095847261",
+        "registratiedatum": "2020-03-02",
+        "startdatum": "2020-03-01",
+        "einddatum": "2020-09-01",
+        "archiefnominatie": "blijvend_bewaren",
+        "archiefactiedatum": "2030-01-01",
+    },
+]
+
+
+@requests_mock.Mocker()
+class SyncZakenTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+
+    def test_sync_zaken(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        m.get(
+            f"{ZAKEN_ROOT}zaken",
+            json={
+                "count": 3,
+                "previous": None,
+                "next": f"{ZAKEN_ROOT}zaken?page=2",
+                "results": ZAKEN[:2],
+            },
+        )
+        m.get(
+            f"{ZAKEN_ROOT}zaken?page=2",
+            json={
+                "count": 3,
+                "previous": f"{ZAKEN_ROOT}zaken?page=1",
+                "next": None,
+                "results": ZAKEN[2:],
+            },
+        )
+        MirroredZaak.objects.create(
+            url=f"{ZAKEN_ROOT}zaken/removed",
+            zaaktype=ZAAKTYPE_1["url"],
+            startdatum="2019-01-01",
+            data={},
+        )
+        save_mirrored_zaken([{**ZAKEN[0], "archiefactiedatum": "2019-01-01"}])
+
+        call_command("sync-zaken", stdout=StringIO())
+
+        self.assertEqual(
+            ["ZAAK-01", "ZAAK-02", "ZAAK-03"],
+            list(
+                MirroredZaak.objects.order_by("url").values_list(
+                    "identificatie", flat=True
+                )
+            ),
+        )
+        zaak = MirroredZaak.objects.get(url=ZAKEN[0]["url"])
+        self.assertEqual("2021-01-01", zaak.archiefactiedatum.isoformat())
+        self.assertEqual(ZAKEN[0], zaak.data)
+
+
+@override_settings(ZAKEN_MIRROR_ENABLED=True)
+@patch(
+    "archiefbeheercomponent.destruction.service.get_zaaktypen", return_value=ZAAKTYPEN
+)
+class MirroredZakenTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        save_mirrored_zaken(ZAKEN)
+
+    def test_filter_zaken(self, m_get_zaaktypen):
+        zaken = get_zaken(
+            {
+                "archiefnominatie": "vernietigen",
+                "zaaktype__in": f"{ZAAKTYPE_1['url']},{ZAAKTYPE_2['url']}",
+                "archiefactiedatum__isnull": "true",
+            }
+        )
+
+        self.assertEqual(["ZAAK-02"], [zaak["identificatie"] for zaak in zaken])
+        self.assertEqual(ZAAKTYPE_2, zaken[0]["zaaktype"])
+
+    def test_order_zaken(self, m_get_zaaktypen):
+        zaken = get_zaken({"ordering": "-startdatum", "sort_by_zaaktype": True})
+
+        self.assertEqual(
+            ["ZAAK-02", "ZAAK-03", "ZAAK-01"], [zaak["identificatie"] for zaak in zaken]
+        )
+
+    def test_paginate_zaken(self, m_get_zaaktypen):
+        self.client.force_login(UserFactory())
+
+        with patch(
+            "archiefbeheercomponent.destruction.api.get_additional_zaak_info",
+            side_effect=lambda zaak: zaak,
+        ):
+            response = self.client.get(
+                reverse("destruction:fetch-zaken"),
+                {"startdatum__gte": "2020-02-01", "page": 2, "page_size": 1},
+            )
+
+        self.assertEqual(200, response.status_code)
+        data = response.json()
+        self.assertEqual(2, data["count"])
+        self.assertEqual(["ZAAK-03"], [zaak["identificatie"] for zaak in data["zaken"]])
+
+    @requests_mock.Mocker()
+    def test_unsupported_filter_uses_zaken_api(self, m_get_zaaktypen, m):
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        m.get(
+            f"{ZAKEN_ROOT}zaken",
+            json={"count": 1, "next": None, "previous": None, "results": ZAKEN[:1]},
+        )
+
+        zaken = get_zaken({"omschrijving": "test"})
+
+        self.assertEqual(["ZAAK-01"], [zaak["identificatie"] for zaak in zaken])
+        self.assertEqual("omschrijving=test", m.last_request.query)
+
+    def test_fetch_zaken(self, m_get_zaaktypen):
+        zaak = {**ZAKEN[0], "url": f"{ZAKEN_ROOT}zaken/4", "identificatie": "ZAAK-04"}
+
+        with patch(
+            "archiefbeheercomponent.destruction.service.fetch_zaak", return_value=zaak
+        ) as m_fetch_zaak:
+            zaken = fetch_zaken([ZAKEN[2]["url"], zaak["url"], ZAKEN[0]["url"]])
+
+        self.assertEqual(
+            ["ZAAK-03", "ZAAK-04", "ZAAK-01"], [zaak["identificatie"] for zaak in zaken]
+        )
+        m_fetch_zaak.assert_called_once_with(zaak["url"])
+
+
+@override_settings(
+    ZAKEN_MIRROR_ENABLED=True, ZAKEN_MIRROR_NOTIFICATIONS_AUTH="Bearer token"
+)
+class ZakenNotificationTests(ClearCachesMixin, TestCase):
+    url = reverse("destruction:zaken-notifications")
+
+    def _notify(self, actie, resource="zaak", auth="Bearer token"):
+        return self.client.post(
+            self.url,
+            {
+                "kanaal": "zaken",
+                "hoofdObject": ZAKEN[0]["url"],
+                "resource": resource,
+                "resourceUrl": ZAKEN[0]["url"],
+                "actie": actie,
+            },
+            content_type="application/json",
+            HTTP_AUTHORIZATION=auth,
+        )
+
+    def test_notification_without_authorization(self):
+        response = self._notify("update", auth="Bearer other")
+
+        self.assertEqual(403, response.status_code)
+
+    @patch("archiefbeheercomponent.destruction.api.sync_mirrored_zaak.delay")
+    def test_zaak_updated(self, m_sync):
+        response = self._notify("partial_update", resource="status")
+
+        self.assertEqual(204, response.status_code)
+        m_sync.assert_called_once_with(ZAKEN[0]["url"])
+
+    def test_zaak_destroyed(self):
+        save_mirrored_zaken(ZAKEN[:1])
+
+        response = self._notify("destroy")
+
+        self.assertEqual(204, response.status_code)
+        self.assertFalse(MirroredZaak.objects.exists())
@@ -7,6 +7,7 @@ from django.urls import reverse, reverse_lazy
 from django_webtest import WebTest
 
 from archiefbeheercomponent.accounts.tests.factories import RoleFactory, UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ..constants import ReviewStatus
 from .factories import (
@@ -17,7 +18,7 @@ from .factories import (
 
 
 @tag("notifs")
-class NotificationLinkTests(WebTest):
+class NotificationLinkTests(ClearCachesMixin, WebTest):
 
     start_url = reverse_lazy("entry")
 
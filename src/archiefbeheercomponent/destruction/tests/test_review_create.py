@@ -11,6 +11,7 @@ from timeline_logger.models import TimelineLog
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.notifications.models import Notification
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ...constants import RoleTypeChoices
 from ..constants import ReviewStatus, Suggestion
@@ -49,7 +50,7 @@ class DLMixin:
 
 
 @temp_private_root()
-class ReviewCreateTests(DLMixin, TestCase):
+class ReviewCreateTests(ClearCachesMixin, DLMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
@@ -475,7 +476,7 @@ class ReviewCreateTests(DLMixin, TestCase):
         )
 
 
-class SendTaskReviewCreateTests(DLMixin, TestCase):
+class SendTaskReviewCreateTests(ClearCachesMixin, DLMixin, TestCase):
     def setUp(self) -> None:
         super().setUp()
 
@@ -506,7 +507,7 @@ class SendTaskReviewCreateTests(DLMixin, TestCase):
         m.assert_called_once_with(destruction_list.id)
 
 
-class CreateReviewViewContextTest(TestCase):
+class CreateReviewViewContextTest(ClearCachesMixin, TestCase):
     def test_sensitive_info_process_owner(self):
         destruction_list = DestructionListFactory.create(contains_sensitive_info=True)
         process_owner = UserFactory.create(
@@ -6,6 +6,7 @@ from django_webtest import WebTest
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.report.tests.factories import DestructionReportFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ..constants import ReviewerDisplay
 from ..models import ArchiveConfig
@@ -13,7 +14,7 @@ from .factories import DestructionListFactory, DestructionListReviewFactory
 
 
 @patch("archiefbeheercomponent.destruction.views.reviewer.ArchiveConfig.get_solo")
-class DownloadButtonInReviewerViewTests(WebTest):
+class DownloadButtonInReviewerViewTests(ClearCachesMixin, WebTest):
     @classmethod
     def setUpTestData(cls):
         cls.user = UserFactory.create(role__can_review_destruction=True)
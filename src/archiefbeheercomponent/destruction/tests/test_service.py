@@ -1,20 +1,44 @@
-from django.test import TestCase
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import TestCase, TransactionTestCase, override_settings
 
 import requests_mock
+import yaml
+from zds_client.client import ClientError
 from zgw_consumers.constants import APITypes
 from zgw_consumers.models import Service
 
 from archiefbeheercomponent.tests.utils import (
+    ClearCachesMixin,
     generate_oas_component,
     mock_service_oas_get,
     paginated_response,
+    read_schema,
 )
 
-from ..service import fetch_resultaat, get_zaken, update_zaak
+from ..client import ClientRegistry, TokenBucket, registry
+from ..service import (
+    fetch_process_type,
+    fetch_resultaat,
+    fetch_zaak,
+    fetch_zaak_with_resultaat,
+    get_response_cache_stats,
+    get_types_cache_stats,
+    get_zaaktypen,
+    get_zaken,
+    memoized_lookups,
+    parallel,
+    query_services,
+    remove_zaak,
+    update_zaak,
+)
 
 ZAKEN_ROOT = "https://oz.nl/zaken/api/v1/"
 CATALOGI_ROOT = "https://oz.nl/catalogi/api/v1/"
 SELECTIELIJST_ROOT = "https://oz.nl/selectielijst/api/v1/"
+DOCUMENTEN_ROOT = "https://oz.nl/documenten/api/v1/"
 
 ZAAKTYPE_1 = {
     "url": f"{CATALOGI_ROOT}zaaktypen/uuid-1",
@@ -50,7 +74,7 @@ ZAKEN = [
 
 
 @requests_mock.Mocker()
-class ServiceTests(TestCase):
+class ServiceTests(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
@@ -105,7 +129,7 @@ class ServiceTests(TestCase):
 
 
 @requests_mock.Mocker()
-class ServiceGetZakenTest(TestCase):
+class ServiceGetZakenTest(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         Service.objects.create(
@@ -190,3 +214,588 @@ class ServiceGetZakenTest(TestCase):
         zaken_order = [zaak["omschrijving"] for zaak in zaken]
 
         self.assertEqual(zaken_expected_order, zaken_order)
+
+
+OTHER_ZAKEN_ROOT = "https://other.nl/zaken/api/v1/"
+
+
+@requests_mock.Mocker()
+class ServiceFanOutTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Service.objects.create(api_type=APITypes.ztc, api_root=CATALOGI_ROOT)
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+        Service.objects.create(api_type=APITypes.zrc, api_root=OTHER_ZAKEN_ROOT)
+
+    def _set_up_mocks(self, m, other_zaken):
+        mock_service_oas_get(m, CATALOGI_ROOT, "ztc")
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        mock_service_oas_get(m, OTHER_ZAKEN_ROOT, "zrc")
+        m.get(
+            f"{CATALOGI_ROOT}zaaktypen",
+            json=paginated_response([ZAAKTYPE_1, ZAAKTYPE_2]),
+        )
+        m.get(f"{ZAKEN_ROOT}zaken", json=paginated_response(ZAKEN))
+        m.get(f"{OTHER_ZAKEN_ROOT}zaken", **other_zaken)
+
+    def test_zaken_of_all_services_merged(self, m):
+        other_zaken = [
+            {**ZAKEN[0], "url": f"{OTHER_ZAKEN_ROOT}3", "omschrijving": "test3"},
+            {**ZAKEN[1], "url": f"{OTHER_ZAKEN_ROOT}4", "omschrijving": "test4"},
+        ]
+        self._set_up_mocks(m, {"json": paginated_response(other_zaken)})
+
+        zaken = get_zaken(query_params={"sort_by_zaaktype": True})
+
+        self.assertEqual(
+            ["test2", "test4", "test1", "test3"],
+            [zaak["omschrijving"] for zaak in zaken],
+        )
+
+    def test_unavailable_service_left_out(self, m):
+        self._set_up_mocks(m, {"status_code": 500})
+        unavailable_services = []
+
+        zaken = get_zaken(unavailable_services=unavailable_services)
+
+        self.assertEqual(["test1", "test2"], [zaak["omschrijving"] for zaak in zaken])
+        self.assertEqual([OTHER_ZAKEN_ROOT], unavailable_services)
+
+    def test_unavailable_catalogi_api(self, m):
+        self._set_up_mocks(m, {"json": paginated_response([])})
+        m.get(f"{CATALOGI_ROOT}zaaktypen", status_code=500)
+        unavailable_services = []
+
+        zaken = get_zaken(
+            query_params={"sort_by_zaaktype": True},
+            unavailable_services=unavailable_services,
+        )
+
+        self.assertEqual(["test1", "test2"], [zaak["omschrijving"] for zaak in zaken])
+        self.assertEqual(
+            {"url": ZAKEN[0]["zaaktype"], "omschrijving": "", "versiedatum": ""},
+            zaken[0]["zaaktype"],
+        )
+        self.assertEqual([CATALOGI_ROOT], unavailable_services)
+
+    def test_slow_pagination_not_left_out(self, m):
+        def fetch(client):
+            # Slower than a request may take, in total
+            time.sleep(0.2)
+            return [client.base_url]
+
+        unavailable_services = []
+
+        with override_settings(ZGW_SERVICE_TIMEOUT=0.1):
+            results = query_services(APITypes.zrc, fetch, unavailable_services)
+
+        self.assertEqual([[ZAKEN_ROOT], [OTHER_ZAKEN_ROOT]], results)
+        self.assertEqual([], unavailable_services)
+
+    @override_settings(ZGW_SERVICE_QUERY_TIMEOUT=1)
+    def test_slow_service_left_out(self, m):
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def fetch(client):
+            if client.base_url == OTHER_ZAKEN_ROOT:
+                released.wait(timeout=10)
+            return [client.base_url]
+
+        unavailable_services = []
+
+        results = query_services(APITypes.zrc, fetch, unavailable_services)
+
+        self.assertEqual([[ZAKEN_ROOT]], results)
+        self.assertEqual([OTHER_ZAKEN_ROOT], unavailable_services)
+
+
+@override_settings(ZTC_TYPES_CACHE_TIMEOUT=60)
+@requests_mock.Mocker()
+class ServiceTypesCacheTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ztc = Service.objects.create(
+            label="Catalogi API",
+            api_type=APITypes.ztc,
+            api_root=CATALOGI_ROOT,
+            oas="https://oz.nl/catalogi/api/v1/schema/openapi.json",
+        )
+
+    def _set_up_mocks(self, m):
+        mock_service_oas_get(
+            m,
+            CATALOGI_ROOT,
+            "ztc",
+            oas_url=f"{CATALOGI_ROOT}schema/openapi.json",
+        )
+        m.get(
+            url=f"{CATALOGI_ROOT}zaaktypen",
+            json=paginated_response([ZAAKTYPE_1, ZAAKTYPE_2]),
+        )
+
+    def _zaaktypen_requests(self, m):
+        return [
+            request
+            for request in m.request_history
+            if request.url.startswith(f"{CATALOGI_ROOT}zaaktypen")
+        ]
+
+    def test_types_are_cached(self, m):
+        self._set_up_mocks(m)
+
+        zaaktypen = get_zaaktypen()
+        cached_zaaktypen = get_zaaktypen(dict_response=True)
+
+        self.assertEqual(zaaktypen, [ZAAKTYPE_1, ZAAKTYPE_2])
+        self.assertEqual(list(cached_zaaktypen.values()), zaaktypen)
+        self.assertEqual(len(self._zaaktypen_requests(m)), 1)
+        self.assertEqual(get_types_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_cache_invalidated_when_ztc_service_changes(self, m):
+        self._set_up_mocks(m)
+
+        get_zaaktypen()
+
+        self.ztc.label = "Catalogi API (updated)"
+        self.ztc.save()
+
+        get_zaaktypen()
+
+        self.assertEqual(len(self._zaaktypen_requests(m)), 2)
+        self.assertEqual(get_types_cache_stats(), {"hits": 0, "misses": 2})
+
+    @override_settings(ZTC_TYPES_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self, m):
+        self._set_up_mocks(m)
+
+        get_zaaktypen()
+        get_zaaktypen()
+
+        self.assertEqual(len(self._zaaktypen_requests(m)), 2)
+        self.assertEqual(get_types_cache_stats(), {"hits": 0, "misses": 0})
+
+
+@requests_mock.Mocker()
+class MemoizedLookupsTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+        Service.objects.create(api_type=APITypes.ztc, api_root=CATALOGI_ROOT)
+        Service.objects.create(api_type=APITypes.orc, api_root=SELECTIELIJST_ROOT)
+
+    def _set_up_mocks(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        mock_service_oas_get(m, CATALOGI_ROOT, "ztc")
+        mock_service_oas_get(m, SELECTIELIJST_ROOT, "selectielijst")
+
+        self.procestype_url = f"{SELECTIELIJST_ROOT}procestypen/uuid-1"
+        self.resultaattype_url = f"{CATALOGI_ROOT}resultaattypen/uuid-1"
+        m.get(self.procestype_url, json={"url": self.procestype_url, "nummer": 1})
+        m.get(self.resultaattype_url, json={"url": self.resultaattype_url})
+        for uuid in ["uuid-1", "uuid-2"]:
+            m.get(
+                f"{ZAKEN_ROOT}resultaten/{uuid}",
+                json={"resultaattype": self.resultaattype_url},
+            )
+
+    def _count_requests(self, m, url):
+        return len([request for request in m.request_history if request.url == url])
+
+    def test_lookups_are_memoized_within_scope(self, m):
+        self._set_up_mocks(m)
+
+        with memoized_lookups() as lookups:
+            fetch_process_type(self.procestype_url)
+            fetch_process_type(self.procestype_url)
+            fetch_resultaat(f"{ZAKEN_ROOT}resultaten/uuid-1")
+            resultaat = fetch_resultaat(f"{ZAKEN_ROOT}resultaten/uuid-2")
+
+        self.assertEqual(resultaat["resultaattype"], {"url": self.resultaattype_url})
+        self.assertEqual(self._count_requests(m, self.procestype_url), 1)
+        self.assertEqual(self._count_requests(m, self.resultaattype_url), 1)
+        self.assertEqual(lookups.stats, {"remote_calls": 2, "saved_calls": 2})
+
+    def test_lookups_are_not_memoized_outside_scope(self, m):
+        self._set_up_mocks(m)
+
+        with memoized_lookups():
+            fetch_process_type(self.procestype_url)
+
+        fetch_process_type(self.procestype_url)
+        fetch_process_type(self.procestype_url)
+
+        self.assertEqual(self._count_requests(m, self.procestype_url), 3)
+
+    @override_settings(REMOTE_LOOKUP_CACHE_TIMEOUT=60)
+    def test_lookups_are_persisted_between_scopes(self, m):
+        self._set_up_mocks(m)
+
+        with memoized_lookups():
+            fetch_process_type(self.procestype_url)
+
+        with memoized_lookups():
+            process_type = fetch_process_type(self.procestype_url)
+
+        self.assertEqual(process_type["nummer"], 1)
+        self.assertEqual(self._count_requests(m, self.procestype_url), 1)
+
+    @patch(
+        "archiefbeheercomponent.destruction.service._fetch_process_type",
+        side_effect=lambda url: {"url": url},
+    )
+    def test_lookups_are_memoized_in_worker_threads(self, m, m_fetch):
+        with memoized_lookups() as lookups, parallel() as executor:
+            list(executor.map(fetch_process_type, ["procestype-1"] * 4))
+
+        m_fetch.assert_called_once_with("procestype-1")
+        self.assertEqual(lookups.stats, {"remote_calls": 1, "saved_calls": 3})
+
+    @patch(
+        "archiefbeheercomponent.destruction.service._fetch_process_type",
+        side_effect=lambda url: {"url": url},
+    )
+    def test_concurrent_scopes_are_not_shared(self, m, m_fetch):
+        entered = threading.Event()
+        done = threading.Event()
+
+        def other_scope():
+            with memoized_lookups():
+                fetch_process_type("procestype-1")
+                entered.set()
+                done.wait(5)
+
+        thread = threading.Thread(target=other_scope)
+        thread.start()
+        entered.wait(5)
+        try:
+            with memoized_lookups() as lookups:
+                fetch_process_type("procestype-1")
+        finally:
+            done.set()
+            thread.join()
+
+        self.assertEqual(m_fetch.call_count, 2)
+        self.assertEqual(lookups.stats, {"remote_calls": 1, "saved_calls": 0})
+
+
+@requests_mock.Mocker()
+class RemoveZaakTests(ClearCachesMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+        Service.objects.create(api_type=APITypes.drc, api_root=DOCUMENTEN_ROOT)
+
+    def test_remove_zaak_with_documents(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        mock_service_oas_get(m, DOCUMENTEN_ROOT, "drc")
+
+        zaak_url = f"{ZAKEN_ROOT}zaken/uuid-1"
+        document_urls = [
+            f"{DOCUMENTEN_ROOT}enkelvoudiginformatieobjecten/uuid-{i}"
+            for i in range(1, 4)
+        ]
+        m.get(f"{ZAKEN_ROOT}zaken/uuid-1/besluiten", json=[])
+        m.get(
+            f"{ZAKEN_ROOT}zaakinformatieobjecten?zaak={zaak_url}",
+            json=[{"informatieobject": url} for url in document_urls],
+        )
+        m.delete(zaak_url, status_code=204)
+        for i, document_url in enumerate(document_urls, start=1):
+            # The last document is still related to another object
+            m.get(
+                f"{DOCUMENTEN_ROOT}objectinformatieobjecten?informatieobject={document_url}",
+                json=[{"object": "https://other"}] if i == 3 else [],
+            )
+            m.get(document_url, json={"url": document_url, "bestandsomvang": 10 * i})
+            m.delete(document_url, status_code=204)
+
+        timings = {}
+        bytes_deleted = remove_zaak(zaak_url, timings=timings)
+
+        self.assertEqual(bytes_deleted, 30)
+        self.assertEqual(set(timings), {"besluiten", "zaak", "documenten"})
+
+        deleted_urls = {
+            request.url for request in m.request_history if request.method == "DELETE"
+        }
+        self.assertEqual(deleted_urls, {zaak_url, *document_urls[:2]})
+
+
+@override_settings(ZGW_CLIENT_REGISTRY_TIMEOUT=60)
+@requests_mock.Mocker()
+class ClientRegistryTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.zrc = Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+
+    def test_client_is_reused_for_the_service(self, m):
+        registry = ClientRegistry()
+
+        client = registry.get_client_for_url(f"{ZAKEN_ROOT}zaken/1")
+
+        with self.assertNumQueries(0):
+            other_client = registry.get_client_for_url(f"{ZAKEN_ROOT}zaken/2")
+
+        self.assertIs(client, other_client)
+        self.assertIs(client, registry.get_client(self.zrc))
+        self.assertIsNotNone(client.session)
+        self.assertIsNone(client.rate_limiter)
+
+    def test_unknown_url(self, m):
+        registry = ClientRegistry()
+
+        self.assertIsNone(registry.get_client_for_url("https://unknown.nl/api/v1/"))
+        self.assertIsNone(registry.get_client_for_url(None))
+
+    def test_requests_use_the_shared_session(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        m.get(f"{ZAKEN_ROOT}zaken/1", json={"url": f"{ZAKEN_ROOT}zaken/1"})
+        registry = ClientRegistry()
+        client = registry.get_client(self.zrc)
+
+        with patch.object(
+            client.session, "request", wraps=client.session.request
+        ) as mock_request:
+            zaak = client.retrieve("zaak", url=f"{ZAKEN_ROOT}zaken/1")
+
+        self.assertEqual(zaak, {"url": f"{ZAKEN_ROOT}zaken/1"})
+        mock_request.assert_called_once()
+
+    def test_errors_of_the_shared_session(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        m.get(f"{ZAKEN_ROOT}zaken/1", status_code=404, json={"detail": "Not found"})
+        client = ClientRegistry().get_client(self.zrc)
+
+        with self.assertRaises(ClientError) as context:
+            client.retrieve("zaak", url=f"{ZAKEN_ROOT}zaken/1")
+
+        self.assertEqual({"detail": "Not found"}, context.exception.args[0])
+
+    def test_other_clients_not_affected(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        m.get(f"{ZAKEN_ROOT}zaken/1", json={"url": f"{ZAKEN_ROOT}zaken/1"})
+        client = ClientRegistry().get_client(self.zrc)
+        other_client = self.zrc.build_client()
+
+        with patch.object(client.session, "request") as mock_request:
+            zaak = other_client.retrieve("zaak", url=f"{ZAKEN_ROOT}zaken/1")
+
+        self.assertEqual(zaak, {"url": f"{ZAKEN_ROOT}zaken/1"})
+        mock_request.assert_not_called()
+
+    @override_settings(ZGW_CLIENT_REGISTRY_TIMEOUT=0)
+    def test_clients_expire(self, m):
+        registry = ClientRegistry()
+
+        client = registry.get_client(self.zrc)
+
+        self.assertIsNot(client, registry.get_client(self.zrc))
+
+    def test_registry_cleared_when_service_changes(self, m):
+        client = registry.get_client(self.zrc)
+        self.zrc.save()
+
+        self.assertIsNot(client, registry.get_client(self.zrc))
+
+    @override_settings(ZGW_SERVICE_RATE_LIMIT=5)
+    def test_rate_limit(self, m):
+        registry = ClientRegistry()
+
+        client = registry.get_client(self.zrc)
+
+        self.assertEqual(client.rate_limiter.rate, 5)
+
+
+@override_settings(ZGW_RESPONSE_CACHE_TIMEOUT=60)
+@requests_mock.Mocker()
+class ResponseCacheTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+
+    def test_retrieved_resource_revalidated(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        zaak_url = f"{ZAKEN_ROOT}zaken/1"
+        m.get(
+            zaak_url,
+            [
+                {"json": {"url": zaak_url}, "headers": {"ETag": '"v1"'}},
+                {"status_code": 304, "headers": {"ETag": '"v1"'}},
+            ],
+        )
+
+        first_zaak = fetch_zaak(zaak_url)
+        zaak = fetch_zaak(zaak_url)
+
+        self.assertEqual({"url": zaak_url}, first_zaak)
+        self.assertEqual({"url": zaak_url}, zaak)
+        self.assertNotIn("If-None-Match", m.request_history[-2].headers)
+        self.assertEqual('"v1"', m.last_request.headers["If-None-Match"])
+        self.assertEqual(
+            {"not_modified": 1, "modified": 0, "misses": 1, "not_cached": 0},
+            get_response_cache_stats(),
+        )
+
+    def test_modified_resource_replaced(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        zaak_url = f"{ZAKEN_ROOT}zaken/1"
+        m.get(
+            zaak_url,
+            [
+                {"json": {"omschrijving": "v1"}, "headers": {"ETag": '"v1"'}},
+                {"json": {"omschrijving": "v2"}, "headers": {"ETag": '"v2"'}},
+                {"status_code": 304},
+            ],
+        )
+
+        fetch_zaak(zaak_url)
+        fetch_zaak(zaak_url)
+        zaak = fetch_zaak(zaak_url)
+
+        self.assertEqual({"omschrijving": "v2"}, zaak)
+        self.assertEqual('"v2"', m.last_request.headers["If-None-Match"])
+        self.assertEqual(1, get_response_cache_stats()["modified"])
+
+    @override_settings(ZGW_RESPONSE_CACHE_MAX_SIZE=10)
+    def test_large_resource_not_cached(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        zaak_url = f"{ZAKEN_ROOT}zaken/1"
+        m.get(zaak_url, json={"url": zaak_url}, headers={"ETag": '"v1"'})
+
+        fetch_zaak(zaak_url)
+        fetch_zaak(zaak_url)
+
+        self.assertNotIn("If-None-Match", m.last_request.headers)
+        self.assertEqual(2, get_response_cache_stats()["not_cached"])
+
+    def test_lists_not_cached(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        m.get(
+            f"{ZAKEN_ROOT}zaken",
+            json=paginated_response(ZAKEN),
+            headers={"ETag": '"v1"'},
+        )
+
+        client = registry.get_client_for_url(ZAKEN_ROOT)
+        client.list("zaak")
+        client.list("zaak")
+
+        self.assertNotIn("If-None-Match", m.last_request.headers)
+
+
+class TokenBucketTests(ClearCachesMixin, TestCase):
+    @patch("archiefbeheercomponent.destruction.client.time")
+    def test_acquire_waits_for_token(self, mock_time):
+        clock = [0.0]
+        mock_time.monotonic.side_effect = lambda: clock[0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        mock_time.sleep.side_effect = sleep
+        bucket = TokenBucket(rate=2)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertEqual(clock[0], 1.0)
+
+
+def get_zrc_schema_with_expand() -> bytes:
+    schema = yaml.safe_load(read_schema("zrc"))
+    schema["paths"]["/zaken/{uuid}"]["get"]["parameters"] += [
+        {"name": "expand", "in": "query", "schema": {"type": "string"}},
+        {"name": "fields", "in": "query", "schema": {"type": "string"}},
+    ]
+    return yaml.safe_dump(schema).encode("utf-8")
+
+
+@requests_mock.Mocker()
+class FetchZaakWithResultaatTests(ClearCachesMixin, TestCase):
+    # The OAS schemas are cached by URL, so the Zaken API supporting expand has
+    # another root
+    EXPAND_ZAKEN_ROOT = "https://expand.nl/zaken/api/v1/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        Service.objects.create(api_type=APITypes.zrc, api_root=ZAKEN_ROOT)
+        Service.objects.create(api_type=APITypes.zrc, api_root=cls.EXPAND_ZAKEN_ROOT)
+        Service.objects.create(api_type=APITypes.ztc, api_root=CATALOGI_ROOT)
+
+    def test_zaak_and_resultaat_retrieved_at_once(self, m):
+        m.get(
+            f"{self.EXPAND_ZAKEN_ROOT}schema/openapi.yaml?v=3",
+            content=get_zrc_schema_with_expand(),
+        )
+        zaak_url = f"{self.EXPAND_ZAKEN_ROOT}zaken/uuid-1"
+        resultaat_url = f"{self.EXPAND_ZAKEN_ROOT}resultaten/uuid-1"
+        resultaattype = {"url": f"{CATALOGI_ROOT}resultaattypen/uuid-1"}
+        m.get(
+            zaak_url,
+            json={
+                "url": zaak_url,
+                "resultaat": resultaat_url,
+                "_expand": {
+                    "resultaat": {
+                        "url": resultaat_url,
+                        "resultaattype": resultaattype["url"],
+                        "_expand": {"resultaattype": resultaattype},
+                    }
+                },
+            },
+        )
+
+        zaak = fetch_zaak_with_resultaat(zaak_url, fields=["url", "identificatie"])
+
+        self.assertEqual(
+            {
+                "url": zaak_url,
+                "resultaat": {"url": resultaat_url, "resultaattype": resultaattype},
+            },
+            zaak,
+        )
+        self.assertEqual(zaak_url, m.last_request.url.split("?")[0])
+        self.assertEqual(
+            {
+                "expand": ["resultaat,resultaat.resultaattype"],
+                "fields": ["url,identificatie,resultaat"],
+            },
+            m.last_request.qs,
+        )
+        self.assertEqual(
+            [zaak_url],
+            [
+                request.url.split("?")[0]
+                for request in m.request_history
+                if "openapi.yaml" not in request.url
+            ],
+        )
+
+    def test_expand_not_supported(self, m):
+        mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+        mock_service_oas_get(m, CATALOGI_ROOT, "ztc")
+        zaak_url = f"{ZAKEN_ROOT}zaken/uuid-1"
+        resultaat_url = f"{ZAKEN_ROOT}resultaten/uuid-1"
+        resultaattype = {"url": f"{CATALOGI_ROOT}resultaattypen/uuid-1"}
+        m.get(zaak_url, json={"url": zaak_url, "resultaat": resultaat_url})
+        m.get(
+            resultaat_url,
+            json={"url": resultaat_url, "resultaattype": resultaattype["url"]},
+        )
+        m.get(resultaattype["url"], json=resultaattype)
+
+        zaak = fetch_zaak_with_resultaat(zaak_url, fields=["url", "identificatie"])
+
+        self.assertEqual(resultaattype, zaak["resultaat"]["resultaattype"])
+        zaak_request = next(
+            request for request in m.request_history if request.url == zaak_url
+        )
+        self.assertEqual({}, zaak_request.qs)
@@ -8,6 +8,7 @@ from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+import requests
 import requests_mock
 from freezegun import freeze_time
 from furl import furl
@@ -24,9 +25,10 @@ from archiefbeheercomponent.emails.tests.factories import AutomaticEmailFactory
 from archiefbeheercomponent.notifications.models import Notification
 from archiefbeheercomponent.report.constants import ReportTypeChoices
 from archiefbeheercomponent.report.models import DestructionReport
+from archiefbeheercomponent.report.rendering import RenderError
 
 from ...constants import RoleTypeChoices
-from ...tests.utils import mock_service_oas_get
+from ...tests.utils import ClearCachesMixin, mock_service_oas_get
 from ..constants import ListItemStatus, ListStatus, ReviewStatus
 from ..models import ArchiveConfig, DestructionList, DestructionListItem
 from ..tasks import (
@@ -34,6 +36,8 @@ from ..tasks import (
     complete_and_notify,
     process_destruction_list,
     process_list_item,
+    process_list_items,
+    render_destruction_report,
     update_zaak_from_list_item,
     update_zaken,
 )
@@ -46,13 +50,14 @@ from .factories import (
 )
 
 
+@patch("archiefbeheercomponent.destruction.tasks.render_destruction_report")
 @patch("archiefbeheercomponent.destruction.tasks.chain")
 @patch("archiefbeheercomponent.destruction.tasks.create_destruction_zaak")
 @patch("archiefbeheercomponent.destruction.tasks.complete_and_notify")
 @patch("archiefbeheercomponent.destruction.tasks.process_list_item")
-class ProcessListTests(TestCase):
+class ProcessListTests(ClearCachesMixin, TestCase):
     def test_process_list_without_zaak_creation(
-        self, mock_task_item, mock_notify, mock_zaak, mock_chain
+        self, mock_task_item, mock_notify, mock_zaak, mock_chain, mock_render
     ):
         destruction_list = DestructionListFactory.create()
         list_items = DestructionListItemFactory.create_batch(
@@ -70,11 +75,12 @@ class ProcessListTests(TestCase):
         mock_chain.assert_called_once_with(
             mock_task_item.chunks(list_items_ids, settings.ZAKEN_PER_TASK).group(),
             mock_notify.si(destruction_list.id),
+            mock_render.si(destruction_list.id),
         )
         self.assertEqual(1, mock_chain.call_count)
 
     def test_process_list_with_zaak_creation(
-        self, mock_task_item, mock_notify, mock_zaak, mock_chain
+        self, mock_task_item, mock_notify, mock_zaak, mock_chain, mock_render
     ):
         destruction_list = DestructionListFactory.create()
         list_items = DestructionListItemFactory.create_batch(
@@ -101,6 +107,7 @@ class ProcessListTests(TestCase):
         mock_chain.assert_any_call(
             mock_task_item.chunks(list_items_ids, settings.ZAKEN_PER_TASK).group(),
             mock_notify.si(destruction_list.id),
+            mock_render.si(destruction_list.id),
         )
         mock_chain.assert_any_call(
             first_chain_part,
@@ -109,7 +116,7 @@ class ProcessListTests(TestCase):
         self.assertEqual(2, mock_chain.call_count)
 
     def test_process_list_with_removed_items(
-        self, mock_task_item, mock_notify, mock_zaak, mock_chain
+        self, mock_task_item, mock_notify, mock_zaak, mock_chain, mock_render
     ):
         destruction_list = DestructionListFactory.create()
         list_item_1, list_item_2 = DestructionListItemFactory.create_batch(
@@ -129,10 +136,44 @@ class ProcessListTests(TestCase):
         mock_chain.assert_called_once_with(
             mock_task_item.chunks(list_items_ids, settings.ZAKEN_PER_TASK).group(),
             mock_notify.si(destruction_list.id),
+            mock_render.si(destruction_list.id),
         )
 
+    @override_settings(DESTRUCTION_BATCH_SIZE=2)
+    @patch("archiefbeheercomponent.destruction.tasks.group")
+    @patch("archiefbeheercomponent.destruction.tasks.process_list_items")
+    def test_process_list_in_batches(
+        self,
+        mock_task_items,
+        mock_group,
+        mock_task_item,
+        mock_notify,
+        mock_zaak,
+        mock_chain,
+        mock_render,
+    ):
+        destruction_list = DestructionListFactory.create()
+        list_items = DestructionListItemFactory.create_batch(
+            5, destruction_list=destruction_list
+        )
+
+        process_destruction_list(destruction_list.id)
+
+        ids = [list_item.id for list_item in list_items]
+        mock_group.assert_called_once()
+        list(mock_group.call_args.args[0])  # consume the generator of batch tasks
 
-class ProcessListItemTests(TestCase):
+        batches = [call.args[0] for call in mock_task_items.si.call_args_list]
+        self.assertEqual(batches, [ids[0:2], ids[2:4], ids[4:]])
+        mock_task_item.chunks.assert_not_called()
+        mock_chain.assert_called_once_with(
+            mock_group.return_value,
+            mock_notify.si(destruction_list.id),
+            mock_render.si(destruction_list.id),
+        )
+
+
+class ProcessListItemTests(ClearCachesMixin, TestCase):
     @patch("archiefbeheercomponent.destruction.tasks.remove_zaak", return_value=10)
     @patch(
         "archiefbeheercomponent.destruction.tasks.fetch_zaak",
@@ -314,9 +355,219 @@ class ProcessListItemTests(TestCase):
 
         mock_remove_zaken.assert_not_called()
 
+    @patch("archiefbeheercomponent.report.utils.fetch_process_type")
+    @patch("archiefbeheercomponent.report.utils.fetch_zaaktype")
+    @patch(
+        "archiefbeheercomponent.report.utils.get_zaaktypen",
+        return_value={
+            "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1": {
+                "omschrijving": "Een zaaktype",
+                "selectielijstProcestype": "https://selectielijst.nl/procestypen/uuid-1",
+            }
+        },
+    )
+    @patch("archiefbeheercomponent.destruction.tasks.remove_zaak", return_value=0)
+    @patch(
+        "archiefbeheercomponent.destruction.tasks.fetch_zaak",
+        return_value={
+            "identificatie": "foobar",
+            "startdatum": "2020-01-01",
+            "zaaktype": "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1",
+            "resultaat": None,
+            "verantwoordelijkeOrganisatie": "Some organisation",
+        },
+    )
+    def test_report_data_resolved_from_cached_types(
+        self,
+        mock_fetch_zaak,
+        mock_remove_zaak,
+        mock_get_zaaktypen,
+        mock_fetch_zaaktype,
+        mock_fetch_process_type,
+    ):
+        list_item = DestructionListItemFactory.create()
+
+        process_list_item(list_item.id)
+
+        list_item = DestructionListItem.objects.get(id=list_item.id)
+        self.assertEqual(
+            "Een zaaktype", list_item.extra_zaak_data["zaaktype_omschrijving"]
+        )
+        # The destruction category is resolved once per procestype for the report
+        self.assertNotIn("vernietigings_categorie", list_item.extra_zaak_data)
+        mock_fetch_zaaktype.assert_not_called()
+        mock_fetch_process_type.assert_not_called()
+
+
+class ProcessListItemsTests(ClearCachesMixin, TestCase):
+    @staticmethod
+    def _fetch_zaak(url):
+        return {
+            "url": url,
+            "identificatie": url.split("/")[-1],
+            "omschrijving": "Een zaak",
+            "startdatum": "2020-01-01",
+            "zaaktype": "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1",
+            "resultaat": None,
+            "verantwoordelijkeOrganisatie": "Some organisation",
+        }
+
+    @staticmethod
+    def _remove_zaak(url, timings=None):
+        if url.endswith("zaak-2"):
+            raise ClientError("something went wrong")
+        return 10
+
+    @patch("archiefbeheercomponent.destruction.tasks.remove_zaak")
+    @patch("archiefbeheercomponent.destruction.tasks.fetch_zaak")
+    def test_process_list_items(self, mock_fetch_zaak, mock_remove_zaak):
+        mock_fetch_zaak.side_effect = self._fetch_zaak
+        mock_remove_zaak.side_effect = self._remove_zaak
+        destruction_list = DestructionListFactory.create()
+        list_item_1, list_item_2, list_item_3 = [
+            DestructionListItemFactory.create(
+                destruction_list=destruction_list,
+                zaak=f"https://oz.nl/zaken/api/v1/zaken/zaak-{i}",
+            )
+            for i in range(1, 4)
+        ]
+
+        stats = process_list_items([list_item_1.id, list_item_2.id, list_item_3.id])
+
+        self.assertEqual(stats["processed"], 3)
+        self.assertEqual(stats["destroyed"], 2)
+        self.assertEqual(stats["failed"], 1)
+        self.assertIn("zaken_per_second", stats)
+
+        # can't use refresh_from_db() because of django-fsm
+        statuses = dict(DestructionListItem.objects.values_list("id", "status"))
+        self.assertEqual(statuses[list_item_1.id], ListItemStatus.destroyed)
+        self.assertEqual(statuses[list_item_2.id], ListItemStatus.failed)
+        self.assertEqual(statuses[list_item_3.id], ListItemStatus.destroyed)
+
+        list_item_1 = DestructionListItem.objects.get(id=list_item_1.id)
+        self.assertEqual(list_item_1.extra_zaak_data["identificatie"], "zaak-1")
+        self.assertEqual(list_item_1.extra_zaak_data["bytes_removed_documents"], 10)
+
+        logs = TimelineLog.objects.order_by("object_id")
+        self.assertEqual(logs.count(), 3)
+        failed_log = TimelineLog.objects.get(object_id=str(list_item_2.id))
+        self.assertEqual(
+            failed_log.template, "destruction/logs/item_destruction_failed.html"
+        )
+        self.assertEqual(failed_log.extra_data["zaak"], "zaak-2")
+        self.assertIn("something went wrong", failed_log.extra_data["error"])
+
+    @patch("archiefbeheercomponent.destruction.tasks.remove_zaak")
+    @patch("archiefbeheercomponent.destruction.tasks.fetch_zaak")
+    def test_unexpected_errors_fail_the_list_item(
+        self, mock_fetch_zaak, mock_remove_zaak
+    ):
+        def fetch_zaak(url):
+            if url.endswith("zaak-1"):
+                raise requests.ConnectionError("connection refused")
+            return self._fetch_zaak(url)
+
+        def remove_zaak(url, timings=None):
+            if url.endswith("zaak-2"):
+                raise requests.Timeout("read timed out")
+            return 10
+
+        mock_fetch_zaak.side_effect = fetch_zaak
+        mock_remove_zaak.side_effect = remove_zaak
+        destruction_list = DestructionListFactory.create()
+        list_items = [
+            DestructionListItemFactory.create(
+                destruction_list=destruction_list,
+                zaak=f"https://oz.nl/zaken/api/v1/zaken/zaak-{i}",
+            )
+            for i in range(1, 4)
+        ]
+
+        stats = process_list_items([list_item.id for list_item in list_items])
+
+        self.assertEqual(stats["destroyed"], 1)
+        self.assertEqual(stats["failed"], 2)
+        statuses = dict(DestructionListItem.objects.values_list("id", "status"))
+        self.assertEqual(
+            [
+                ListItemStatus.failed,
+                ListItemStatus.failed,
+                ListItemStatus.destroyed,
+            ],
+            [statuses[list_item.id] for list_item in list_items],
+        )
+        self.assertEqual(TimelineLog.objects.count(), 3)
+
+    @patch(
+        "archiefbeheercomponent.report.utils.fetch_process_type",
+        return_value={"nummer": 1},
+    )
+    @patch(
+        "archiefbeheercomponent.report.utils.fetch_zaaktype",
+        return_value={
+            "omschrijving": "Een zaaktype",
+            "selectielijstProcestype": "https://selectielijst.nl/procestypen/uuid-1",
+        },
+    )
+    @patch("archiefbeheercomponent.destruction.tasks.remove_zaak", return_value=0)
+    @patch("archiefbeheercomponent.destruction.tasks.fetch_zaak")
+    def test_report_data_resolved(
+        self, mock_fetch_zaak, mock_remove_zaak, mock_zaaktype, mock_process_type
+    ):
+        mock_fetch_zaak.side_effect = self._fetch_zaak
+        list_item = DestructionListItemFactory.create()
+
+        process_list_items([list_item.id])
+
+        list_item = DestructionListItem.objects.get(id=list_item.id)
+        self.assertEqual(
+            "Een zaaktype", list_item.extra_zaak_data["zaaktype_omschrijving"]
+        )
+        self.assertEqual("1", list_item.extra_zaak_data["vernietigings_categorie"])
+        mock_zaaktype.assert_called_once_with(
+            "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1"
+        )
+
+    @patch(
+        "archiefbeheercomponent.destruction.tasks.get_zaaktype_report_data",
+        side_effect=requests.ConnectionError("connection refused"),
+    )
+    @patch("archiefbeheercomponent.destruction.tasks.remove_zaak", return_value=0)
+    @patch("archiefbeheercomponent.destruction.tasks.fetch_zaak")
+    def test_report_data_failure_does_not_fail_the_list_item(
+        self, mock_fetch_zaak, mock_remove_zaak, mock_report_data
+    ):
+        mock_fetch_zaak.side_effect = self._fetch_zaak
+        list_item = DestructionListItemFactory.create()
+
+        process_list_items([list_item.id])
+
+        list_item = DestructionListItem.objects.get(id=list_item.id)
+        self.assertEqual(list_item.status, ListItemStatus.destroyed)
+        mock_remove_zaak.assert_called_once()
+        # The report data is resolved again when the report is created
+        self.assertNotIn("zaaktype_omschrijving", list_item.extra_zaak_data)
+
+    @patch("archiefbeheercomponent.destruction.tasks.remove_zaak", return_value=0)
+    @patch("archiefbeheercomponent.destruction.tasks.fetch_zaak")
+    def test_already_processed_items_are_skipped(
+        self, mock_fetch_zaak, mock_remove_zaak
+    ):
+        mock_fetch_zaak.side_effect = self._fetch_zaak
+        list_item = DestructionListItemFactory.create()
+        list_item.remove()
+        list_item.save()
+
+        stats = process_list_items([list_item.id])
+
+        self.assertEqual(stats["processed"], 0)
+        mock_fetch_zaak.assert_not_called()
+        self.assertFalse(TimelineLog.objects.exists())
+
 
 @freeze_time("2021-11-16 12:00")
-class ReviewersReminderEmailsTests(TestCase):
+class ReviewersReminderEmailsTests(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
@@ -450,7 +701,7 @@ class ReviewersReminderEmailsTests(TestCase):
 @requests_mock.Mocker()
 @temp_private_root()
 @override_settings(LANGUAGE_CODE="en")
-class NotifyTests(TestCase):
+class NotifyTests(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         super().setUpTestData()
@@ -481,6 +732,56 @@ class NotifyTests(TestCase):
             notification.message, _("Processing of the destruction list is complete.")
         )
 
+    def test_report_rendered_separately(self, m):
+        process_owner = UserFactory.create(role__type=RoleTypeChoices.process_owner)
+        destruction_list = DestructionListFactory.create()
+        DestructionListReviewFactory.create(
+            author=process_owner,
+            status=ReviewStatus.approved,
+            destruction_list=destruction_list,
+        )
+        destruction_list.process()
+        destruction_list.save()
+
+        complete_and_notify(destruction_list.id)
+
+        report = DestructionReport.objects.get()
+        self.assertFalse(report.content_pdf)
+        self.assertTrue(report.content_csv)
+        # The process owner is notified once the PDF is rendered
+        self.assertFalse(Notification.objects.filter(user=process_owner).exists())
+
+        render_destruction_report(destruction_list.id)
+
+        report.refresh_from_db()
+        self.assertTrue(report.content_pdf)
+        self.assertIsNotNone(report.render_duration)
+        self.assertGreater(report.render_peak_memory, 0)
+        self.assertEqual(1, Notification.objects.filter(user=process_owner).count())
+
+    @patch(
+        "archiefbeheercomponent.destruction.tasks.render_destruction_report_pdf",
+        side_effect=RenderError("The time limit was exceeded"),
+    )
+    def test_notified_when_report_rendering_fails(self, m, m_render_pdf):
+        process_owner = UserFactory.create(role__type=RoleTypeChoices.process_owner)
+        destruction_list = DestructionListFactory.create()
+        DestructionListReviewFactory.create(
+            author=process_owner,
+            status=ReviewStatus.approved,
+            destruction_list=destruction_list,
+        )
+        destruction_list.process()
+        destruction_list.save()
+        complete_and_notify(destruction_list.id)
+
+        with self.assertRaises(RenderError):
+            render_destruction_report(destruction_list.id)
+
+        m_render_pdf.assert_called_once()
+        self.assertTrue(Notification.objects.filter(user=process_owner).exists())
+        self.assertTrue(DestructionReport.objects.get().content_csv)
+
     def test_complete_and_notify_process_owner(self, m):
         process_owner = UserFactory.create(
             role__type=RoleTypeChoices.process_owner,
@@ -500,6 +801,7 @@ class NotifyTests(TestCase):
         destruction_list.save()
 
         complete_and_notify(destruction_list.id)
+        render_destruction_report(destruction_list.id)
 
         notifications = Notification.objects.all()
 
@@ -629,6 +931,7 @@ class NotifyTests(TestCase):
         )
 
         complete_and_notify(destruction_list.id)
+        render_destruction_report(destruction_list.id)
 
         self.assertEqual(1, len(mail.outbox))
 
@@ -654,6 +957,7 @@ class NotifyTests(TestCase):
         )
 
         complete_and_notify(destruction_list.id)
+        render_destruction_report(destruction_list.id)
 
         self.assertEqual(0, len(mail.outbox))
 
@@ -717,12 +1021,13 @@ class NotifyTests(TestCase):
         )
 
         complete_and_notify(destruction_list.id)
+        render_destruction_report(destruction_list.id)
 
         self.assertEqual(0, len(mail.outbox))
 
 
 @patch("archiefbeheercomponent.destruction.tasks.update_zaak_from_list_item.chunks")
-class UpdateZakenTests(TestCase):
+class UpdateZakenTests(ClearCachesMixin, TestCase):
     def test_update_zaken(self, mock_update_zaak):
         destruction_list = DestructionListFactory.create()
         list_items = DestructionListItemFactory.create_batch(
@@ -739,7 +1044,7 @@ class UpdateZakenTests(TestCase):
         mock_update_zaak.assert_called_once_with(data, settings.ZAKEN_PER_TASK)
 
 
-class UpdateZaakTests(TestCase):
+class UpdateZaakTests(ClearCachesMixin, TestCase):
     @patch(
         "archiefbeheercomponent.destruction.tasks.update_zaak",
         return_value={"identificatie": "foobar"},
@@ -8,11 +8,12 @@ from furl import furl
 from zds_client.client import ClientError
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from ..constants import Archiefnominatie, Archiefstatus
 
 
-class UpdateZaakArchiveDetailsTests(WebTest):
+class UpdateZaakArchiveDetailsTests(ClearCachesMixin, WebTest):
     def test_cant_access_without_can_start_destruction(self):
         user = UserFactory(role__can_start_destruction=False)
         self.client.force_login(user)
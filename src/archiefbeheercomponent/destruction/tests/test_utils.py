@@ -3,7 +3,16 @@ from unittest.mock import patch
 
 from django.test import TestCase, override_settings
 
-from archiefbeheercomponent.destruction.utils import get_additional_zaak_info
+from archiefbeheercomponent.destruction.constants import ListItemStatus
+from archiefbeheercomponent.destruction.tests.factories import (
+    DestructionListFactory,
+    DestructionListItemFactory,
+)
+from archiefbeheercomponent.destruction.utils import (
+    get_additional_zaak_info,
+    set_zaken_availability,
+)
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 ZAKEN_ROOT = "https://oz.nl/zaken/api/v1/"
 CATALOGI_ROOT = "https://oz.nl/catalogi/api/v1/"
@@ -48,8 +57,10 @@ SELECTIELIJST = {
     return_value=copy.deepcopy(RESULTAAT),
 )
 @override_settings(LANGUAGE_CODE="en")
-class GetAdditionalZaakInfoTests(TestCase):
+class GetAdditionalZaakInfoTests(ClearCachesMixin, TestCase):
     def setUp(self) -> None:
+        super().setUp()
+
         self.zaak_1 = {
             "url": f"{ZAKEN_ROOT}zaken/uuid-1",
             "identificatie": "ZAAK-001",
@@ -124,3 +135,34 @@ class GetAdditionalZaakInfoTests(TestCase):
 
         self.assertEqual(RESULTAAT, additional_zaak_data["resultaat"])
         m_fetch_resultaat.assert_called_once()
+
+
+class SetZakenAvailabilityTests(ClearCachesMixin, TestCase):
+    @override_settings(ZAKEN_PER_QUERY=2)
+    def test_reserved_zaken_not_available(self):
+        destruction_list = DestructionListFactory.create()
+        for status in ListItemStatus.values:
+            DestructionListItemFactory.create(
+                destruction_list=destruction_list,
+                zaak=f"https://oz.nl/zaken/{status}",
+                status=status,
+            )
+        zaken = [
+            {"url": f"https://oz.nl/zaken/{status}"} for status in ListItemStatus.values
+        ] + [{"url": "https://oz.nl/zaken/new"}]
+
+        # The URLs are checked in chunks of ZAKEN_PER_QUERY
+        with self.assertNumQueries(3):
+            set_zaken_availability(zaken)
+
+        self.assertEqual(
+            {
+                "https://oz.nl/zaken/suggested": False,
+                "https://oz.nl/zaken/removed": True,
+                "https://oz.nl/zaken/processing": False,
+                "https://oz.nl/zaken/destroyed": True,
+                "https://oz.nl/zaken/failed": True,
+                "https://oz.nl/zaken/new": True,
+            },
+            {zaak["url"]: zaak["available"] for zaak in zaken},
+        )
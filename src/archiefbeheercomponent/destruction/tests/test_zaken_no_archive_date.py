@@ -4,9 +4,10 @@ from django.test import TestCase
 from django.urls import reverse
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class ZakenWithoutArchiveDateViewTests(TestCase):
+class ZakenWithoutArchiveDateViewTests(ClearCachesMixin, TestCase):
     def test_cant_access_without_can_start_destruction(self):
         user = UserFactory(role__can_start_destruction=False)
         self.client.force_login(user)
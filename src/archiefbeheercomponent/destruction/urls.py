@@ -1,9 +1,17 @@
 from django.urls import include, path
 
-from .api import FetchListItemsView, FetchZaakDetail, FetchZakenView
+from .api import (
+    FetchListItemsView,
+    FetchZaakDetail,
+    FetchZakenDetailView,
+    FetchZakenView,
+    ZakenNotificationView,
+)
 from .views.export import (
     DownloadAdditionalReviewersDocumentsView,
+    DownloadZakenExportView,
     ExportZakenWithoutArchiveDateView,
+    ZakenExportStatusView,
 )
 from .views.record_manager import (
     DestructionListCreateView,
@@ -48,6 +56,16 @@ urlpatterns = [
         ExportZakenWithoutArchiveDateView.as_view(),
         name="export-zaken-without-archive-date",
     ),
+    path(
+        "lijsten/export-zaken-zonder-archiedactiedatum/<int:pk>/",
+        ZakenExportStatusView.as_view(),
+        name="zaken-export-status",
+    ),
+    path(
+        "lijsten/export-zaken-zonder-archiedactiedatum/<int:pk>/download",
+        DownloadZakenExportView.as_view(),
+        name="zaken-export-download",
+    ),
     path(
         "lijsten/<int:pk>/reviewers-documenten",
         DownloadAdditionalReviewersDocumentsView.as_view(),
@@ -79,6 +97,16 @@ urlpatterns = [
                     FetchZaakDetail.as_view(),
                     name="fetch-zaak-detail",
                 ),
+                path(
+                    "fetch-zaken-detail",
+                    FetchZakenDetailView.as_view(),
+                    name="fetch-zaken-detail",
+                ),
+                path(
+                    "zaken-notifications",
+                    ZakenNotificationView.as_view(),
+                    name="zaken-notifications",
+                ),
             ]
         ),
     ),
@@ -2,18 +2,18 @@ import logging
 import os
 import re
 from base64 import b64encode
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
 from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import ugettext as _
 
+import xlsxwriter
 from zds_client import ClientError
 
 from archiefbeheercomponent.notifications.models import Notification
 from archiefbeheercomponent.report.utils import get_looptijd
 
-from .constants import ListItemStatus
 from .models import (
     BRONORGANISATIE_TEMPLATE_ELEMENT,
     IDENTIFICATIE_TEMPLATE_ELEMENT,
@@ -51,8 +51,8 @@ def get_additional_zaak_info(zaak: dict) -> dict:
             }
             zaak["zaaktype"]["processtype"] = process_type_data
 
-    # Retrieve resultaat
-    if zaak.get("resultaat"):
+    # Retrieve resultaat, unless it was retrieved together with the zaak
+    if isinstance(zaak.get("resultaat"), str):
         zaak["resultaat"] = fetch_resultaat(zaak["resultaat"])
 
     return zaak
@@ -89,19 +89,17 @@ def get_zaken_chunks(zaken):
 
 def set_zaken_availability(zaken):
     """check if selected zaken are used in other DLs"""
-    zaak_urls = [zaak["url"] for zaak in zaken]
-    selected_zaken = []
+    zaak_urls = list({zaak["url"] for zaak in zaken})
+    reserved_zaken = set()
     for chunk in get_zaken_chunks(zaak_urls):
-        selected_zaken += list(
-            DestructionListItem.objects.filter(
-                status__in=[ListItemStatus.suggested, ListItemStatus.processing]
-            )
+        reserved_zaken.update(
+            DestructionListItem.objects.reserved()
             .filter(zaak__in=chunk)
             .values_list("zaak", flat=True)
         )
 
     for zaak in zaken:
-        zaak["available"] = zaak["url"] not in selected_zaken
+        zaak["available"] = zaak["url"] not in reserved_zaken
 
 
 def format_zaak_record(zaak, user):
@@ -132,6 +130,44 @@ def format_zaak_record(zaak, user):
     ]
 
 
+def write_zaken_export(path: str, zaken: Iterable[dict], user) -> None:
+    """
+    Write the spreadsheet with the zaken (without archive date) to ``path``.
+
+    The workbook is written in constant memory mode, so only the current row is kept
+    in memory and the zaken can be a generator.
+    """
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet(name=_("Cases without archive date"))
+
+    # Header
+    worksheet.write_row(
+        0,
+        0,
+        [
+            _("Case identification"),
+            _("Case type"),
+            _("Case description"),
+            _("Duration"),
+            _("Organisation responsible"),
+            _("Result type"),
+            _("Retention period"),
+            _("Destruction category selection list"),
+            _("Relations"),
+            _("Requesting user"),
+        ],
+    )
+
+    for row_count, zaak in enumerate(zaken):
+        worksheet.write_row(
+            row_count + 1,
+            0,
+            format_zaak_record(zaak, user),
+        )
+
+    workbook.close()
+
+
 class ServiceNotConfiguredError(Exception):
     pass
 
@@ -1,36 +1,47 @@
-import io
 import os
-import zipfile
-from typing import List
-from uuid import uuid4
-from wsgiref.util import FileWrapper
 
-from django.contrib.auth.mixins import UserPassesTestMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models import Q
 from django.http import (
     Http404,
-    HttpResponse,
     HttpResponseBadRequest,
+    JsonResponse,
     StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils.translation import gettext as _
 from django.views import View
 from django.views.generic import DetailView
 
-import xlsxwriter
-from zgw_consumers.concurrent import parallel
+from django_sendfile import sendfile
 
-from archiefbeheercomponent.accounts.models import User
 from archiefbeheercomponent.constants import RoleTypeChoices
+from archiefbeheercomponent.utils.streaming import iter_zip_content
 
+from ..constants import ExportStatus
 from ..forms import ZakenUrlsForm
-from ..models import ArchiveConfig, DestructionList
-from ..service import fetch_zaken
-from ..utils import format_zaak_record, get_additional_zaak_info
+from ..models import ArchiveConfig, DestructionList, ZakenExport
+from ..tasks import export_zaken
+
+
+def get_export_status(export: ZakenExport) -> dict:
+    return {
+        "status": export.status,
+        "statusUrl": reverse("destruction:zaken-export-status", args=[export.pk]),
+        "downloadUrl": (
+            reverse("destruction:zaken-export-download", args=[export.pk])
+            if export.status == ExportStatus.completed
+            else None
+        ),
+    }
 
 
 class ExportZakenWithoutArchiveDateView(UserPassesTestMixin, View):
+    """
+    Start the export of the selected zaken, which is created in the background.
+    """
+
     form_class = ZakenUrlsForm
 
     def test_func(self):
@@ -46,62 +57,43 @@ class ExportZakenWithoutArchiveDateView(UserPassesTestMixin, View):
 
         return False
 
-    def get(self, request, *args, **kwargs):
-        form = self.form_class(request.GET)
+    def post(self, request, *args, **kwargs):
+        form = self.form_class(request.POST)
         if not form.is_valid():
             return HttpResponseBadRequest(_("Invalid cases URLs"))
 
-        zaken_urls = form.cleaned_data["zaken_urls"]
-        data = self.get_data(zaken_urls, request.user)
-
-        response = HttpResponse(
-            data,
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        export = ZakenExport.objects.create(
+            user=request.user, zaken_urls=form.cleaned_data["zaken_urls"]
         )
-        filename = f"zaken-lijst-{uuid4()}.xlsx"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-        return response
+        export_zaken.delay(export.id)
 
-    def get_data(self, zaken_urls: List[str], user: User):
-        zaken = fetch_zaken(zaken_urls)
-
-        with parallel() as executor:
-            zaken_with_extra_info = list(executor.map(get_additional_zaak_info, zaken))
-
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
-        worksheet = workbook.add_worksheet(name=_("Cases without archive date"))
-
-        # Header
-        worksheet.write_row(
-            0,
-            0,
-            [
-                _("Case identification"),
-                _("Case type"),
-                _("Case description"),
-                _("Duration"),
-                _("Organisation responsible"),
-                _("Result type"),
-                _("Retention period"),
-                _("Destruction category selection list"),
-                _("Relations"),
-                _("Requesting user"),
-            ],
+        return JsonResponse(
+            get_export_status(export),
+            status=202,
         )
 
-        for row_count, zaak in enumerate(zaken_with_extra_info):
-            worksheet.write_row(
-                row_count + 1,
-                0,
-                format_zaak_record(zaak, user),
-            )
 
-        workbook.close()
-        output.seek(0)
+class ZakenExportStatusView(LoginRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        export = get_object_or_404(ZakenExport, pk=kwargs["pk"], user=request.user)
+        return JsonResponse(get_export_status(export))
 
-        return output.read()
+
+class DownloadZakenExportView(LoginRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        export = get_object_or_404(
+            ZakenExport,
+            pk=kwargs["pk"],
+            user=request.user,
+            status=ExportStatus.completed,
+        )
+        return sendfile(
+            request,
+            export.content.path,
+            attachment=True,
+            attachment_filename=os.path.basename(export.content.name),
+            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
 
 
 class DownloadAdditionalReviewersDocumentsView(UserPassesTestMixin, DetailView):
@@ -110,6 +102,8 @@ class DownloadAdditionalReviewersDocumentsView(UserPassesTestMixin, DetailView):
     """
 
     model = DestructionList
+    # Already compressed documents are stored in the archive without compression
+    stored_extensions = (".pdf", ".zip", ".docx", ".xlsx", ".jpg", ".jpeg", ".png")
 
     def test_func(self):
         config = ArchiveConfig.get_solo()
@@ -138,19 +132,18 @@ class DownloadAdditionalReviewersDocumentsView(UserPassesTestMixin, DetailView):
         destruction_list = get_object_or_404(DestructionList.objects, pk=kwargs["pk"])
         reviews = destruction_list.reviews.filter(~Q(additional_document__exact=""))
 
-        if not reviews.count():
+        files = [
+            (
+                review.additional_document.path,
+                os.path.basename(review.additional_document.path),
+            )
+            for review in reviews
+        ]
+        if not files:
             raise Http404
 
-        temp_file = io.BytesIO()
-        with zipfile.ZipFile(temp_file, "w") as file:
-            for review in reviews:
-                filepath = review.additional_document.path
-                file.write(filepath, arcname=os.path.basename(filepath))
-
-        temp_file.seek(0)
-
         response = StreamingHttpResponse(
-            FileWrapper(temp_file),
+            iter_zip_content(files, stored_extensions=self.stored_extensions),
             content_type="application/zip",
         )
 
@@ -58,7 +58,11 @@ class RecordManagerDestructionListView(RoleRequiredMixin, FilterView):
     paginate_by = 20
 
     def get_queryset(self):
-        return DestructionList.objects.filter(author=self.request.user).order_by("-id")
+        return (
+            DestructionList.objects.filter(author=self.request.user)
+            .annotate_overview()
+            .order_by("-id")
+        )
 
 
 class DestructionListCreateView(RoleRequiredMixin, CreateView):
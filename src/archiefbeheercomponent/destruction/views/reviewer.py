@@ -48,9 +48,11 @@ class ReviewerDestructionListView(RoleRequiredMixin, FilterView):
             Q(assignee=user) | Q(reviews__author=user)
         ).distinct()
 
-        return prefiltered_qs.annotate(
-            review_status=models.Subquery(review_status[:1])
-        ).order_by("-created")
+        return (
+            prefiltered_qs.annotate_overview()
+            .annotate(review_status=models.Subquery(review_status[:1]))
+            .order_by("-created")
+        )
 
     def get_context_data(self, **kwargs) -> dict:
         context = super().get_context_data(**kwargs)
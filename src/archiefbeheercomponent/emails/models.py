@@ -1,14 +1,16 @@
-import copy
 import logging
 import re
+import time
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
 
-from django.core.mail import send_mail
+from django.conf import settings
+from django.core.mail import get_connection, send_mail, send_mass_mail
 from django.db import models
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
 from furl import furl
-from solo.models import SingletonModel
 
 from archiefbeheercomponent.accounts.models import User
 from archiefbeheercomponent.emails.constants import (
@@ -16,6 +18,7 @@ from archiefbeheercomponent.emails.constants import (
     EmailTypeChoices,
 )
 from archiefbeheercomponent.report.constants import ReportTypeChoices
+from archiefbeheercomponent.utils.models import CachedSingletonModel
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +37,23 @@ EMAIL_TEMPLATE_ELEMENTS = (
     LINK_REPORT_TEMPLATE_ELEMENT,
 )
 
+TEMPLATE_ELEMENTS_RE = re.compile(
+    "({})".format("|".join(re.escape(element) for element in EMAIL_TEMPLATE_ELEMENTS))
+)
+
+
+@lru_cache(maxsize=32)
+def compile_body(body: str) -> Tuple[str, ...]:
+    """
+    Split an email body in text and template elements.
+
+    The template elements are at the odd positions of the returned tuple. Since the
+    result is cached by the content of the body, a changed email is compiled again.
+    """
+    return tuple(TEMPLATE_ELEMENTS_RE.split(body))
+
 
-class EmailConfig(SingletonModel):
+class EmailConfig(CachedSingletonModel):
     municipality = models.CharField(
         _("municipality"),
         max_length=200,
@@ -83,55 +101,113 @@ class AutomaticEmail(models.Model):
         :param report: type DestructionReport (optional)
         :rtype: None
         """
-        config = EmailConfig.get_solo()
+        context = self.get_context()
 
         send_mail(
             subject=self.subject,
-            message=self.compose_body(recipient, destruction_list, report),
-            from_email=config.from_email,
+            message=self.compose_body(recipient, destruction_list, report, context),
+            from_email=context["from_email"],
             recipient_list=[recipient.email],
         )
 
-    def compose_body(self, recipient, destruction_list, report=None) -> str:
+    def send_bulk(
+        self,
+        messages: Iterable[tuple],
+    ) -> List[dict]:
+        """
+        Send the email to many recipients over a single connection to the mail server.
+
+        The messages are sent in batches of ``AUTOMATIC_EMAIL_BATCH_SIZE``.
+
+        :param messages: tuples of (User, DestructionList, DestructionReport or None)
+        :return: for each batch, the number of emails sent and the duration in seconds
+        """
+        context = self.get_context()
+        batch_size = settings.AUTOMATIC_EMAIL_BATCH_SIZE
+
+        datatuple = [
+            (
+                self.subject,
+                self.compose_body(recipient, destruction_list, report, context),
+                context["from_email"],
+                [recipient.email],
+            )
+            for recipient, destruction_list, report in messages
+        ]
+
+        batches = []
+        with get_connection() as connection:
+            for start in range(0, len(datatuple), batch_size):
+                batch_start = time.monotonic()
+                sent = send_mass_mail(
+                    datatuple[start : start + batch_size], connection=connection
+                )
+                batches.append(
+                    {"sent": sent, "duration": time.monotonic() - batch_start}
+                )
+                logger.info(
+                    "Sent %d/%d emails of type %s in %.3f seconds",
+                    sent,
+                    len(datatuple[start : start + batch_size]),
+                    self.type,
+                    batches[-1]["duration"],
+                )
+
+        return batches
+
+    @staticmethod
+    def get_context() -> dict:
+        """
+        Resolve the values which are the same for all the recipients of an email.
+        """
+        from archiefbeheercomponent.report.utils import get_absolute_url
+
+        config = EmailConfig.get_solo()
+        return {
+            "from_email": config.from_email,
+            "municipality": config.municipality,
+            "base_url": get_absolute_url(""),
+        }
+
+    def compose_body(
+        self, recipient, destruction_list, report=None, context: Optional[dict] = None
+    ) -> str:
         """
         :param recipient: type User
         :param destruction_list: type DestructionList:
         :param report: type DestructionReport (optional)
+        :param context: the result of get_context (optional)
         :rtype: str
         """
-        from archiefbeheercomponent.report.utils import get_absolute_url
-
-        filled_body = copy.copy(self.body)
-
-        for pattern in EMAIL_TEMPLATE_ELEMENTS:
-            if re.search(pattern, filled_body):
-                re_pattern = re.compile(pattern)
-
-                if pattern == USER_TEMPLATE_ELEMENT:
-                    value = recipient.get_full_name()
-                elif pattern == MUNICIPALITY_TEMPLATE_ELEMENT:
-                    email_config = EmailConfig.get_solo()
-                    value = email_config.municipality
-                    if value == "":
-                        logger.warning("Municipality name is an empty string!")
-                elif pattern == DL_TEMPLATE_ELEMENT:
-                    value = destruction_list.name
-                elif pattern == LINK_DL_TEMPLATE_ELEMENT:
-                    value = get_absolute_url(
-                        reverse("destruction:dl-redirect", args=[destruction_list.pk])
-                    )
-                elif pattern == LINK_REPORT_TEMPLATE_ELEMENT:
-                    pdf_report_url = furl(
-                        get_absolute_url(
-                            reverse("report:download-report", args=[report.pk])
-                        )
-                    )
-                    pdf_report_url.args["type"] = ReportTypeChoices.pdf
-                    value = pdf_report_url.url
-
-                filled_body = re.sub(re_pattern, value, filled_body)
-
-        return filled_body
+        context = context or self.get_context()
+        parts = list(compile_body(self.body))
+
+        for index in range(1, len(parts), 2):
+            element = parts[index]
+
+            if element == USER_TEMPLATE_ELEMENT:
+                value = recipient.get_full_name()
+            elif element == MUNICIPALITY_TEMPLATE_ELEMENT:
+                value = context["municipality"]
+                if value == "":
+                    logger.warning("Municipality name is an empty string!")
+            elif element == DL_TEMPLATE_ELEMENT:
+                value = destruction_list.name
+            elif element == LINK_DL_TEMPLATE_ELEMENT:
+                value = context["base_url"] + reverse(
+                    "destruction:dl-redirect", args=[destruction_list.pk]
+                )
+            elif element == LINK_REPORT_TEMPLATE_ELEMENT:
+                pdf_report_url = furl(
+                    context["base_url"]
+                    + reverse("report:download-report", args=[report.pk])
+                )
+                pdf_report_url.args["type"] = ReportTypeChoices.pdf
+                value = pdf_report_url.url
+
+            parts[index] = value
+
+        return "".join(parts)
 
 
 class EmailPreference(models.Model):
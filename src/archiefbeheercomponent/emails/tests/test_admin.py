@@ -6,10 +6,11 @@ from django_webtest import WebTest
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.emails.constants import EmailTypeChoices
 from archiefbeheercomponent.emails.models import AutomaticEmail, EmailConfig
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
 @override_settings(LANGUAGE_CODE="en")
-class AutomaticEmailAdminTest(WebTest):
+class AutomaticEmailAdminTest(ClearCachesMixin, WebTest):
     def test_no_variables(self):
         user = UserFactory.create(is_staff=True, is_superuser=True)
 
@@ -1,4 +1,7 @@
+from unittest.mock import patch
+
 from django.core import mail
+from django.core.mail import get_connection
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
@@ -8,16 +11,17 @@ from privates.test import temp_private_root
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.destruction.tests.factories import DestructionListFactory
 from archiefbeheercomponent.emails.constants import EmailTypeChoices
-from archiefbeheercomponent.emails.models import EmailConfig
+from archiefbeheercomponent.emails.models import EmailConfig, compile_body
 from archiefbeheercomponent.emails.tests.factories import AutomaticEmailFactory
 from archiefbeheercomponent.report.constants import ReportTypeChoices
 from archiefbeheercomponent.report.tests.factories import DestructionReportFactory
 from archiefbeheercomponent.report.utils import get_absolute_url
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
 @temp_private_root()
 @override_settings(LANGUAGE_CODE="en")
-class AutomaticEmailTest(TestCase):
+class AutomaticEmailTest(ClearCachesMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         cls.user = UserFactory.create(email="test@example.com")
@@ -90,3 +94,46 @@ class AutomaticEmailTest(TestCase):
         expected_body = f"This is a link to the report: {pdf_report_url.url}"
 
         self.assertEqual(expected_body, sent_mail.body)
+
+    @override_settings(AUTOMATIC_EMAIL_BATCH_SIZE=2)
+    def test_send_bulk(self):
+        destruction_list = DestructionListFactory.create(name="Nice list")
+        users = UserFactory.create_batch(3)
+        email = AutomaticEmailFactory(
+            body="Dear {{ user }}, check {{ list }}", subject="Reminder"
+        )
+
+        with patch(
+            "archiefbeheercomponent.emails.models.get_connection",
+            wraps=get_connection,
+        ) as mock_get_connection:
+            batches = email.send_bulk((user, destruction_list, None) for user in users)
+
+        mock_get_connection.assert_called_once()
+        self.assertEqual([2, 1], [batch["sent"] for batch in batches])
+        self.assertEqual(3, len(mail.outbox))
+        self.assertEqual(
+            [user.email for user in users], [sent.to[0] for sent in mail.outbox]
+        )
+        self.assertEqual(
+            f"Dear {users[0].get_full_name()}, check Nice list", mail.outbox[0].body
+        )
+        self.assertEqual("Reminder", mail.outbox[0].subject)
+
+    def test_compose_body_with_context(self):
+        destruction_list = DestructionListFactory.create(name="Nice list")
+        email = AutomaticEmailFactory(body="{{ list }}: {{ link_list }}")
+        context = email.get_context()
+        compile_body.cache_clear()
+
+        with self.assertNumQueries(0):
+            bodies = [
+                email.compose_body(self.user, destruction_list, context=context)
+                for _ in range(3)
+            ]
+
+        list_url = get_absolute_url(
+            reverse("destruction:dl-redirect", args=[destruction_list.pk])
+        )
+        self.assertEqual([f"Nice list: {list_url}"] * 3, bodies)
+        self.assertEqual(1, compile_body.cache_info().misses)
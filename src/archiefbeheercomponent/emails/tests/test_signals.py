@@ -2,9 +2,10 @@ from django.test import TestCase
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.emails.models import EmailPreference
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class CreateEmailPreferencesTest(TestCase):
+class CreateEmailPreferencesTest(ClearCachesMixin, TestCase):
     def test_create_new_user_creates_email_preferences(self):
         self.assertFalse(EmailPreference.objects.all().exists())
 
@@ -5,9 +5,10 @@ from django_webtest import WebTest
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.constants import RoleTypeChoices
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class EmailPreferenceUpdateTest(TestCase):
+class EmailPreferenceUpdateTest(ClearCachesMixin, TestCase):
     def test_wrong_user_cant_access(self):
         user_1 = UserFactory.create()
         user_2 = UserFactory.create()
@@ -30,7 +31,7 @@ class EmailPreferenceUpdateTest(TestCase):
         self.assertEqual(200, response.status_code)
 
 
-class EmailPreferenceLinkTest(WebTest):
+class EmailPreferenceLinkTest(ClearCachesMixin, WebTest):
     def test_link_process_owner(self):
         process_owner = UserFactory.create(
             role__can_review_destruction=True, role__type=RoleTypeChoices.process_owner
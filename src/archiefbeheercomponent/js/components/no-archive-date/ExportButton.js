@@ -1,28 +1,69 @@
-import React from 'react';
+import React, {useState} from 'react';
 import PropTypes from 'prop-types';
 
 import {countObjectKeys, getObjectKeys} from '../../utils';
+import {apiCall, get} from '../../utils/api';
+import ErrorMessage from '../ErrorMessage';
 
 
-const ExportButton = ({exportZakenUrl, checkboxes}) => {
+const POLL_INTERVAL = 2000;  // ms
+
+
+const ExportButton = ({exportZakenUrl, checkboxes, csrftoken}) => {
     const countSelectedCheckboxes = countObjectKeys(checkboxes);
+    const [isExporting, setIsExporting] = useState(false);
+    const [error, setError] = useState(false);
+
+    // The export is created in the background, so wait until it can be downloaded
+    const waitForExport = async (statusUrl) => {
+        const response = await get(statusUrl);
+        if (!response.ok || response.data.status === 'failed') {
+            setError(true);
+            setIsExporting(false);
+        } else if (response.data.downloadUrl) {
+            setIsExporting(false);
+            window.location.href = response.data.downloadUrl;
+        } else {
+            window.setTimeout(() => waitForExport(statusUrl), POLL_INTERVAL);
+        }
+    };
+
+    const startExport = async (event) => {
+        event.preventDefault();
+        if (!countSelectedCheckboxes || isExporting) return;
+
+        setError(false);
+        setIsExporting(true);
+
+        const formData = new FormData();
+        formData.append('zaken_urls', getObjectKeys(checkboxes));
+        const response = await apiCall(exportZakenUrl, {
+            method: 'POST',
+            headers: {'X-CSRFToken': csrftoken},
+            body: formData,
+        });
+
+        if (!response.ok) {
+            setError(true);
+            setIsExporting(false);
+            return;
+        }
 
-    const getExportUrl = () => {
-      let exportUrl = new URL(window.location.href);
-      exportUrl.pathname = exportZakenUrl;
-      exportUrl.searchParams.set('zaken_urls', getObjectKeys(checkboxes));
-      return exportUrl.href;
+        const data = await response.json();
+        waitForExport(data.statusUrl);
     };
 
     return (
         <>
             <a
-                href={countSelectedCheckboxes ? getExportUrl() : '#'}
+                href="#"
+                onClick={startExport}
                 type="button"
-                className={`btn ${countSelectedCheckboxes ? '' : 'btn--disabled'}`}
+                className={`btn ${countSelectedCheckboxes && !isExporting ? '' : 'btn--disabled'}`}
                 title="Exporteer de geselecteerde zaken als een Excel spreadsheet."
-            >Exporteren</a>
+            >{isExporting ? 'Bezig met exporteren...' : 'Exporteren'}</a>
             <div>{countSelectedCheckboxes} zaken geselecteerd</div>
+            {error ? <ErrorMessage/> : null}
         </>
     );
 };
@@ -31,6 +72,7 @@ const ExportButton = ({exportZakenUrl, checkboxes}) => {
 ExportButton.propTypes = {
     exportZakenUrl: PropTypes.string.isRequired,
     checkboxes: PropTypes.object.isRequired,
+    csrftoken: PropTypes.string.isRequired,
 };
 
 
@@ -82,7 +82,7 @@ const reducer = (draft, action) => {
 };
 
 
-const ListZaken = ({zakenUrl, zaaktypen}) => {
+const ListZaken = ({zakenUrl, zaaktypen, csrftoken}) => {
     const [state, dispatch] = useImmerReducer(reducer, INITIAL_STATE);
 
     const urlContext = useContext(UrlsContext);
@@ -128,7 +128,11 @@ const ListZaken = ({zakenUrl, zaaktypen}) => {
             <header className="destruction-create__header">
                 <h1 className="title destruction-create__title">Zaken zonder archiefactiedatum</h1>
                 <nav className="destruction-create__nav">
-                    <ExportButton exportZakenUrl={exportZakenUrl} checkboxes={state.checkboxes}/>
+                    <ExportButton
+                        exportZakenUrl={exportZakenUrl}
+                        checkboxes={state.checkboxes}
+                        csrftoken={csrftoken}
+                    />
                 </nav>
             </header>
             <div className="destruction-create__content">
@@ -184,6 +188,7 @@ const ListZaken = ({zakenUrl, zaaktypen}) => {
 
 ListZaken.propTypes = {
     zakenUrl: PropTypes.string.isRequired,
+    csrftoken: PropTypes.string.isRequired,
     zaaktypen: PropTypes.arrayOf(PropTypes.array)
 };
 
@@ -12,7 +12,7 @@ const mount = () => {
     const node = document.getElementById('react-zaken-without-archive-date');
     if (!node) return;
 
-    const { zakenUrl, archiveUpdateUrl, exportZakenUrl } = node.dataset;
+    const { zakenUrl, archiveUpdateUrl, exportZakenUrl, csrftoken } = node.dataset;
     const zaaktypeChoices = jsonScriptToVar('zaaktype-choices');
 
     ReactDOM.render(
@@ -21,6 +21,7 @@ const mount = () => {
                 <ListZaken
                     zakenUrl={zakenUrl}
                     zaaktypen={zaaktypeChoices}
+                    csrftoken={csrftoken}
                 />
             </ErrorBoundary>
         </UrlsContext.Provider>,
@@ -16,6 +16,9 @@ class DestructionReportAdmin(PrivateMediaMixin, admin.ModelAdmin):
         "title",
         "destruction_list",
         "process_owner",
+        "progress",
+        "render_duration",
+        "render_peak_memory",
         "file_content_pdf",
         "file_content_csv",
     )
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("report", "0003_auto_20210315_1728"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="destructionreport",
+            name="progress",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="Percentage of the PDF content of the report that is rendered",
+                verbose_name="progress",
+            ),
+        ),
+    ]
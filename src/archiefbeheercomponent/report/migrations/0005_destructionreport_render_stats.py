@@ -0,0 +1,33 @@
+# Generated by Django 3.2.19 on 2026-10-18 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("report", "0004_destructionreport_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="destructionreport",
+            name="render_duration",
+            field=models.DurationField(
+                blank=True,
+                help_text="How long it took to render the PDF content of the report",
+                null=True,
+                verbose_name="render duration",
+            ),
+        ),
+        migrations.AddField(
+            model_name="destructionreport",
+            name="render_peak_memory",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Peak memory (in kB) of the process that rendered the PDF content of the report",
+                null=True,
+                verbose_name="render peak memory",
+            ),
+        ),
+    ]
@@ -47,6 +47,26 @@ class DestructionReport(models.Model):
         verbose_name=_("destruction list"),
         help_text=_("Destruction list for which the report was created."),
     )
+    progress = models.PositiveSmallIntegerField(
+        verbose_name=_("progress"),
+        default=0,
+        help_text=_("Percentage of the PDF content of the report that is rendered"),
+    )
+    render_duration = models.DurationField(
+        verbose_name=_("render duration"),
+        blank=True,
+        null=True,
+        help_text=_("How long it took to render the PDF content of the report"),
+    )
+    render_peak_memory = models.PositiveIntegerField(
+        verbose_name=_("render peak memory"),
+        blank=True,
+        null=True,
+        help_text=_(
+            "Peak memory (in kB) of the process that rendered the PDF content "
+            "of the report"
+        ),
+    )
 
     class Meta:
         verbose_name = _("Destruction report")
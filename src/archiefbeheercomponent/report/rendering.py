@@ -0,0 +1,203 @@
+"""
+Render PDF documents in a separate process.
+
+WeasyPrint can use a lot of memory for large documents, which is not returned to the
+operating system afterwards. The documents are therefore rendered in a child process
+which only lives as long as the rendering of a single document, with limits on its
+memory and on the duration of the rendering.
+
+The child process only imports WeasyPrint and pypdf: the HTML is sent to it section
+by section through a pipe. Each section is written to its own PDF, so that only the
+pages of one section are laid out in memory at a time. The sections are merged into
+a single PDF at the end, with the page numbers put on top of the pages.
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from multiprocessing.connection import Connection
+from typing import Callable, Iterable, List, Optional
+
+from pypdf import PdfReader, PdfWriter
+from weasyprint import HTML
+
+
+class RenderError(Exception):
+    pass
+
+
+@dataclass
+class RenderResult:
+    duration: timedelta
+    # Peak resident set size of the rendering process, in kB
+    peak_memory: int
+
+
+def _merge(section_paths: List[str], page_numbers_path: Optional[str], path: str):
+    writer = PdfWriter()
+    for section_path in section_paths:
+        writer.append(section_path)
+
+    if page_numbers_path:
+        for page, page_numbers in zip(writer.pages, PdfReader(page_numbers_path).pages):
+            page.merge_page(page_numbers)
+
+    with open(path, "wb") as output:
+        writer.write(output)
+
+
+def _render_sections(
+    recv_conn: Connection,
+    send_conn: Connection,
+    path: str,
+    memory_limit: Optional[int],
+) -> None:
+    if memory_limit:
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            section_paths = []
+            while True:
+                message, html_content = recv_conn.recv()
+                if message == "finish":
+                    break
+
+                section_path = os.path.join(tmp_dir, f"{len(section_paths)}.pdf")
+                document = HTML(string=html_content).render()
+                document.write_pdf(section_path)
+                section_paths.append(section_path)
+                send_conn.send(("rendered", len(document.pages)))
+                # Release the laid out pages before the next section is rendered
+                del document
+
+            page_numbers_path = None
+            if html_content is not None:
+                page_numbers_path = os.path.join(tmp_dir, "page-numbers.pdf")
+                HTML(string=html_content).write_pdf(page_numbers_path)
+
+            _merge(section_paths, page_numbers_path, path)
+
+        result = ("done", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    except MemoryError:
+        result = ("error", "The memory limit was exceeded")
+    except Exception as exc:
+        result = ("error", repr(exc))
+
+    try:
+        send_conn.send(result)
+    except OSError:
+        # The parent process stopped waiting for the result
+        pass
+
+
+def _send(conn: Connection, message: str, html_content: Optional[str]) -> None:
+    try:
+        conn.send((message, html_content))
+    except OSError:
+        raise RenderError("The rendering process stopped unexpectedly")
+
+
+def _receive(conn: Connection, deadline: float):
+    remaining = deadline - time.monotonic()
+    if remaining <= 0 or not conn.poll(remaining):
+        raise RenderError("The time limit was exceeded")
+
+    try:
+        status, value = conn.recv()
+    except EOFError:
+        raise RenderError("The rendering process stopped unexpectedly")
+
+    if status == "error":
+        raise RenderError(value)
+    return value
+
+
+def render_pdf(
+    sections: Iterable[str],
+    path: str,
+    time_limit: int,
+    memory_limit: Optional[int] = None,
+    on_section_rendered: Optional[Callable[[int], None]] = None,
+    page_numbers: Optional[Callable[[int], str]] = None,
+) -> RenderResult:
+    """
+    Render the HTML sections as a single PDF document, written to ``path``.
+
+    :param sections: the HTML of the sections, which is only generated when the
+        previous section is rendered. Each section starts on a new page.
+    :param time_limit: the maximum duration of the rendering, in seconds.
+    :param memory_limit: the maximum size of the address space of the rendering
+        process, in MB.
+    :param on_section_rendered: called with the number of rendered sections after
+        each section.
+    :param page_numbers: called with the number of pages of the document, returns
+        the HTML of a document of as many pages with only the page numbers. Its pages
+        are put on top of the rendered pages, since the page counters of WeasyPrint
+        restart in each section.
+    """
+    start = time.monotonic()
+    deadline = start + time_limit
+
+    to_child_r, to_child_w = os.pipe()
+    from_child_r, from_child_w = os.pipe()
+    # A new interpreter is started (instead of a fork), so that the process does not
+    # inherit the memory, the threads and the database connections of the worker.
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            __name__,
+            str(to_child_r),
+            str(from_child_w),
+            path,
+            str(memory_limit or 0),
+        ],
+        pass_fds=(to_child_r, from_child_w),
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, sys.path))},
+    )
+    os.close(to_child_r)
+    os.close(from_child_w)
+    send_conn = Connection(to_child_w, readable=False)
+    recv_conn = Connection(from_child_r, writable=False)
+
+    try:
+        number_of_pages = 0
+        for index, html_content in enumerate(sections, start=1):
+            _send(send_conn, "section", html_content)
+            number_of_pages += _receive(recv_conn, deadline)
+            if on_section_rendered:
+                on_section_rendered(index)
+
+        _send(
+            send_conn,
+            "finish",
+            page_numbers(number_of_pages) if page_numbers else None,
+        )
+        peak_memory = _receive(recv_conn, deadline)
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        send_conn.close()
+        recv_conn.close()
+        process.wait()
+
+    return RenderResult(
+        duration=timedelta(seconds=time.monotonic() - start), peak_memory=peak_memory
+    )
+
+
+if __name__ == "__main__":
+    recv_fd, send_fd, path, memory_limit = sys.argv[1:]
+    _render_sections(
+        Connection(int(recv_fd), writable=False),
+        Connection(int(send_fd), readable=False),
+        path,
+        int(memory_limit),
+    )
@@ -4,9 +4,10 @@ from django_webtest import WebTest
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.report.tests.factories import DestructionReportFactory
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
-class DestructionReportAdminTests(WebTest):
+class DestructionReportAdminTests(ClearCachesMixin, WebTest):
     def test_links_to_report_work(self):
         superuser = UserFactory.create(is_staff=True, is_superuser=True)
         report = DestructionReportFactory.create()
@@ -1,3 +1,4 @@
+import gzip
 from unittest.mock import patch
 
 from django.test import TestCase, override_settings
@@ -5,6 +6,7 @@ from django.urls import reverse
 
 from freezegun import freeze_time
 from privates.test import temp_private_root
+from pypdf import PdfReader
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.constants import RoleTypeChoices
@@ -15,12 +17,16 @@ from archiefbeheercomponent.destruction.tests.factories import (
     DestructionListItemFactory,
     DestructionListReviewFactory,
 )
+from archiefbeheercomponent.report.rendering import RenderError
 from archiefbeheercomponent.report.utils import (
     create_csv_report_content,
     create_destruction_report,
     create_html_report_content,
+    create_page_numbers_content,
     get_destruction_report_data,
+    render_destruction_report_pdf,
 )
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
 @temp_private_root()
@@ -36,7 +42,7 @@ from archiefbeheercomponent.report.utils import (
         "selectielijstProcestype": "some data",
     },
 )
-class CreateReportTests(TestCase):
+class CreateReportTests(ClearCachesMixin, TestCase):
     @freeze_time("2021-05-05")
     def test_invalid_report_type(self, m_vcs, m_zaaktype):
         process_owner = UserFactory.create(
@@ -171,6 +177,7 @@ class CreateReportTests(TestCase):
         )
 
         report = create_destruction_report(destruction_list)
+        render_destruction_report_pdf(report)
 
         self.client.force_login(process_owner)
         response = self.client.get(
@@ -356,6 +363,7 @@ class CreateReportTests(TestCase):
         )
 
         report = create_destruction_report(destruction_list)
+        render_destruction_report_pdf(report)
 
         response_csv = self.client.get(report.content_csv.url)
 
@@ -423,6 +431,100 @@ class CreateReportTests(TestCase):
         self.assertEqual(1, destruction_list.destructionreport_set.count())
         self.assertEqual(report, destruction_list.destructionreport_set.get())
 
+    @override_settings(REPORT_PDF_CHUNK_SIZE=2)
+    def test_pdf_rendered_in_sections(self, m_vcs, m_zaaktype):
+        destruction_list = DestructionListFactory.create(contains_sensitive_info=False)
+        for i in range(5):
+            DestructionListItemFactory.create(
+                destruction_list=destruction_list,
+                status=ListItemStatus.destroyed,
+                extra_zaak_data={
+                    "identificatie": f"ZAAK-{i}",
+                    "omschrijving": "Een zaak",
+                    "startdatum": "2020-01-01",
+                    "einddatum": "2021-01-01",
+                    "zaaktype": "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1",
+                    "relevante_andere_zaken": [],
+                    "bytes_removed_documents": 10,
+                },
+            )
+
+        with patch(
+            "archiefbeheercomponent.report.utils.create_html_report_content",
+            wraps=create_html_report_content,
+        ) as m_html_content, patch(
+            "archiefbeheercomponent.report.utils.create_page_numbers_content",
+            wraps=create_page_numbers_content,
+        ) as m_page_numbers:
+            report = create_destruction_report(destruction_list)
+            render_destruction_report_pdf(report)
+
+        sections = [
+            (
+                [zaak["identificatie"] for zaak in call.args[0]],
+                call.kwargs["first_section"],
+                call.kwargs["last_section"],
+            )
+            for call in m_html_content.call_args_list
+        ]
+        self.assertEqual(
+            [
+                (["ZAAK-0", "ZAAK-1"], True, False),
+                (["ZAAK-2", "ZAAK-3"], False, False),
+                (["ZAAK-4"], False, True),
+            ],
+            sections,
+        )
+
+        report.refresh_from_db()
+        self.assertEqual(100, report.progress)
+        self.assertTrue(report.content_pdf.read().startswith(b"%PDF"))
+        # The sections are merged, with the page numbers of the whole document
+        m_page_numbers.assert_called_once()
+        number_of_pages = m_page_numbers.call_args.args[0]
+        report.content_pdf.seek(0)
+        self.assertEqual(number_of_pages, len(PdfReader(report.content_pdf).pages))
+        self.assertIsNotNone(report.render_duration)
+        self.assertGreater(report.render_peak_memory, 0)
+
+    @override_settings(REPORT_CSV_GZIP=True)
+    def test_csv_content_compressed(self, m_vcs, m_zaaktype):
+        destruction_list = DestructionListFactory.create(name="Winter cases")
+        DestructionListItemFactory.create(
+            destruction_list=destruction_list,
+            status=ListItemStatus.destroyed,
+            extra_zaak_data={
+                "identificatie": "ZAAK-1",
+                "omschrijving": "Een zaak",
+                "startdatum": "2020-01-01",
+                "einddatum": "2021-01-01",
+                "zaaktype": "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1",
+                "relevante_andere_zaken": [],
+                "bytes_removed_documents": 10,
+            },
+        )
+
+        report = create_destruction_report(destruction_list)
+
+        report.refresh_from_db()
+        self.assertTrue(report.content_csv.name.endswith(".csv.gz"))
+        with report.content_csv.open("rb") as content:
+            lines = gzip.decompress(content.read()).decode("utf-8").splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[1].startswith("ZAAK-1,"))
+
+    @override_settings(REPORT_PDF_TIME_LIMIT=0)
+    def test_pdf_rendering_time_limit(self, m_vcs, m_zaaktype):
+        destruction_list = DestructionListFactory.create()
+        report = create_destruction_report(destruction_list)
+
+        with self.assertRaisesMessage(RenderError, "The time limit was exceeded"):
+            render_destruction_report_pdf(report)
+
+        report.refresh_from_db()
+        self.assertFalse(report.content_pdf)
+        self.assertIsNone(report.render_duration)
+
 
 @override_settings(LANGUAGE_CODE="en")
 @patch(
@@ -436,7 +538,7 @@ class CreateReportTests(TestCase):
         "selectielijstProcestype": "some data",
     },
 )
-class ContentReportTests(TestCase):
+class ContentReportTests(ClearCachesMixin, TestCase):
     def test_create_html_content_with_sensitive_info(self, m_vcs, m_zaaktype):
         destruction_list = DestructionListFactory.create(
             name="Winter cases",
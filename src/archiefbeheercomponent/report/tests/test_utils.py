@@ -5,6 +5,7 @@ from django.test import TestCase, override_settings
 from freezegun import freeze_time
 from lxml.html import document_fromstring
 from timeline_logger.models import TimelineLog
+from zds_client import ClientError
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.constants import RoleTypeChoices
@@ -25,11 +26,13 @@ from archiefbeheercomponent.report.utils import (
     get_destruction_report_data,
     get_looptijd,
     get_process_owner_comments,
+    get_zaaktype_report_data,
 )
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 
 @override_settings(LANGUAGE_CODE="en")
-class DestructionReportUtilsTests(TestCase):
+class DestructionReportUtilsTests(ClearCachesMixin, TestCase):
     def test_get_looptijd_with_end_date(self):
         zaak = {"startdatum": "2021-05-01", "einddatum": "2021-05-05"}
         loop_tijd = get_looptijd(zaak)
@@ -931,3 +934,184 @@ class DestructionReportUtilsTests(TestCase):
         report_data, deleted_bytes = get_destruction_report_data(destruction_list)
 
         self.assertEqual(deleted_bytes, 30)
+
+    @patch(
+        "archiefbeheercomponent.report.utils.get_vernietigings_categorie_selectielijst",
+        return_value="1",
+    )
+    @patch(
+        "archiefbeheercomponent.report.utils.get_zaaktype",
+        side_effect=lambda url: {
+            "omschrijving": f"Zaaktype {url[-1]}",
+            "selectielijstProcestype": "https://oz.nl/procestypen/uuid-1",
+        },
+    )
+    def test_types_and_comments_retrieved_once(self, m_zaaktype, m_vcs):
+        destruction_list = DestructionListFactory.create(contains_sensitive_info=False)
+        for i in range(6):
+            DestructionListItemFactory.create(
+                destruction_list=destruction_list,
+                status=ListItemStatus.destroyed,
+                extra_zaak_data={
+                    "identificatie": f"ZAAK-{i}",
+                    "omschrijving": "Een zaak",
+                    "startdatum": "2020-01-01",
+                    "einddatum": "2021-01-01",
+                    "zaaktype": f"https://oz.nl/catalogi/api/v1/zaaktypen/uuid-{i % 2}",
+                    "relevante_andere_zaken": [],
+                    "bytes_removed_documents": 10,
+                },
+            )
+
+        # The destroyed items, the archivist and the process owner comments
+        with self.assertNumQueries(3):
+            report_data, deleted_bytes = get_destruction_report_data(destruction_list)
+
+        self.assertEqual(6, len(report_data))
+        self.assertEqual(
+            ["Zaaktype 0", "Zaaktype 1"] * 3,
+            [zaak_data["zaaktype"] for zaak_data in report_data],
+        )
+        self.assertEqual(2, m_zaaktype.call_count)
+        m_vcs.assert_called_once_with("https://oz.nl/procestypen/uuid-1")
+
+    @patch(
+        "archiefbeheercomponent.report.utils.get_vernietigings_categorie_selectielijst"
+    )
+    @patch("archiefbeheercomponent.report.utils.get_zaaktype")
+    def test_report_data_resolved_during_destruction(self, m_zaaktype, m_vcs):
+        destruction_list = DestructionListFactory.create(contains_sensitive_info=False)
+        DestructionListItemFactory.create(
+            destruction_list=destruction_list,
+            status=ListItemStatus.destroyed,
+            extra_zaak_data={
+                "identificatie": "ZAAK-1",
+                "omschrijving": "Een zaak",
+                "startdatum": "2020-01-01",
+                "einddatum": "2021-01-01",
+                "zaaktype": "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1",
+                "zaaktype_omschrijving": "Een zaaktype",
+                "vernietigings_categorie": "2",
+                "relevante_andere_zaken": [],
+                "bytes_removed_documents": 10,
+            },
+        )
+
+        report_data, deleted_bytes = get_destruction_report_data(destruction_list)
+
+        self.assertEqual("Een zaaktype", report_data[0]["zaaktype"])
+        self.assertEqual("2", report_data[0]["vernietigings_categorie"])
+        self.assertNotIn("zaaktype_omschrijving", report_data[0])
+        m_zaaktype.assert_not_called()
+        m_vcs.assert_not_called()
+
+    @patch(
+        "archiefbeheercomponent.report.utils.get_vernietigings_categorie_selectielijst",
+        return_value="2",
+    )
+    @patch(
+        "archiefbeheercomponent.report.utils.get_zaaktype",
+        return_value={
+            "omschrijving": "Een zaaktype",
+            "selectielijstProcestype": "https://oz.nl/procestypen/uuid-1",
+        },
+    )
+    def test_vernietigings_categorie_not_resolved_during_destruction(
+        self, m_zaaktype, m_vcs
+    ):
+        destruction_list = DestructionListFactory.create(contains_sensitive_info=False)
+        DestructionListItemFactory.create(
+            destruction_list=destruction_list,
+            status=ListItemStatus.destroyed,
+            extra_zaak_data={
+                "identificatie": "ZAAK-1",
+                "omschrijving": "Een zaak",
+                "startdatum": "2020-01-01",
+                "einddatum": "2021-01-01",
+                "zaaktype": "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1",
+                "zaaktype_omschrijving": "Een zaaktype",
+                "relevante_andere_zaken": [],
+                "bytes_removed_documents": 10,
+            },
+        )
+
+        report_data, deleted_bytes = get_destruction_report_data(destruction_list)
+
+        self.assertEqual("Een zaaktype", report_data[0]["zaaktype"])
+        self.assertEqual("2", report_data[0]["vernietigings_categorie"])
+        m_vcs.assert_called_once_with("https://oz.nl/procestypen/uuid-1")
+
+
+class ZaaktypeReportDataTests(ClearCachesMixin, TestCase):
+    @patch(
+        "archiefbeheercomponent.report.utils.fetch_process_type",
+        side_effect=ClientError("Not found"),
+    )
+    @patch(
+        "archiefbeheercomponent.report.utils.fetch_zaaktype",
+        return_value={
+            "omschrijving": "Een zaaktype",
+            "selectielijstProcestype": "https://oz.nl/procestypen/uuid-1",
+        },
+    )
+    def test_failed_procestype_lookup_left_out(self, m_zaaktype, m_process_type):
+        report_data = get_zaaktype_report_data(
+            "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1"
+        )
+
+        self.assertEqual({"zaaktype_omschrijving": "Een zaaktype"}, report_data)
+
+    @patch("archiefbeheercomponent.report.utils.fetch_process_type")
+    @patch(
+        "archiefbeheercomponent.report.utils.fetch_zaaktype",
+        return_value={"omschrijving": "Een zaaktype"},
+    )
+    def test_zaaktype_without_procestype(self, m_zaaktype, m_process_type):
+        report_data = get_zaaktype_report_data(
+            "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1"
+        )
+
+        self.assertEqual(
+            {"zaaktype_omschrijving": "Een zaaktype", "vernietigings_categorie": ""},
+            report_data,
+        )
+        m_process_type.assert_not_called()
+
+    @patch("archiefbeheercomponent.report.utils.fetch_process_type")
+    @patch("archiefbeheercomponent.report.utils.fetch_zaaktype")
+    @patch(
+        "archiefbeheercomponent.report.utils.get_zaaktypen",
+        return_value={
+            "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1": {
+                "omschrijving": "Een zaaktype",
+                "selectielijstProcestype": "https://oz.nl/procestypen/uuid-1",
+            }
+        },
+    )
+    @override_settings(REMOTE_LOOKUP_CACHE_TIMEOUT=60)
+    def test_cached_only_with_cached_remote_lookups(
+        self, m_zaaktypen, m_zaaktype, m_process_type
+    ):
+        m_process_type.return_value = {"nummer": 2}
+
+        report_data = get_zaaktype_report_data(
+            "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1", cached_only=True
+        )
+
+        self.assertEqual(
+            {"zaaktype_omschrijving": "Een zaaktype", "vernietigings_categorie": "2"},
+            report_data,
+        )
+        m_zaaktype.assert_not_called()
+
+    @patch("archiefbeheercomponent.report.utils.fetch_zaaktype")
+    @patch("archiefbeheercomponent.report.utils.get_zaaktypen")
+    @override_settings(ZTC_TYPES_CACHE_TIMEOUT=0)
+    def test_cached_only_without_types_cache(self, m_zaaktypen, m_zaaktype):
+        report_data = get_zaaktype_report_data(
+            "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1", cached_only=True
+        )
+
+        self.assertEqual({}, report_data)
+        m_zaaktypen.assert_not_called()
+        m_zaaktype.assert_not_called()
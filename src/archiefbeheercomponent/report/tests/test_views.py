@@ -7,14 +7,20 @@ from privates.test import temp_private_root
 
 from archiefbeheercomponent.accounts.tests.factories import UserFactory
 from archiefbeheercomponent.constants import RoleTypeChoices
+from archiefbeheercomponent.destruction.constants import ListItemStatus
 from archiefbeheercomponent.destruction.models import ArchiveConfig
+from archiefbeheercomponent.destruction.tests.factories import (
+    DestructionListFactory,
+    DestructionListItemFactory,
+)
+from archiefbeheercomponent.tests.utils import ClearCachesMixin
 
 from .factories import DestructionReportFactory
 
 
 @temp_private_root()
 @patch("archiefbeheercomponent.destruction.views.reviewer.ArchiveConfig.get_solo")
-class DownloadDestructionReportTests(TestCase):
+class DownloadDestructionReportTests(ClearCachesMixin, TestCase):
     def test_non_authenticated_redirected_to_login(self, m_archive_config):
         m_archive_config.return_value = ArchiveConfig(
             destruction_report_downloadable=True
@@ -135,3 +141,67 @@ class DownloadDestructionReportTests(TestCase):
 
         self.assertEqual(403, response_pdf.status_code)
         self.assertEqual(403, response_csv.status_code)
+
+    def test_pdf_not_rendered_yet(self, m_archive_config):
+        m_archive_config.return_value = ArchiveConfig(
+            destruction_report_downloadable=True
+        )
+
+        process_owner = UserFactory.create(role__type=RoleTypeChoices.process_owner)
+        report = DestructionReportFactory.create(
+            process_owner=process_owner, content_pdf=None
+        )
+
+        self.client.force_login(process_owner)
+        response_pdf = self.client.get(
+            reverse("report:download-report", args=[report.pk]), data={"type": "pdf"}
+        )
+        response_csv = self.client.get(
+            reverse("report:download-report", args=[report.pk]), data={"type": "csv"}
+        )
+
+        self.assertEqual(404, response_pdf.status_code)
+        self.assertEqual(200, response_csv.status_code)
+
+    @patch("archiefbeheercomponent.report.utils.get_zaaktype", return_value={})
+    def test_csv_generated_for_report_without_one(self, m_zaaktype, m_archive_config):
+        m_archive_config.return_value = ArchiveConfig(
+            destruction_report_downloadable=True
+        )
+
+        process_owner = UserFactory.create(role__type=RoleTypeChoices.process_owner)
+        destruction_list = DestructionListFactory.create(
+            name="Old list", contains_sensitive_info=True
+        )
+        DestructionListItemFactory.create(
+            destruction_list=destruction_list,
+            status=ListItemStatus.destroyed,
+            extra_zaak_data={
+                "identificatie": "ZAAK-1",
+                "omschrijving": "Een zaak",
+                "startdatum": "2020-01-01",
+                "einddatum": "2021-01-01",
+                "zaaktype": "https://oz.nl/catalogi/api/v1/zaaktypen/uuid-1",
+                "relevante_andere_zaken": [],
+                "bytes_removed_documents": 10,
+            },
+        )
+        report = DestructionReportFactory.create(
+            process_owner=process_owner,
+            destruction_list=destruction_list,
+            content_csv=None,
+        )
+
+        self.client.force_login(process_owner)
+        response = self.client.get(
+            reverse("report:download-report", args=[report.pk]), data={"type": "csv"}
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            'attachment; filename="verklaring-van-vernietiging_Old-list.csv"',
+            response["Content-Disposition"],
+        )
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[1].startswith("ZAAK-1,"))
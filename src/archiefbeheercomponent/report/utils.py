@@ -1,12 +1,16 @@
 import csv
+import gzip
 import io
+import os
+import tempfile
 from datetime import date, datetime
 from itertools import chain
-from typing import ByteString, List, Optional, Tuple
+from typing import ByteString, Iterable, Iterator, List, Optional, Tuple
 
 from django.conf import settings
 from django.contrib.sites.models import Site
-from django.core.files.base import ContentFile
+from django.core.files.base import File
+from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.http import HttpRequest
 from django.shortcuts import render
 from django.template.defaultfilters import filesizeformat
@@ -24,8 +28,11 @@ from archiefbeheercomponent.destruction.models import (
 from archiefbeheercomponent.destruction.service import (
     fetch_process_type,
     fetch_zaaktype,
+    get_zaaktypen,
+    parallel,
 )
 from archiefbeheercomponent.report.models import DestructionReport
+from archiefbeheercomponent.report.rendering import RenderResult, render_pdf
 
 
 class NoClientException(Exception):
@@ -79,6 +86,46 @@ def get_zaaktype(zaaktype_url: str) -> dict:
         return {}
 
 
+def get_zaaktype_report_data(zaaktype_url: str, cached_only: bool = False) -> dict:
+    """
+    Resolve the columns of the report which depend on the zaaktype of a zaak.
+
+    This is done while the zaak is destroyed, so that the report can be created
+    without remote calls. The columns which couldn't be resolved are left out, so
+    that they are tried again when the report is created.
+
+    With ``cached_only``, only the lookups which are shared between tasks are done:
+    the zaaktype is taken from the cached types of the Catalogi APIs, and the
+    procestype is only retrieved if the remote lookups are cached.
+    """
+    if not cached_only:
+        zaaktype = get_zaaktype(zaaktype_url)
+    elif settings.ZTC_TYPES_CACHE_TIMEOUT:
+        zaaktype = get_zaaktypen(dict_response=True).get(zaaktype_url, {})
+    else:
+        zaaktype = {}
+    if not zaaktype:
+        return {}
+
+    report_data = {"zaaktype_omschrijving": zaaktype.get("omschrijving", "")}
+
+    procestype = zaaktype.get("selectielijstProcestype")
+    if not procestype:
+        report_data["vernietigings_categorie"] = ""
+        return report_data
+
+    if cached_only and not settings.REMOTE_LOOKUP_CACHE_TIMEOUT:
+        return report_data
+
+    try:
+        process_type = fetch_process_type(procestype)
+    except ClientError:
+        return report_data
+
+    report_data["vernietigings_categorie"] = str(process_type["nummer"])
+    return report_data
+
+
 def get_process_owner_comments(destruction_list: DestructionList) -> str:
     review = (
         DestructionListReview.objects.filter(
@@ -99,9 +146,41 @@ def get_process_owner_comments(destruction_list: DestructionList) -> str:
 def get_destruction_report_data(
     destruction_list: DestructionList,
 ) -> Tuple[List[dict], int]:
-    destroyed_items = destruction_list.items.filter(
-        status=ListItemStatus.destroyed
-    ).order_by("id")
+    destroyed_items = list(
+        destruction_list.items.filter(status=ListItemStatus.destroyed).order_by("id")
+    )
+
+    # Retrieve each distinct zaaktype and procestype only once, for the items of
+    # which they were not resolved when the zaak was destroyed
+    zaaktype_urls = list(
+        {
+            item.extra_zaak_data["zaaktype"]
+            for item in destroyed_items
+            if "zaaktype_omschrijving" not in item.extra_zaak_data
+            or "vernietigings_categorie" not in item.extra_zaak_data
+        }
+    )
+    with parallel() as executor:
+        zaaktypen = dict(zip(zaaktype_urls, executor.map(get_zaaktype, zaaktype_urls)))
+        procestype_urls = list(
+            {
+                zaaktype["selectielijstProcestype"]
+                for zaaktype in zaaktypen.values()
+                if zaaktype.get("selectielijstProcestype")
+            }
+        )
+        vernietigings_categorieen = dict(
+            zip(
+                procestype_urls,
+                executor.map(
+                    get_vernietigings_categorie_selectielijst, procestype_urls
+                ),
+            )
+        )
+
+    if not destruction_list.contains_sensitive_info:
+        archivaris_comments = get_destruction_list_archivaris_comments(destruction_list)
+    process_owner_comments = get_process_owner_comments(destruction_list)
 
     zaken_data = []
     bytes_deleted = 0
@@ -109,29 +188,29 @@ def get_destruction_report_data(
         zaak_data = destroyed_item.extra_zaak_data
         bytes_deleted += zaak_data["bytes_removed_documents"]
 
-        zaaktype = get_zaaktype(zaak_data["zaaktype"])
-
         if not destruction_list.contains_sensitive_info:
-            zaak_data["opmerkingen"] = get_destruction_list_archivaris_comments(
-                destruction_list
-            )
+            zaak_data["opmerkingen"] = archivaris_comments
         else:
             del zaak_data["omschrijving"]
 
-        zaak_data["zaaktype"] = (
-            zaaktype["omschrijving"] if "omschrijving" in zaaktype else ""
-        )
         zaak_data["looptijd"] = _("%(looptijd)s days") % {
             "looptijd": get_looptijd(zaak_data)
         }
-        zaak_data["vernietigings_categorie"] = (
-            get_vernietigings_categorie_selectielijst(
-                zaaktype["selectielijstProcestype"]
+
+        zaaktype = zaaktypen.get(zaak_data["zaaktype"], {})
+        if "zaaktype_omschrijving" in zaak_data:
+            zaak_data["zaaktype"] = zaak_data.pop("zaaktype_omschrijving")
+        else:
+            zaak_data["zaaktype"] = (
+                zaaktype["omschrijving"] if "omschrijving" in zaaktype else ""
             )
-            if zaaktype.get("selectielijstProcestype")
-            else ""
-        )
-        zaak_data["reactie_zorgdrager"] = get_process_owner_comments(destruction_list)
+        if "vernietigings_categorie" not in zaak_data:
+            zaak_data["vernietigings_categorie"] = (
+                vernietigings_categorieen[zaaktype["selectielijstProcestype"]]
+                if zaaktype.get("selectielijstProcestype")
+                else ""
+            )
+        zaak_data["reactie_zorgdrager"] = process_owner_comments
 
         if zaak_data.get("resultaat"):
             resultaattype = zaak_data["resultaat"]["resultaattype"]
@@ -153,7 +232,11 @@ def get_destruction_report_data(
 
 
 def create_html_report_content(
-    zaken_data: List[dict], bytes_deleted: int, contains_sensitive_info: bool
+    zaken_data: List[dict],
+    bytes_deleted: int,
+    contains_sensitive_info: bool,
+    first_section: bool = True,
+    last_section: bool = True,
 ) -> str:
 
     return render(
@@ -163,13 +246,33 @@ def create_html_report_content(
             "destroyed_zaken": zaken_data,
             "contains_sensitive_info": contains_sensitive_info,
             "bytes_deleted": filesizeformat(bytes_deleted),
+            "first_section": first_section,
+            "last_section": last_section,
         },
     ).content.decode("utf8")
 
 
-def create_csv_report_content(
-    zaken_data: List[dict], contains_sensitive_info: bool
-) -> io.StringIO:
+def create_page_numbers_content(number_of_pages: int) -> str:
+    return render(
+        request=None,
+        template_name="report/page_numbers.html",
+        context={"pages": range(number_of_pages)},
+    ).content.decode("utf8")
+
+
+class Echo:
+    """Pseudo-buffer which returns what is written to it, to generate CSV lines."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv_report_content(
+    zaken_data: Iterable[dict], contains_sensitive_info: bool
+) -> Iterator[str]:
+    """
+    Generate the lines of the CSV content of a report, one zaak at a time.
+    """
     column_names = {
         "identificatie": _("Unique ID"),
         "omschrijving": _("Description"),
@@ -193,10 +296,9 @@ def create_csv_report_content(
         if not (key in optional_columns and contains_sensitive_info)
     ]
 
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=report_columns)
+    writer = csv.DictWriter(Echo(), fieldnames=report_columns)
 
-    writer.writeheader()
+    yield writer.writeheader()
     for zaak in zaken_data:
         row_data = {
             value: zaak.get(key) or ""
@@ -204,13 +306,51 @@ def create_csv_report_content(
             if not (key in optional_columns and contains_sensitive_info)
         }
 
-        writer.writerow(row_data)
+        yield writer.writerow(row_data)
+
 
+def create_csv_report_content(
+    zaken_data: List[dict], contains_sensitive_info: bool
+) -> io.StringIO:
+    output = io.StringIO()
+    output.writelines(iter_csv_report_content(zaken_data, contains_sensitive_info))
     output.seek(0)
 
     return output
 
 
+def save_csv_report(
+    report: DestructionReport, lines: Iterable[str], filename: str
+) -> None:
+    """
+    Write the CSV lines to a temporary file and move it to the storage of the report.
+
+    With ``REPORT_CSV_GZIP`` the content is compressed while it is written.
+    """
+    compress = settings.REPORT_CSV_GZIP
+    if compress:
+        filename = f"{filename}.gz"
+
+    content = TemporaryUploadedFile(
+        filename,
+        content_type="application/gzip" if compress else "text/csv",
+        size=None,
+        charset="utf-8",
+    )
+    with content:
+        if compress:
+            with gzip.GzipFile(fileobj=content, mode="wb") as output:
+                for line in lines:
+                    output.write(line.encode("utf-8"))
+        else:
+            for line in lines:
+                content.write(line.encode("utf-8"))
+
+        content.size = content.tell()
+        content.seek(0)
+        report.content_csv.save(filename, content, save=False)
+
+
 def create_destruction_report_subject(destruction_list: DestructionList) -> str:
     subject = _("Declaration of destruction - %(name)s (%(date)s)") % {
         "name": destruction_list.name,
@@ -224,16 +364,68 @@ def convert_to_pdf(html_content: str) -> ByteString:
     return html_object.write_pdf()
 
 
+def render_pdf_report(
+    report: DestructionReport,
+    zaken_data: List[dict],
+    bytes_deleted: int,
+    contains_sensitive_info: bool,
+    audittrail_html: str,
+    path: str,
+) -> RenderResult:
+    """
+    Render the PDF content of a report in sections of ``REPORT_PDF_CHUNK_SIZE`` zaken.
+
+    The sections are rendered in a separate process (see
+    :func:`archiefbeheercomponent.report.rendering.render_pdf`), which writes the PDF
+    to ``path``. The page numbers are added to the merged sections. The progress is
+    saved on the report after each section.
+    """
+    chunk_size = settings.REPORT_PDF_CHUNK_SIZE
+    chunks = [
+        zaken_data[start : start + chunk_size]
+        for start in range(0, len(zaken_data), chunk_size)
+    ] or [[]]
+
+    def get_sections():
+        for index, chunk in enumerate(chunks):
+            is_last_chunk = index == len(chunks) - 1
+            html_content = create_html_report_content(
+                chunk,
+                bytes_deleted,
+                contains_sensitive_info,
+                first_section=index == 0,
+                last_section=is_last_chunk,
+            )
+            if is_last_chunk:
+                html_content += audittrail_html
+            yield html_content
+
+    def save_progress(rendered_sections: int):
+        report.progress = rendered_sections * 100 // len(chunks)
+        DestructionReport.objects.filter(pk=report.pk).update(progress=report.progress)
+
+    return render_pdf(
+        get_sections(),
+        path,
+        time_limit=settings.REPORT_PDF_TIME_LIMIT,
+        memory_limit=settings.REPORT_PDF_MEMORY_LIMIT,
+        on_section_rendered=save_progress,
+        page_numbers=create_page_numbers_content,
+    )
+
+
+def get_report_filename(destruction_list: DestructionList) -> str:
+    return f"verklaring-van-vernietiging_{destruction_list.name.replace(' ', '-')}"
+
+
 def create_destruction_report(destruction_list: DestructionList) -> DestructionReport:
+    """
+    Create the report of a destruction list, with its CSV content.
+
+    The PDF content is rendered separately by :func:`render_destruction_report_pdf`.
+    """
     zaken_data_for_report, bytes_deleted = get_destruction_report_data(destruction_list)
 
-    report_content_html = create_html_report_content(
-        zaken_data_for_report, bytes_deleted, destruction_list.contains_sensitive_info
-    )
-    audittrail_html = create_audittrail_report(destruction_list)
-    report_content_csv = create_csv_report_content(
-        zaken_data_for_report, destruction_list.contains_sensitive_info
-    )
     report_subject = create_destruction_report_subject(destruction_list)
 
     process_owner_review = DestructionListReview.objects.filter(
@@ -241,26 +433,56 @@ def create_destruction_report(destruction_list: DestructionList) -> DestructionR
         author__role__type=RoleTypeChoices.process_owner,
     ).last()
 
-    report_filename = (
-        f"verklaring-van-vernietiging_{destruction_list.name.replace(' ', '-')}"
-    )
+    report_filename = get_report_filename(destruction_list)
 
-    destruction_report = DestructionReport.objects.create(
+    destruction_report = DestructionReport(
         title=report_subject,
         process_owner=process_owner_review.author if process_owner_review else None,
-        content_pdf=ContentFile(
-            content=convert_to_pdf(report_content_html + audittrail_html),
-            name=f"{report_filename}.pdf",
-        ),
-        content_csv=ContentFile(
-            content=report_content_csv.read(), name=f"{report_filename}.csv"
-        ),
         destruction_list=destruction_list,
     )
+    save_csv_report(
+        destruction_report,
+        iter_csv_report_content(
+            zaken_data_for_report, destruction_list.contains_sensitive_info
+        ),
+        f"{report_filename}.csv",
+    )
+    destruction_report.save()
 
     return destruction_report
 
 
+def render_destruction_report_pdf(report: DestructionReport) -> None:
+    """
+    Render the PDF content of the report and record how long it took and the peak
+    memory of the rendering process.
+    """
+    destruction_list = report.destruction_list
+    zaken_data_for_report, bytes_deleted = get_destruction_report_data(destruction_list)
+    audittrail_html = create_audittrail_report(destruction_list)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "report.pdf")
+        result = render_pdf_report(
+            report,
+            zaken_data_for_report,
+            bytes_deleted,
+            destruction_list.contains_sensitive_info,
+            audittrail_html,
+            path,
+        )
+        with open(path, "rb") as content:
+            report.content_pdf.save(
+                f"{get_report_filename(destruction_list)}.pdf",
+                File(content),
+                save=False,
+            )
+
+    report.render_duration = result.duration
+    report.render_peak_memory = result.peak_memory
+    report.save(update_fields=["content_pdf", "render_duration", "render_peak_memory"])
+
+
 def get_absolute_url(path: str, request: Optional[HttpRequest] = None) -> str:
     if request is not None:
         return request.build_absolute_uri(path)
@@ -1,13 +1,19 @@
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.http import HttpResponseBadRequest
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
 from django.views.generic import DetailView
 
 from django_sendfile import sendfile
 
 from archiefbeheercomponent.constants import RoleTypeChoices
 from archiefbeheercomponent.destruction.models import ArchiveConfig
+from archiefbeheercomponent.report.constants import ReportTypeChoices
 from archiefbeheercomponent.report.forms import ReportTypeForm
 from archiefbeheercomponent.report.models import DestructionReport
+from archiefbeheercomponent.report.utils import (
+    get_destruction_report_data,
+    get_report_filename,
+    iter_csv_report_content,
+)
 
 
 class DownloadDestructionReportView(UserPassesTestMixin, DetailView):
@@ -47,6 +53,23 @@ class DownloadDestructionReportView(UserPassesTestMixin, DetailView):
     def get_sendfile_opts(self):
         return self.sendfile_options or {}
 
+    def stream_csv_content(self, report: DestructionReport) -> StreamingHttpResponse:
+        """
+        Generate the CSV content of a report which was created without one.
+        """
+        destruction_list = report.destruction_list
+        zaken_data, bytes_deleted = get_destruction_report_data(destruction_list)
+
+        response = StreamingHttpResponse(
+            iter_csv_report_content(
+                zaken_data, destruction_list.contains_sensitive_info
+            ),
+            content_type="text/csv",
+        )
+        filename = get_report_filename(destruction_list)
+        response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+        return response
+
     def get(self, request, *args, **kwargs):
         form = ReportTypeForm(request.GET)
         form.is_valid()
@@ -54,8 +77,16 @@ class DownloadDestructionReportView(UserPassesTestMixin, DetailView):
         if form.errors:
             return HttpResponseBadRequest("Invalid document type")
 
-        file_field = f"content_{form.cleaned_data['type']}"
+        report_type = form.cleaned_data["type"]
+        report = self.get_object()
+
+        content = getattr(report, f"content_{report_type}")
+        if not content:
+            if report_type == ReportTypeChoices.csv and report.destruction_list:
+                return self.stream_csv_content(report)
+            # The PDF content is rendered after the report is created
+            raise Http404("The report is not available yet")
 
-        filename = getattr(self.get_object(), file_field).path
+        filename = content.path
         sendfile_options = self.get_sendfile_opts()
         return sendfile(request, filename, **sendfile_options)
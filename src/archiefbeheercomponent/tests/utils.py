@@ -2,12 +2,17 @@ import os
 import random
 from typing import Any, Dict, List
 
+from django.conf import settings
+from django.core.cache import caches
 from django.utils import timezone
 
 import yaml
 from faker import Faker
 from requests_mock import Mocker
 
+from archiefbeheercomponent.destruction.client import registry
+from archiefbeheercomponent.utils.models import _local_singletons
+
 fake = Faker()
 MOCK_FILES_DIR = os.path.join(
     os.path.abspath(os.path.dirname(__file__)),
@@ -126,3 +131,23 @@ def paginated_response(results: List[dict]) -> Dict[str, Any]:
         "results": results,
     }
     return body
+
+
+def clear_caches() -> None:
+    """
+    Clear the caches, the clients of the services and the singletons kept in memory.
+
+    They are not rolled back with the database after each test.
+    """
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    registry.clear()
+    _local_singletons.clear()
+
+
+class ClearCachesMixin:
+    def setUp(self):
+        super().setUp()
+
+        clear_caches()
+        self.addCleanup(clear_caches)
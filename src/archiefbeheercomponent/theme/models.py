@@ -4,7 +4,7 @@ from django.core.validators import RegexValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from solo.models import SingletonModel
+from archiefbeheercomponent.utils.models import CachedSingletonModel
 
 color_re = re.compile(r"^[0-9a-fA-F]+")
 validate_color = RegexValidator(
@@ -14,7 +14,7 @@ validate_color = RegexValidator(
 )
 
 
-class ThemeConfig(SingletonModel):
+class ThemeConfig(CachedSingletonModel):
     logo = models.FileField(
         upload_to="theme/",
         help_text=_(
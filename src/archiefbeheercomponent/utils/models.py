@@ -0,0 +1,66 @@
+import copy
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from solo.models import SingletonModel
+
+# Singletons kept in this process, by cache key: (checked at, version, instance)
+_local_singletons = {}
+
+
+class CachedSingletonModel(SingletonModel):
+    """
+    Singleton which is also kept in memory of the process.
+
+    The in-memory instance is used for ``SOLO_LOCAL_CACHE_TIMEOUT`` seconds. After
+    that, only a version number is retrieved from the cache, which is incremented
+    each time the singleton is saved (in any process). The instance is retrieved
+    again only when the version changed.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.increment_version()
+
+    def delete(self, *args, **kwargs):
+        super().delete(*args, **kwargs)
+        self.increment_version()
+
+    @classmethod
+    def get_version_cache_key(cls) -> str:
+        return f"{cls.get_cache_key()}:version"
+
+    @classmethod
+    def increment_version(cls) -> None:
+        _local_singletons.pop(cls.get_cache_key(), None)
+        try:
+            cache.incr(cls.get_version_cache_key())
+        except ValueError:
+            cache.set(cls.get_version_cache_key(), 1, timeout=None)
+
+    @classmethod
+    def get_solo(cls):
+        timeout = settings.SOLO_LOCAL_CACHE_TIMEOUT
+        if not timeout:
+            return super().get_solo()
+
+        cache_key = cls.get_cache_key()
+        now = time.monotonic()
+        entry = _local_singletons.get(cache_key)
+        if entry and now - entry[0] < timeout:
+            return copy.deepcopy(entry[2])
+
+        version = cache.get(cls.get_version_cache_key(), 0)
+        if entry and entry[1] == version:
+            instance = entry[2]
+        else:
+            instance = super().get_solo()
+
+        _local_singletons[cache_key] = (now, version, instance)
+        # Changes made by the caller should not end up in the shared instance
+        return copy.deepcopy(instance)
@@ -0,0 +1,64 @@
+import os
+import zipfile
+from typing import Collection, Iterable, Iterator, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamBuffer:
+    """
+    Write-only file object which keeps what is written until it is taken out.
+
+    ``zipfile`` only needs ``write`` and ``flush`` to write to an unseekable stream.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip_content(
+    files: Iterable[Tuple[str, str]],
+    stored_extensions: Collection[str] = (),
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Generate a ZIP archive of the files while it is written.
+
+    The files are read in chunks and the compressed output is yielded as soon as it
+    is written, so only a chunk of the archive is kept in memory at a time.
+
+    :param files: the path and the name in the archive of each file.
+    :param stored_extensions: the extensions of files which are already compressed
+        (e.g. ``.pdf``). These are stored without compressing them again.
+    """
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path, arcname in files:
+            zip_info = zipfile.ZipInfo.from_file(path, arcname)
+            if os.path.splitext(arcname)[1].lower() in stored_extensions:
+                zip_info.compress_type = zipfile.ZIP_STORED
+            else:
+                zip_info.compress_type = zipfile.ZIP_DEFLATED
+
+            with open(path, "rb") as source, archive.open(zip_info, "w") as target:
+                for chunk in iter(lambda: source.read(chunk_size), b""):
+                    target.write(chunk)
+                    data = buffer.take()
+                    if data:
+                        yield data
+
+            yield buffer.take()
+
+    yield buffer.take()